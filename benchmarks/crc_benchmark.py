@@ -0,0 +1,32 @@
+"""
+Benchmark of modbus CRC-16 implementations (and verification they yield the same results).
+Run from the repository root (to use the local files, not pip installed lib): python -m benchmarks.crc_benchmark
+"""
+import os
+import sys
+import timeit
+
+from goodwe import modbus
+
+IMPLEMENTATIONS = {
+    'bytewise': modbus._modbus_checksum_bytewise,
+    'pairs': modbus._modbus_checksum_pairs,
+    'default': modbus._modbus_checksum,
+}
+if modbus._CRC_16_ACCELERATED:
+    IMPLEMENTATIONS['crcmod'] = modbus._CRC_16_ACCELERATED
+
+# request, short read response, write multi request, 125 registers read response
+LENGTHS = (6, 17, 40, 253)
+NUMBER = 20000
+
+for length in LENGTHS:
+    data = os.urandom(length)
+    results = {name: checksum(data) for name, checksum in IMPLEMENTATIONS.items()}
+    if len(set(results.values())) != 1:
+        sys.exit(f"CRC-16 implementations do not match for {data.hex()}: {results}")
+
+    timings = {name: timeit.timeit(lambda: checksum(data), number=NUMBER) for name, checksum in IMPLEMENTATIONS.items()}
+    baseline = timings['bytewise']
+    print(f"{length:4d} bytes: " + ", ".join(
+        f"{name} {timing / NUMBER * 1e6:6.2f}us ({baseline / timing:4.1f}x)" for name, timing in timings.items()))
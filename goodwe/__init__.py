@@ -2,15 +2,19 @@
 from __future__ import annotations
 
 import asyncio
+import ipaddress
 import logging
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 from .const import GOODWE_TCP_PORT, GOODWE_UDP_PORT
 from .dt import DT
 from .es import ES
 from .et import ET
 from .exceptions import InverterError, RequestFailedException
+from .fleet import FleetPoller, PollResult
 from .inverter import Inverter, OperationMode, Sensor, SensorKind
-from .model import DT_MODEL_TAGS, ES_MODEL_TAGS, ET_MODEL_TAGS
+from .model import DT_MODEL_TAGS, ES_MODEL_TAGS, ET_MODEL_TAGS, get_model_family
 from .protocol import ProtocolCommand, UdpInverterProtocol, Aa55ProtocolCommand
 
 logger = logging.getLogger(__name__)
@@ -20,12 +24,28 @@ ET_FAMILY = ["ET", "EH", "BT", "BH"]
 ES_FAMILY = ["ES", "EM", "BP"]
 DT_FAMILY = ["DT", "MS", "NS", "XS"]
 
+# Inverter classes of families detected by model tag
+_FAMILIES: dict[str, type[Inverter]] = {"ET": ET, "ES": ES, "DT": DT}
+
 # Initial discovery command
 DISCOVERY_COMMAND = Aa55ProtocolCommand("010200", "0182")
 
+# Network search request (broadcast or unicast to port 48899), answered by "ip,mac,name" of inverter WiFi/LAN dongle
+SEARCH_REQUEST = "WIFIKIT-214028-READ".encode("utf-8")
+SEARCH_PORT = 48899
+
+
+@dataclass
+class InverterAddress:
+    """Network address of inverter (its communication dongle) located by network search"""
+
+    host: str
+    mac: str
+    name: str
+
 
 async def connect(host: str, port: int = GOODWE_UDP_PORT, family: str = None, comm_addr: int = 0, timeout: int = 1,
-                  retries: int = 3, do_discover: bool = True) -> Inverter:
+                  retries: int = 3, do_discover: bool = True, profile: dict[str, Any] | None = None) -> Inverter:
     """Contact the inverter at the specified host/port and answer appropriate Inverter instance.
 
     The specific inverter family/type will be detected automatically, but it can be passed explicitly.
@@ -37,6 +57,9 @@ async def connect(host: str, port: int = GOODWE_UDP_PORT, family: str = None, co
     Since the UDP communication is by definition unreliable, when no (valid) response is received by the specified
     timeout, it is considered lost and the command will be re-tried up to retries times.
 
+    Capability profile (answered by Inverter.export_profile() before) may be passed to skip probing
+    of inverter capabilities (it is used only when inverter serial number and firmware match).
+
     Raise InverterError if unable to contact or recognise supported inverter.
     """
     if family in ET_FAMILY:
@@ -46,17 +69,20 @@ async def connect(host: str, port: int = GOODWE_UDP_PORT, family: str = None, co
     elif family in DT_FAMILY:
         inv = DT(host, port, comm_addr, timeout, retries)
     elif do_discover:
-        return await discover(host, port, timeout, retries)
+        return await discover(host, port, timeout, retries, profile)
     else:
         raise InverterError("Specify either an inverter family or set do_discover True")
 
     logger.debug("Connecting to %s family inverter at %s:%s.", family, host, port)
+    if profile:
+        inv.import_profile(profile)
     await inv.read_device_info()
     logger.debug("Connected to inverter %s, S/N:%s.", inv.model_name, inv.serial_number)
     return inv
 
 
-async def discover(host: str, port: int = GOODWE_UDP_PORT, timeout: int = 1, retries: int = 3) -> Inverter:
+async def discover(host: str, port: int = GOODWE_UDP_PORT, timeout: int = 1, retries: int = 3,
+                   profile: dict[str, Any] | None = None) -> Inverter:
     """Contact the inverter at the specified value and answer appropriate Inverter instance
 
     Raise InverterError if unable to contact or recognise supported inverter
@@ -72,25 +98,12 @@ async def discover(host: str, port: int = GOODWE_UDP_PORT, timeout: int = 1, ret
             model_name = response[5:15].decode("ascii").rstrip()
             serial_number = response[31:47].decode("ascii")
 
-            i: Inverter | None = None
-            for model_tag in ET_MODEL_TAGS:
-                if model_tag in serial_number:
-                    logger.debug("Detected ET/EH/BT/BH/GEH inverter %s, S/N:%s.", model_name, serial_number)
-                    i = ET(host, port, 0, timeout, retries)
-                    break
-            if not i:
-                for model_tag in ES_MODEL_TAGS:
-                    if model_tag in serial_number:
-                        logger.debug("Detected ES/EM/BP inverter %s, S/N:%s.", model_name, serial_number)
-                        i = ES(host, port, 0, timeout, retries)
-                        break
-            if not i:
-                for model_tag in DT_MODEL_TAGS:
-                    if model_tag in serial_number:
-                        logger.debug("Detected DT/MS/D-NS/XS/GEP inverter %s, S/N:%s.", model_name, serial_number)
-                        i = DT(host, port, 0, timeout, retries)
-                        break
-            if i:
+            family = get_model_family(serial_number)
+            if family:
+                logger.debug("Detected %s family inverter %s, S/N:%s.", family, model_name, serial_number)
+                i = _FAMILIES[family](host, port, 0, timeout, retries)
+                if profile:
+                    i.import_profile(profile)
                 await i.read_device_info()
                 logger.debug("Connected to inverter %s, S/N:%s.", i.model_name, i.serial_number)
                 return i
@@ -98,17 +111,30 @@ async def discover(host: str, port: int = GOODWE_UDP_PORT, timeout: int = 1, ret
         except InverterError as ex:
             failures.append(ex)
 
-    # Probe inverter specific protocols
-    for inv in [ET, DT, ES]:
+    # Probe inverter specific protocols concurrently, but keep the ET > DT > ES precedence:
+    # the result of a probe is accepted only when all the higher precedence probes have failed
+    async def _probe(inv: type[Inverter]) -> Inverter:
         i = inv(host, port, 0, timeout, retries)
-        try:
-            logger.debug("Probing %s inverter at %s.", inv.__name__, host)
-            await i.read_device_info()
-            await i.read_runtime_data()
-            logger.debug("Detected %s family inverter %s, S/N:%s.", inv.__name__, i.model_name, i.serial_number)
-            return i
-        except InverterError as ex:
-            failures.append(ex)
+        if profile:
+            i.import_profile(profile)
+        logger.debug("Probing %s inverter at %s.", inv.__name__, host)
+        await i.read_device_info()
+        await i.read_runtime_data()
+        logger.debug("Detected %s family inverter %s, S/N:%s.", inv.__name__, i.model_name, i.serial_number)
+        return i
+
+    probes = [asyncio.ensure_future(_probe(inv)) for inv in (ET, DT, ES)]
+    try:
+        for probe in probes:
+            try:
+                return await probe
+            except InverterError as ex:
+                failures.append(ex)
+    finally:
+        pending = [p for p in probes if not p.done()]
+        for probe in pending:
+            probe.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
     raise InverterError(
         "Unable to connect to the inverter at "
         f"host={host}, or your inverter is not supported yet.\n"
@@ -122,12 +148,90 @@ async def search_inverters() -> bytes:
 
     Raise InverterError if unable to contact any inverter
     """
-    logger.debug("Searching inverters by broadcast to port 48899")
-    command = ProtocolCommand("WIFIKIT-214028-READ".encode("utf-8"), lambda r: True)
+    logger.debug("Searching inverters by broadcast to port %d", SEARCH_PORT)
+    command = ProtocolCommand(SEARCH_REQUEST, lambda r: True)
     try:
-        result = await command.execute(UdpInverterProtocol("255.255.255.255", 48899, 1, 0))
+        result = await command.execute(UdpInverterProtocol("255.255.255.255", SEARCH_PORT, 1, 0))
         if result is not None:
             return result.response_data()
         raise InverterError("No response received to broadcast request.")
     except asyncio.CancelledError:
         raise InverterError("No valid response received to broadcast request.") from None
+
+
+class _SearchProtocol(asyncio.DatagramProtocol):
+    """Collector of network search responses"""
+
+    def __init__(self):
+        self.transport: asyncio.DatagramTransport | None = None
+        self.found: dict[str, InverterAddress] = {}
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        try:
+            host, mac, name = data.decode("utf-8").split(",", 2)
+        except ValueError:
+            logger.debug("Received invalid search response from %s: %s", addr[0], data)
+            return
+        if not host:
+            host = addr[0]
+        if host not in self.found:
+            logger.debug("Located inverter at %s (mac: %s, name: %s).", host, mac, name.rstrip())
+            self.found[host] = InverterAddress(host, mac, name.rstrip())
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Received error: %s", exc)
+
+
+async def search_all_inverters(networks: Iterable[str] = (), broadcast: bool = True, timeout: float = 1,
+                               port: int = SEARCH_PORT) -> list[InverterAddress]:
+    """Scan the network for inverters.
+    Broadcast the search request (if broadcast is True) and send it to every host of the networks
+    specified in CIDR notation (e.g. "192.168.1.0/24"), then collect all responses received within timeout.
+
+    Answer list of located inverters' addresses (IP address, MAC address and name)
+    """
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(_SearchProtocol, local_addr=("0.0.0.0", 0),
+                                                              allow_broadcast=broadcast)
+    try:
+        if broadcast:
+            logger.debug("Searching inverters by broadcast to port %d", port)
+            transport.sendto(SEARCH_REQUEST, ("255.255.255.255", port))
+        for network in networks:
+            network = ipaddress.ip_network(network, strict=False)
+            logger.debug("Searching inverters in network %s", network)
+            for i, address in enumerate(network.hosts() if network.num_addresses > 1 else (network.network_address,)):
+                transport.sendto(SEARCH_REQUEST, (str(address), port))
+                if i % 256 == 255:
+                    # let the transport flush its buffers
+                    await asyncio.sleep(0)
+        await asyncio.sleep(timeout)
+    finally:
+        transport.close()
+    return list(protocol.found.values())
+
+
+async def discover_all(networks: Iterable[str] = (), broadcast: bool = True, search_timeout: float = 1,
+                       timeout: int = 1, retries: int = 3, max_concurrency: int = 8) -> list[Inverter]:
+    """Scan the network for inverters and answer appropriate Inverter instances of all located inverters.
+    The network is searched by search_all_inverters(), then (at most max_concurrency) inverters
+    are contacted concurrently to detect their type.
+
+    Inverters which can't be contacted or recognised are (logged and) skipped.
+    """
+    addresses = await search_all_inverters(networks, broadcast, search_timeout)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _discover(address: InverterAddress) -> Inverter | None:
+        async with semaphore:
+            try:
+                return await discover(address.host, GOODWE_UDP_PORT, timeout, retries)
+            except InverterError as ex:
+                logger.debug("Failed to discover inverter at %s: %s", address.host, ex)
+                return None
+
+    inverters = await asyncio.gather(*(_discover(address) for address in addresses))
+    return [inverter for inverter in inverters if inverter is not None]
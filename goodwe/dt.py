@@ -141,6 +141,9 @@ class DT(Inverter):
         Integer("grid_export_limit", 40336, "Grid Export Limit", "%", Kind.GRID),
     )
 
+    _PROFILE_FLAGS: tuple[str, ...] = ('_has_meter',)
+    _PROFILE_SENSORS: tuple[str, ...] = ('_sensors', '_sensors_meter')
+
     def __init__(self, host: str, port: int, comm_addr: int = 0, timeout: int = 1, retries: int = 3):
         super().__init__(host, port, comm_addr if comm_addr else 0x7f, timeout, retries)
         self._READ_DEVICE_VERSION_INFO: ProtocolCommand = self._read_command(0x7531, 0x0028)
@@ -152,6 +155,13 @@ class DT(Inverter):
         self._sensors_map: dict[str, Sensor] | None = None
         self._has_meter: bool = True
 
+    def _settings_groups(self) -> dict[str, tuple[Sensor, ...]]:
+        return {'single_phase': self.__settings_single_phase, 'three_phase': self.__settings_three_phase}
+
+    def _probe_command(self) -> ProtocolCommand | None:
+        # first register of device info
+        return self._read_command(0x7531, 1)
+
     @staticmethod
     def _single_phase_only(s: Sensor) -> bool:
         """Filter to exclude phase2/3 sensors on single phase inverters"""
@@ -178,12 +188,15 @@ class DT(Inverter):
         self.arm_svn_version = read_unsigned_int(response, 74)  # 35038
         self.firmware = f"{self.dsp1_version}.{self.dsp2_version}.{self.arm_version:02x}"
 
+        if self._apply_profile():
+            return
+
         if is_single_phase(self):
             # this is single phase inverter, filter out all L2 and L3 sensors
             self._sensors = tuple(filter(self._single_phase_only, self.__all_sensors))
-            self._settings.update({s.id_: s for s in self.__settings_single_phase})
+            self._enable_settings_group('single_phase')
         else:
-            self._settings.update({s.id_: s for s in self.__settings_three_phase})
+            self._enable_settings_group('three_phase')
 
         if is_3_mppt(self):
             # this is 3 PV strings inverter, keep all sensors
@@ -204,9 +217,9 @@ class DT(Inverter):
                 logger.info("Meter values not supported, disabling further attempts.")
                 self._has_meter = False
 
-        return data
+        return self._snapshot_runtime(data)
 
-    async def read_sensor(self, sensor_id: str) -> Any:
+    async def _read_sensor_by_id(self, sensor_id: str) -> Any:
         sensor: Sensor = self._get_sensor(sensor_id)
         if sensor:
             return await self._read_sensor(sensor)
@@ -215,7 +228,7 @@ class DT(Inverter):
             return int.from_bytes(response.read(2), byteorder="big", signed=True)
         raise ValueError(f'Unknown sensor "{sensor_id}"')
 
-    async def read_setting(self, setting_id: str) -> Any:
+    async def _read_setting_by_id(self, setting_id: str) -> Any:
         setting = self._settings.get(setting_id)
         if setting:
             return await self._read_sensor(setting)
@@ -248,9 +261,12 @@ class DT(Inverter):
 
     async def _write_setting(self, setting: Sensor, value: Any):
         if setting.size_ == 1:
-            # modbus can address/store only 16 bit values, read the other 8 bytes
-            response = await self._read_from_socket(self._read_command(setting.offset, 1))
-            raw_value = setting.encode_value(value, response.response_data()[0:2])
+            # modbus can address/store only 16 bit values, read the other 8 bytes (unless known from shadow)
+            register_value = self._shadow_registers(setting.offset, 1)
+            if register_value is None:
+                response = await self._read_from_socket(self._read_command(setting.offset, 1))
+                register_value = response.response_data()[0:2]
+            raw_value = setting.encode_value(value, register_value)
         else:
             raw_value = setting.encode_value(value)
         if len(raw_value) <= 2:
@@ -260,11 +276,9 @@ class DT(Inverter):
             await self._read_from_socket(self._write_multi_command(setting.offset, raw_value))
 
     async def read_settings_data(self) -> dict[str, Any]:
-        data = {}
-        for setting in self.settings():
-            value = await self.read_setting(setting.id_)
-            data[setting.id_] = value
-        return data
+        settings = self.settings()
+        data = await self._read_coalesced(settings, raise_errors=True)
+        return self._snapshot_settings({s.id_: data.get(s.id_) for s in settings})
 
     async def get_grid_export_limit(self) -> int:
         return await self.read_setting('grid_export_limit')
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from typing import Iterable
 
 from .const import *
 from .exceptions import InverterError
@@ -170,6 +171,13 @@ class ES(Inverter):
         super().__init__(host, port, comm_addr if comm_addr else 0xf7, timeout, retries)
         self._settings: dict[str, Sensor] = {s.id_: s for s in self.__all_settings}
 
+    def _settings_groups(self) -> dict[str, tuple[Sensor, ...]]:
+        return {'arm_fw_14': self.__settings_arm_fw_14}
+
+    def _probe_command(self) -> ProtocolCommand | None:
+        # the aa55 protocol has no cheaper request than device info
+        return self._READ_DEVICE_VERSION_INFO
+
     def _supports_eco_mode_v2(self) -> bool:
         if self.arm_version < 14:
             return False
@@ -198,19 +206,32 @@ class ES(Inverter):
         except ValueError:
             logger.exception("Error decoding firmware version %s.", self.firmware)
 
+        if self._apply_profile():
+            return
+
         if self._supports_eco_mode_v2():
-            self._settings.update({s.id_: s for s in self.__settings_arm_fw_14})
+            self._enable_settings_group('arm_fw_14')
 
     async def read_runtime_data(self) -> dict[str, Any]:
         response = await self._read_from_socket(self._READ_DEVICE_RUNNING_DATA)
         data = self._map_response(response, self.__sensors)
-        return data
+        return self._snapshot_runtime(data)
 
-    async def read_sensor(self, sensor_id: str) -> Any:
+    async def _read_sensor_by_id(self, sensor_id: str) -> Any:
         data = await self.read_runtime_data()
         return data[sensor_id]
 
-    async def read_setting(self, setting_id: str) -> Any:
+    async def read_sensors(self, sensor_ids: Iterable[str]) -> dict[str, Any]:
+        # all the sensors are provided by single runtime data request anyway
+        data = await self.read_runtime_data()
+        result = {}
+        for sensor_id in sensor_ids:
+            if sensor_id not in data:
+                raise ValueError(f'Unknown sensor "{sensor_id}"')
+            result[sensor_id] = data[sensor_id]
+        return result
+
+    async def _read_setting_by_id(self, setting_id: str) -> Any:
         if setting_id == 'time':
             # Fake setting, just to enable write_setting to work (if checked as pair in read as in HA)
             # There does not seem to be time setting/sensor available (or is not known)
@@ -252,12 +273,15 @@ class ES(Inverter):
 
     async def _write_setting(self, setting: Sensor, value: Any):
         if setting.size_ == 1:
-            # modbus can address/store only 16 bit values, read the other 8 bytes
-            if self._is_modbus_setting(setting):
-                response = await self._read_from_socket(self._read_command(setting.offset, 1))
-            else:
-                response = await self._read_from_socket(Aa55ReadCommand(setting.offset, 1))
-            raw_value = setting.encode_value(value, response.response_data()[0:2])
+            # modbus can address/store only 16 bit values, read the other 8 bytes (unless known from shadow)
+            register_value = self._shadow_registers(setting.offset, 1)
+            if register_value is None:
+                if self._is_modbus_setting(setting):
+                    response = await self._read_from_socket(self._read_command(setting.offset, 1))
+                else:
+                    response = await self._read_from_socket(Aa55ReadCommand(setting.offset, 1))
+                register_value = response.response_data()[0:2]
+            raw_value = setting.encode_value(value, register_value)
         else:
             raw_value = setting.encode_value(value)
         if len(raw_value) <= 2:
@@ -275,7 +299,7 @@ class ES(Inverter):
     async def read_settings_data(self) -> dict[str, Any]:
         response = await self._read_from_socket(self._READ_DEVICE_SETTINGS_DATA)
         data = self._map_response(response, self.settings())
-        return data
+        return self._snapshot_settings(data)
 
     async def get_grid_export_limit(self) -> int:
         return await self.read_setting('grid_export_limit')
@@ -328,8 +352,7 @@ class ES(Inverter):
                 raise ValueError()
             if eco_mode_soc < 0 or eco_mode_soc > 100:
                 raise ValueError()
-            eco_mode: EcoMode | Sensor = self._settings.get('eco_mode_1')
-            await self._read_setting(eco_mode)
+            eco_mode: EcoMode | Sensor = await self._read_setting(self._settings.get('eco_mode_1'))
             if operation_mode == OperationMode.ECO_CHARGE:
                 await self.write_setting('eco_mode_1', eco_mode.encode_charge(eco_mode_power, eco_mode_soc))
             else:
@@ -442,3 +465,7 @@ class ES(Inverter):
 
     def _is_modbus_setting(self, sensor: Sensor) -> bool:
         return sensor.offset > 30000
+
+    def _is_register_mapped(self, sensor: Sensor) -> bool:
+        # runtime data sensors and most of settings are located by offset within aa55 response
+        return sensor.size_ > 0 and self._is_modbus_setting(sensor)
@@ -1,14 +1,16 @@
 """Hybrid inverter support aka platform 205, 745, 753"""
 from __future__ import annotations
 
+import asyncio
 import logging
+from copy import copy
 
 from .const import *
 from .exceptions import RequestFailedException, RequestRejectedException
 from .inverter import Inverter, OperationMode, SensorKind as Kind
 from .modbus import ILLEGAL_DATA_ADDRESS
 from .model import is_2_battery, is_4_mppt, is_745_platform, is_single_phase
-from .protocol import ProtocolCommand
+from .protocol import ProtocolCommand, ProtocolResponse
 from .sensor import *
 
 logger = logging.getLogger(__name__)
@@ -469,6 +471,17 @@ class ET(Inverter):
         Integer("eco_mode_enable", 47612, "Eco Mode Switch"),
     )
 
+    _PROFILE_FLAGS: tuple[str, ...] = ('_has_eco_mode_v2', '_has_peak_shaving', '_has_battery', '_has_battery2',
+                                       '_has_meter_extended', '_has_meter_extended2', '_has_mppt')
+    _PROFILE_SENSORS: tuple[str, ...] = ('_sensors', '_sensors_battery', '_sensors_battery2', '_sensors_meter',
+                                         '_sensors_mppt')
+    # optional runtime data block: (capability flag, sensors, name used in log)
+    _OPTIONAL_BLOCKS: dict[str, tuple[str, str, str]] = {
+        'battery': ('_has_battery', '_sensors_battery', 'Battery'),
+        'battery2': ('_has_battery2', '_sensors_battery2', 'Battery 2'),
+        'mppt': ('_has_mppt', '_sensors_mppt', 'MPPT'),
+    }
+
     def __init__(self, host: str, port: int, comm_addr: int = 0, timeout: int = 1, retries: int = 3):
         super().__init__(host, port, comm_addr if comm_addr else 0xf7, timeout, retries)
         self._READ_DEVICE_VERSION_INFO: ProtocolCommand = self._read_command(0x88b8, 0x0021)
@@ -494,6 +507,13 @@ class ET(Inverter):
         self._settings: dict[str, Sensor] = {s.id_: s for s in self.__all_settings}
         self._sensors_map: dict[str, Sensor] | None = None
 
+    def _settings_groups(self) -> dict[str, tuple[Sensor, ...]]:
+        return {'arm_fw_19': self.__settings_arm_fw_19, 'arm_fw_22': self.__settings_arm_fw_22}
+
+    def _probe_command(self) -> ProtocolCommand | None:
+        # first register of device info (modbus protocol version)
+        return self._read_command(0x88b8, 1)
+
     @staticmethod
     def _single_phase_only(s: Sensor) -> bool:
         """Filter to exclude phase2/3 sensors on single phase inverters"""
@@ -526,6 +546,9 @@ class ET(Inverter):
         self.firmware = self._decode(response[42:54])  # 35021 - 35027
         self.arm_firmware = self._decode(response[54:66])  # 35027 - 35032
 
+        if self._apply_profile():
+            return
+
         if not is_4_mppt(self) and self.rated_power < 15000:
             # This inverter does not have 4 MPPTs or PV strings
             self._sensors = tuple(filter(lambda s: not ('pv4' in s.id_), self._sensors))
@@ -546,10 +569,14 @@ class ET(Inverter):
         else:
             self._sensors_meter = tuple(filter(self._not_extended_meter, self._sensors_meter))
 
+        await self._detect_settings_groups()
+
+    async def _detect_settings_groups(self) -> None:
+        """Check which optional settings groups are supported by the inverter"""
         # Check and add EcoModeV2 settings added in (ETU fw 19)
         try:
             await self._read_from_socket(self._read_command(47547, 6))
-            self._settings.update({s.id_: s for s in self.__settings_arm_fw_19})
+            self._enable_settings_group('arm_fw_19')
         except RequestRejectedException as ex:
             if ex.message == ILLEGAL_DATA_ADDRESS:
                 logger.debug("EcoModeV2 settings not supported, switching to EcoModeV1.")
@@ -561,7 +588,7 @@ class ET(Inverter):
         # Check and add Peak Shaving settings added in (ETU fw 22)
         try:
             await self._read_from_socket(self._read_command(47589, 6))
-            self._settings.update({s.id_: s for s in self.__settings_arm_fw_22})
+            self._enable_settings_group('arm_fw_22')
         except RequestRejectedException as ex:
             if ex.message == ILLEGAL_DATA_ADDRESS:
                 logger.debug("PeakShaving setting not supported, disabling it.")
@@ -571,78 +598,115 @@ class ET(Inverter):
             self._has_peak_shaving = False
 
     async def read_runtime_data(self) -> dict[str, Any]:
+        if self._protocol.pipelining:
+            return self._snapshot_runtime(await self._read_runtime_data_concurrently())
+        return self._snapshot_runtime(await self._read_runtime_data_sequentially())
+
+    async def _read_runtime_data_sequentially(self) -> dict[str, Any]:
         response = await self._read_from_socket(self._READ_RUNNING_DATA)
         data = self._map_response(response, self._sensors)
 
         self._has_battery = data.get('battery_mode', 0) != 0
         if self._has_battery:
-            try:
-                response = await self._read_from_socket(self._READ_BATTERY_INFO)
-                data.update(self._map_response(response, self._sensors_battery))
-            except RequestRejectedException as ex:
-                if ex.message == ILLEGAL_DATA_ADDRESS:
-                    logger.info("Battery values not supported, disabling further attempts.")
-                    self._has_battery = False
-                else:
-                    raise ex
+            data.update(self._map_optional_block('battery', await self._read_or_rejection(self._READ_BATTERY_INFO)))
         if self._has_battery2:
-            try:
-                response = await self._read_from_socket(self._READ_BATTERY2_INFO)
-                data.update(
-                    self._map_response(response, self._sensors_battery2))
-            except RequestRejectedException as ex:
-                if ex.message == ILLEGAL_DATA_ADDRESS:
-                    logger.info("Battery 2 values not supported, disabling further attempts.")
-                    self._has_battery2 = False
-                else:
-                    raise ex
+            data.update(self._map_optional_block('battery2', await self._read_or_rejection(self._READ_BATTERY2_INFO)))
 
-        if self._has_meter_extended2:
-            try:
-                response = await self._read_from_socket(self._READ_METER_DATA_EXTENDED2)
-                data.update(self._map_response(response, self._sensors_meter))
-            except RequestRejectedException as ex:
-                if ex.message == ILLEGAL_DATA_ADDRESS:
-                    logger.info("Extended meter values not supported, disabling further attempts.")
-                    self._has_meter_extended2 = False
-                    self._sensors_meter = tuple(filter(self._not_extended_meter2, self._sensors_meter))
-                    response = await self._read_from_socket(self._READ_METER_DATA_EXTENDED)
-                    data.update(
-                        self._map_response(response, self._sensors_meter))
-                else:
-                    raise ex
-        elif self._has_meter_extended:
-            try:
-                response = await self._read_from_socket(self._READ_METER_DATA_EXTENDED)
-                data.update(self._map_response(response, self._sensors_meter))
-            except RequestRejectedException as ex:
-                if ex.message == ILLEGAL_DATA_ADDRESS:
-                    logger.info("Extended meter values not supported, disabling further attempts.")
-                    self._has_meter_extended = False
-                    self._sensors_meter = tuple(filter(self._not_extended_meter, self._sensors_meter))
-                    response = await self._read_from_socket(self._READ_METER_DATA)
-                    data.update(
-                        self._map_response(response, self._sensors_meter))
-                else:
-                    raise ex
-        else:
-            response = await self._read_from_socket(self._READ_METER_DATA)
-            data.update(self._map_response(response, self._sensors_meter))
+        response = await self._meter_fallback(await self._read_or_rejection(self._meter_command()))
+        data.update(self._map_response(self._check_response(response), self._sensors_meter))
 
         if self._has_mppt:
-            try:
-                response = await self._read_from_socket(self._READ_MPPT_DATA)
-                data.update(self._map_response(response, self._sensors_mppt))
-            except RequestRejectedException as ex:
-                if ex.message == ILLEGAL_DATA_ADDRESS:
-                    logger.info("MPPT values not supported, disabling further attempts.")
-                    self._has_mppt = False
-                else:
-                    raise ex
+            data.update(self._map_optional_block('mppt', await self._read_or_rejection(self._READ_MPPT_DATA)))
+        return data
+
+    async def _read_runtime_data_concurrently(self) -> dict[str, Any]:
+        """
+        Request all the runtime data blocks at once (on transport able to pipeline the requests).
+        The capability fallbacks (unsupported blocks) are applied after all responses are received.
+        """
+        commands = {'running': self._READ_RUNNING_DATA, 'meter': self._meter_command()}
+        if self._has_battery:
+            commands['battery'] = self._READ_BATTERY_INFO
+        if self._has_battery2:
+            commands['battery2'] = self._READ_BATTERY2_INFO
+        if self._has_mppt:
+            commands['mppt'] = self._READ_MPPT_DATA
+        results = await asyncio.gather(*(self._read_from_socket(c) for c in commands.values()),
+                                       return_exceptions=True)
+        responses = dict(zip(commands, results))
+
+        data = self._map_response(self._check_response(responses['running']), self._sensors)
 
+        self._has_battery = data.get('battery_mode', 0) != 0
+        if self._has_battery and 'battery' not in responses:
+            # Battery appeared since the last poll
+            responses['battery'] = await self._read_or_rejection(self._READ_BATTERY_INFO)
+        if self._has_battery:
+            data.update(self._map_optional_block('battery', responses['battery']))
+        if self._has_battery2:
+            data.update(self._map_optional_block('battery2', responses['battery2']))
+
+        response = await self._meter_fallback(responses['meter'])
+        data.update(self._map_response(self._check_response(response), self._sensors_meter))
+
+        if self._has_mppt:
+            data.update(self._map_optional_block('mppt', responses['mppt']))
         return data
 
-    async def read_sensor(self, sensor_id: str) -> Any:
+    def _map_optional_block(self, block: str, result: ProtocolResponse | BaseException) -> dict[str, Any]:
+        """
+        Map the response of optional (battery, battery2, mppt) data block.
+        Disable further reads of the block if it is not supported by the inverter.
+        """
+        flag, sensors, name = self._OPTIONAL_BLOCKS[block]
+        if self._is_unsupported(result):
+            logger.info("%s values not supported, disabling further attempts.", name)
+            setattr(self, flag, False)
+            return {}
+        return self._map_response(self._check_response(result), getattr(self, sensors))
+
+    async def _meter_fallback(self, result: ProtocolResponse | BaseException) -> ProtocolResponse | BaseException:
+        """Answer the meter data result, re-read by less extended meter command if the meter block is unsupported"""
+        if self._is_unsupported(result) and self._has_meter_extended2:
+            logger.info("Extended meter values not supported, disabling further attempts.")
+            self._has_meter_extended2 = False
+            self._sensors_meter = tuple(filter(self._not_extended_meter2, self._sensors_meter))
+            result = await self._read_or_rejection(self._READ_METER_DATA_EXTENDED)
+        if self._is_unsupported(result) and self._has_meter_extended:
+            logger.info("Extended meter values not supported, disabling further attempts.")
+            self._has_meter_extended = False
+            self._sensors_meter = tuple(filter(self._not_extended_meter, self._sensors_meter))
+            result = await self._read_or_rejection(self._READ_METER_DATA)
+        return result
+
+    def _meter_command(self) -> ProtocolCommand:
+        """Answer the meter data command matching the (so far) detected meter capabilities"""
+        if self._has_meter_extended2:
+            return self._READ_METER_DATA_EXTENDED2
+        if self._has_meter_extended:
+            return self._READ_METER_DATA_EXTENDED
+        return self._READ_METER_DATA
+
+    async def _read_or_rejection(self, command: ProtocolCommand) -> ProtocolResponse | RequestRejectedException:
+        """Answer the response to command, or the exception it was rejected with"""
+        try:
+            return await self._read_from_socket(command)
+        except RequestRejectedException as ex:
+            return ex
+
+    @staticmethod
+    def _is_unsupported(result: ProtocolResponse | BaseException) -> bool:
+        """Answer True if the request was rejected due to unsupported register address"""
+        return isinstance(result, RequestRejectedException) and result.message == ILLEGAL_DATA_ADDRESS
+
+    @staticmethod
+    def _check_response(result: ProtocolResponse | BaseException) -> ProtocolResponse:
+        """Answer the response, raise the exception if the request failed"""
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _read_sensor_by_id(self, sensor_id: str) -> Any:
         sensor: Sensor = self._get_sensor(sensor_id)
         if sensor:
             return await self._read_sensor(sensor)
@@ -651,7 +715,7 @@ class ET(Inverter):
             return int.from_bytes(response.read(2), byteorder="big", signed=True)
         raise ValueError(f'Unknown sensor "{sensor_id}"')
 
-    async def read_setting(self, setting_id: str) -> Any:
+    async def _read_setting_by_id(self, setting_id: str) -> Any:
         setting: Sensor = self._settings.get(setting_id)
         if setting:
             return await self._read_sensor(setting)
@@ -684,9 +748,12 @@ class ET(Inverter):
 
     async def _write_setting(self, setting: Sensor, value: Any):
         if setting.size_ == 1:
-            # modbus can address/store only 16 bit values, read the other 8 bytes
-            response = await self._read_from_socket(self._read_command(setting.offset, 1))
-            raw_value = setting.encode_value(value, response.response_data()[0:2])
+            # modbus can address/store only 16 bit values, read the other 8 bytes (unless known from shadow)
+            register_value = self._shadow_registers(setting.offset, 1)
+            if register_value is None:
+                response = await self._read_from_socket(self._read_command(setting.offset, 1))
+                register_value = response.response_data()[0:2]
+            raw_value = setting.encode_value(value, register_value)
         else:
             raw_value = setting.encode_value(value)
         if len(raw_value) <= 2:
@@ -696,15 +763,9 @@ class ET(Inverter):
             await self._read_from_socket(self._write_multi_command(setting.offset, raw_value))
 
     async def read_settings_data(self) -> dict[str, Any]:
-        data = {}
-        for setting in self.settings():
-            try:
-                value = await self.read_setting(setting.id_)
-                data[setting.id_] = value
-            except (ValueError, RequestFailedException):
-                logger.exception("Error reading setting %s.", setting.id_)
-                data[setting.id_] = None
-        return data
+        settings = self.settings()
+        data = await self._read_coalesced(settings)
+        return self._snapshot_settings({s.id_: data.get(s.id_) for s in settings})
 
     async def get_grid_export_limit(self) -> int:
         return await self.read_setting('grid_export_limit')
@@ -773,21 +834,22 @@ class ET(Inverter):
             if eco_mode_soc < 0 or eco_mode_soc > 100:
                 raise ValueError()
 
-            eco_mode: EcoMode | Sensor = self._settings.get('eco_mode_1')
+            eco_mode_setting: EcoMode | Sensor = self._settings.get('eco_mode_1')
             # Load the current values to try to detect schedule type
             try:
-                await self._read_sensor(eco_mode)
+                eco_mode = await self._read_sensor(eco_mode_setting) or copy(eco_mode_setting)
             except ValueError:
-                pass
+                eco_mode = copy(eco_mode_setting)
             eco_mode.set_schedule_type(ScheduleType.ECO_MODE, is_745_platform(self))
-            if operation_mode == OperationMode.ECO_CHARGE:
-                await self.write_setting('eco_mode_1', eco_mode.encode_charge(eco_mode_power, eco_mode_soc))
-            else:
-                await self.write_setting('eco_mode_1', eco_mode.encode_discharge(eco_mode_power))
-            await self.write_setting('eco_mode_2_switch', 0)
-            await self.write_setting('eco_mode_3_switch', 0)
-            await self.write_setting('eco_mode_4_switch', 0)
-            await self.write_setting('work_mode', 3)
+            async with self.write_transaction() as transaction:
+                if operation_mode == OperationMode.ECO_CHARGE:
+                    transaction.write_setting('eco_mode_1', eco_mode.encode_charge(eco_mode_power, eco_mode_soc))
+                else:
+                    transaction.write_setting('eco_mode_1', eco_mode.encode_discharge(eco_mode_power))
+                transaction.write_setting('eco_mode_2_switch', 0)
+                transaction.write_setting('eco_mode_3_switch', 0)
+                transaction.write_setting('eco_mode_4_switch', 0)
+                transaction.write_setting('work_mode', 3)
             await self._set_offline(False)
 
     async def get_ongrid_battery_dod(self) -> int:
@@ -0,0 +1,172 @@
+"""Periodic polling of many inverters."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from .exceptions import InverterError
+from .inverter import Inverter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollResult:
+    """
+    Result of single scheduled read of inverter.
+
+    Attributes:
+        inverter -- the polled inverter
+        name -- name of the scheduled read (e.g. runtime, settings)
+        data -- data answered by the read (None if it failed)
+        error -- the error the read failed with (None if it succeeded)
+        started -- (monotonic) time the read was started
+        duration -- duration of the read [s]
+    """
+
+    inverter: Inverter
+    name: str
+    data: Any
+    error: Exception | None
+    started: float
+    duration: float
+
+
+@dataclass
+class PollJob:
+    """Definition of read of inverter scheduled every interval seconds"""
+
+    inverter: Inverter
+    name: str
+    interval: float
+    read: Callable[[Inverter], Awaitable[Any]]
+
+
+class FleetPoller:
+    """
+    Poller of many inverters within single event loop.
+
+    Each inverter read (runtime data, settings or any custom read) is scheduled at its own interval.
+    The reads are scheduled by (monotonic) deadlines, so they do not drift; when a read takes longer than
+    its interval, the missed runs are skipped.
+    At most max_concurrency reads are executed at once, at most max_per_host reads per single host
+    (communication dongle).
+    The results of reads are streamed to consumers via results() async iterator.
+    """
+
+    def __init__(self, max_concurrency: int = 16, max_per_host: int = 1, queue_size: int = 0):
+        self.max_concurrency: int = max_concurrency
+        self.max_per_host: int = max_per_host
+        self.queue_size: int = queue_size
+        self._jobs: list[PollJob] = []
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._queue: asyncio.Queue | None = None
+
+    async def __aenter__(self) -> FleetPoller:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def add(self, inverter: Inverter, runtime_interval: float | None = 10,
+            settings_interval: float | None = None) -> None:
+        """Schedule runtime data and settings reads of inverter (None interval means not to read it)"""
+        if runtime_interval:
+            self.schedule(inverter, 'runtime', runtime_interval, lambda inv: inv.read_runtime_data())
+        if settings_interval:
+            self.schedule(inverter, 'settings', settings_interval, lambda inv: inv.read_settings_data())
+
+    def schedule(self, inverter: Inverter, name: str, interval: float,
+                 read: Callable[[Inverter], Awaitable[Any]]) -> None:
+        """
+        Schedule custom read of inverter every interval seconds,
+        e.g. schedule(inverter, 'battery', 30, lambda inv: inv.read_sensors(['battery_soc', 'battery_temperature']))
+        """
+        job = PollJob(inverter, name, interval, read)
+        self._jobs.append(job)
+        if self._queue is not None:
+            self._start_job(job)
+
+    def remove(self, inverter: Inverter) -> None:
+        """Remove all scheduled reads of inverter"""
+        for job in [j for j in self._jobs if j.inverter is inverter]:
+            self._jobs.remove(job)
+            task = self._tasks.pop(id(job), None)
+            if task:
+                task.cancel()
+
+    async def start(self) -> None:
+        """Start polling the inverters"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
+        self._queue = asyncio.Queue(self.queue_size)
+        for job in self._jobs:
+            self._start_job(job)
+
+    async def stop(self) -> None:
+        """Stop polling the inverters, the results() iteration ends"""
+        tasks = list(self._tasks.values())
+        self._tasks = {}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._queue is not None:
+            queue, self._queue = self._queue, None
+            await queue.put(None)
+
+    async def results(self) -> AsyncIterator[PollResult]:
+        """Answer the results of the reads as they are completed (until the poller is stopped)"""
+        queue = self._queue
+        while queue is not None:
+            result = await queue.get()
+            if result is None:
+                return
+            yield result
+
+    def _start_job(self, job: PollJob) -> None:
+        self._tasks[id(job)] = asyncio.ensure_future(self._run_job(job))
+
+    def _host_semaphore(self, inverter: Inverter) -> asyncio.Semaphore:
+        host = inverter.host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    async def _run_job(self, job: PollJob) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        deadline = loop.time()
+        while True:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with self._semaphore, self._host_semaphore(job.inverter):
+                started = loop.time()
+                data, error = None, None
+                try:
+                    data = await job.read(job.inverter)
+                except InverterError as ex:
+                    logger.debug("Scheduled %s read of inverter %s failed: %s", job.name, job.inverter.serial_number,
+                                 ex)
+                    error = ex
+                except Exception as ex:
+                    # e.g. error decoding the data or bug of custom read, the schedule must go on anyway
+                    logger.exception("Scheduled %s read of inverter %s failed.", job.name, job.inverter.serial_number)
+                    error = ex
+                duration = loop.time() - started
+            await queue.put(PollResult(job.inverter, job.name, data, error, started, duration))
+
+            deadline += job.interval
+            now = loop.time()
+            if deadline < now:
+                missed = math.ceil((now - deadline) / job.interval)
+                logger.debug("Scheduled %s read of inverter %s skipped %d run(s).", job.name,
+                             job.inverter.serial_number, missed)
+                deadline += missed * job.interval
@@ -1,17 +1,33 @@
 """Generic inverter API module."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import struct
+import time
 from abc import ABC, abstractmethod
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum, IntEnum
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional
 
-from .exceptions import MaxRetriesException, RequestFailedException
-from .protocol import InverterProtocol, ProtocolCommand, ProtocolResponse, TcpInverterProtocol, UdpInverterProtocol
+from .exceptions import MaxRetriesException, RequestFailedException, RequestRejectedException
+from .modbus import ILLEGAL_DATA_ADDRESS
+from .protocol import InverterProtocol, ProtocolCommand, ProtocolResponse, RetryPolicy, TcpInverterProtocol, \
+    UdpInverterProtocol
+from .shadow import RegisterShadow
 
 logger = logging.getLogger(__name__)
 
+# Maximal number of registers allowed to be read by single modbus request
+MAX_READ_REGISTERS: int = 125
+# Maximal number of sensors decode plans cached by single inverter instance
+MAX_DECODE_PLANS: int = 32
+# Maximal number of unused registers read (and ignored) to merge two sensors ranges to single request
+MAX_READ_GAP: int = 16
+# Maximal number of registers allowed to be written by single modbus request
+MAX_WRITE_REGISTERS: int = 123
+
 
 class SensorKind(Enum):
     """
@@ -36,7 +52,12 @@ class SensorKind(Enum):
 
 @dataclass
 class Sensor:
-    """Definition of inverter sensor and its attributes"""
+    """
+    Definition of inverter sensor and its attributes.
+    Sensor definitions are shared (by all inverter instances) and are not modified by reading the values.
+    """
+
+    __slots__ = ('id_', 'offset', 'name', 'size_', 'unit', 'kind')
 
     id_: str
     offset: int
@@ -58,6 +79,82 @@ class Sensor:
         """Encode the (setting mostly) value to (usually) 2 bytes raw register value"""
         raise NotImplementedError()
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]] | None:
+        """
+        Answer the (big endian) struct format of the raw sensor value and conversion of unpacked value.
+        Answer None if the sensor value can be decoded by read() only.
+        """
+        return None
+
+
+class DecodePlan:
+    """
+    Precompiled decoding of sensors values from response data.
+    All fixed width (non overlapping) sensors values are unpacked by single struct, the rest is read one by one.
+    """
+
+    def __init__(self, sensors: tuple[Sensor, ...], get_offset: Callable[[int], int]):
+        self.sensors: tuple[Sensor, ...] = sensors
+        self.ids: tuple[str, ...] = tuple(s.id_ for s in sensors)
+        self.address: int = 0
+        self.struct: struct.Struct | None = None
+        self.indexes: tuple[int, ...] = ()
+        self.converters: tuple[Optional[Callable[[Any], Any]], ...] = ()
+        self.fallback: list[tuple[int, Sensor]] = []
+
+        fields = []
+        for index, sensor in enumerate(sensors):
+            unpacker = sensor.unpacker()
+            position = get_offset(sensor.offset) if unpacker else -1
+            if position < 0:
+                self.fallback.append((index, sensor))
+            else:
+                fields.append((position, index, sensor, unpacker))
+        fields.sort(key=lambda f: f[0])
+
+        fmt = ['>']
+        indexes = []
+        converters = []
+        end = fields[0][0] if fields else 0
+        for position, index, sensor, (code, converter) in fields:
+            if position < end:
+                # overlapping values can't be unpacked by single struct
+                self.fallback.append((index, sensor))
+                continue
+            if position > end:
+                fmt.append(f'{position - end}x')
+            fmt.append(code)
+            end = position + struct.calcsize('>' + code)
+            if not indexes:
+                self.address = sensor.offset
+            indexes.append(index)
+            converters.append(converter)
+        if indexes:
+            self.struct = struct.Struct(''.join(fmt))
+            self.indexes = tuple(indexes)
+            self.converters = tuple(converters)
+
+    def decode(self, response: ProtocolResponse) -> dict[str, Any] | None:
+        """
+        Decode the sensors values from response.
+        Answer None when the response data does not contain all the values.
+        """
+        values: list[Any] = [None] * len(self.ids)
+        if self.struct is not None:
+            try:
+                response.seek(self.address)
+                raw_values = response.unpack(self.struct)
+            except struct.error:
+                return None
+            for index, converter, value in zip(self.indexes, self.converters, raw_values):
+                values[index] = converter(value) if converter else value
+        for index, sensor in self.fallback:
+            try:
+                values[index] = sensor.read(response)
+            except ValueError:
+                logger.exception("Error reading sensor %s.", sensor.id_)
+        return dict(zip(self.ids, values))
+
 
 class OperationMode(IntEnum):
     """
@@ -83,15 +180,331 @@ class OperationMode(IntEnum):
     ECO_DISCHARGE = 99
 
 
+class CircuitState(Enum):
+    """
+    Enumeration of circuit breaker states.
+
+    Possible values are:
+    CLOSED - inverter is reachable, requests are sent normally
+    OPEN - inverter is considered offline, requests fail immediately
+    HALF_OPEN - recovery timeout elapsed, single probe request is sent to detect inverter recovery
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of inverter communication.
+    After failure_threshold consecutive failed requests the circuit is opened and all requests fail immediately
+    (without contacting the inverter) for recovery_timeout seconds. Then the circuit is half-open
+    and single (cheap) probe request is sent, its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0):
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.state: CircuitState = CircuitState.CLOSED
+        self.opened_at: float | None = None
+        self.rejected: int = 0
+        self.probes: int = 0
+
+    def __repr__(self):
+        return f"{self.state.value} (threshold={self.failure_threshold}, recovery={self.recovery_timeout})"
+
+    def allow_probe(self) -> bool:
+        """
+        Answer True if the recovery probe may be sent now (the circuit is switched to half-open),
+        False if the request should fail immediately.
+        """
+        if self.state == CircuitState.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            logger.debug("Circuit breaker half-open, probing inverter.")
+            self.state = CircuitState.HALF_OPEN
+            self.probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record successful request"""
+        if self.state != CircuitState.CLOSED:
+            logger.debug("Circuit breaker closed, inverter is reachable again.")
+        self.state = CircuitState.CLOSED
+        self.opened_at = None
+
+    def record_failure(self, consecutive_failures_count: int) -> None:
+        """Record failed request"""
+        if self.state == CircuitState.HALF_OPEN or (
+                self.state == CircuitState.CLOSED and consecutive_failures_count >= self.failure_threshold):
+            logger.debug("Circuit breaker opened after %d consecutive failures.", consecutive_failures_count)
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_abandoned(self) -> None:
+        """Record request abandoned (cancelled) before its outcome was known"""
+        if self.state == CircuitState.HALF_OPEN:
+            # no outcome of the probe, the next request probes the inverter again
+            self.state = CircuitState.OPEN
+
+    def stats(self) -> dict[str, Any]:
+        """Answer the circuit breaker state and statistics"""
+        return {
+            'state': self.state.value,
+            'opened_for': time.monotonic() - self.opened_at if self.opened_at is not None else None,
+            'rejected': self.rejected,
+            'probes': self.probes,
+        }
+
+
+class Snapshot:
+    """
+    Last read values of inverter sensors (or settings), together with the (monotonic) time they were read at.
+    """
+
+    def __init__(self):
+        self._values: dict[str, tuple[float, Any]] = {}
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def get(self, id_: str, max_age: float) -> Any:
+        """Answer the value read at most max_age seconds ago, raise KeyError if there is no such value"""
+        read_at, value = self._values[id_]
+        if time.monotonic() - read_at > max_age:
+            raise KeyError(id_)
+        return value
+
+    def set(self, id_: str, value: Any) -> None:
+        """Store the value just read"""
+        self._values[id_] = (time.monotonic(), value)
+
+    def update(self, values: dict[str, Any]) -> None:
+        """Store the values just read"""
+        now = time.monotonic()
+        self._values.update((id_, (now, value)) for id_, value in values.items())
+
+    def invalidate(self, ids: Iterable[str] | None = None) -> None:
+        """Discard the values of ids (all values if ids is None)"""
+        if ids is None:
+            self._values.clear()
+        else:
+            for id_ in ids:
+                self._values.pop(id_, None)
+
+
+def _register_ranges(registers: Iterable[int], max_gap: int = 0, max_count: int = MAX_READ_REGISTERS) -> list[range]:
+    """
+    Group the registers to ranges of at most max_count registers,
+    merging the ranges when the hole between them is at most max_gap registers.
+    """
+    ranges = []
+    start = end = None
+    for register in sorted(set(registers)):
+        if start is not None and register <= end + max_gap and register - start < max_count:
+            end = register + 1
+        else:
+            if start is not None:
+                ranges.append(range(start, end))
+            start, end = register, register + 1
+    if start is not None:
+        ranges.append(range(start, end))
+    return ranges
+
+
+def _register_count(setting: Sensor | None) -> int:
+    """Answer the number of registers occupied by setting (single register for plain modbus register)"""
+    return max(1, (setting.size_ + 1) // 2) if setting else 1
+
+
+class WriteTransaction:
+    """
+    Batch of inverter settings writes.
+
+    The settings values are encoded to registers first. The registers of partially written settings
+    (e.g. single byte) are read by as few requests as possible, then all the modified registers are written
+    by as few requests as possible (contiguous registers by single multi register write).
+    Single register setting not merged with any other write is written by inverter's write_setting(),
+    the same way as outside of transaction.
+
+    Registers separated by hole of at most max_gap registers are written by single request too,
+    the hole registers are read and written back unchanged. BEWARE, a change of hole register made
+    (by someone else) between the read and write is lost, so max_gap should be used only for registers
+    not modified by the inverter itself or other clients.
+
+    The writes are committed on exit of (async) context manager, or by explicit commit() call.
+    """
+
+    def __init__(self, inverter: Inverter, max_gap: int = 0):
+        self.max_gap: int = max_gap
+        self._inverter: Inverter = inverter
+        self._writes: list[tuple[str, Any]] = []
+
+    async def __aenter__(self) -> WriteTransaction:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            await self.commit()
+
+    def write_setting(self, setting_id: str, value: Any) -> None:
+        """Add the setting value to be written by commit()"""
+        self._writes.append((setting_id, value))
+
+    async def commit(self) -> None:
+        """Write all the settings values to the inverter"""
+        writes, self._writes = self._writes, []
+        register_writes, others = self._plan(writes)
+        written = {r for _, offset, setting, _ in register_writes
+                   for r in range(offset, offset + _register_count(setting))}
+        partial = {offset for _, offset, setting, _ in register_writes if setting and setting.size_ == 1}
+        holes = {r for block in _register_ranges(written, self.max_gap) for r in block if r not in written}
+        current = await self._read_registers(partial, holes)
+        registers, order = self._encode(register_writes, current)
+        await self._emit_writes(registers, order, others)
+
+    def _plan(self, writes: list[tuple[str, Any]]) \
+            -> tuple[list[tuple[int, int, Sensor | None, Any]], list[tuple[int, str, Any]]]:
+        """
+        Split the writes to register writes (index of write, register, setting (None for plain modbus register),
+        value) and the (index of write, setting id, value) of the settings written individually.
+        """
+        inverter = self._inverter
+        settings = {s.id_: s for s in inverter.settings()}
+        others: list[tuple[int, str, Any]] = []
+        register_writes: list[tuple[int, int, Sensor | None, Any]] = []
+        for index, (setting_id, value) in enumerate(writes):
+            setting = settings.get(setting_id)
+            if setting is not None and inverter._is_register_mapped(setting):
+                register_writes.append((index, setting.offset, setting, value))
+            elif setting is None and setting_id.startswith("modbus"):
+                register_writes.append((index, int(setting_id[7:]), None, int(value)))
+            else:
+                others.append((index, setting_id, value))
+
+        # single register not merged with any other write is written as plain setting write
+        ranges = _register_ranges((r for _, offset, setting, _ in register_writes
+                                   for r in range(offset, offset + _register_count(setting))), self.max_gap)
+        writers = Counter(offset for _, offset, _, _ in register_writes)
+        alone = {block.start for block in ranges if len(block) == 1 and writers[block.start] == 1}
+        others.extend((index,) + writes[index] for index, offset, _, _ in register_writes if offset in alone)
+        return [w for w in register_writes if w[1] not in alone], others
+
+    def _encode(self, register_writes: list[tuple[int, int, Sensor | None, Any]], current: dict[int, bytes]) \
+            -> tuple[dict[int, bytes], dict[int, int]]:
+        """
+        Answer the raw values of written registers (including the holes filled by their current values)
+        and the index of (first) write of each register.
+        """
+        registers: dict[int, bytes] = {}
+        order: dict[int, int] = {}
+        for index, offset, setting, value in register_writes:
+            if setting is None:
+                raw_value = (value & 0xFFFF).to_bytes(2, byteorder="big")
+            elif setting.size_ == 1:
+                raw_value = setting.encode_value(value, registers.get(offset) or current[offset])
+            else:
+                raw_value = setting.encode_value(value)
+            for i in range(0, len(raw_value), 2):
+                registers[offset + i // 2] = raw_value[i:i + 2]
+                order.setdefault(offset + i // 2, index)
+        for block in _register_ranges(registers, self.max_gap):
+            if all(r in registers or r in current for r in block):
+                for register in block:
+                    if register not in registers:
+                        registers[register] = current[register]
+                        order[register] = order[block.start]
+        return registers, order
+
+    async def _emit_writes(self, registers: dict[int, bytes], order: dict[int, int],
+                           others: list[tuple[int, str, Any]]) -> None:
+        """Write the registers (contiguous ones by single request) and other settings in the order of writes"""
+        inverter = self._inverter
+        requests = [(min(order[r] for r in block), block)
+                    for block in _register_ranges(registers, 0, MAX_WRITE_REGISTERS)]
+        requests.extend((index, (setting_id, value)) for index, setting_id, value in others)
+        for _, request in sorted(requests, key=lambda r: r[0]):
+            if isinstance(request, range):
+                data = b''.join(registers[r] for r in request)
+                if len(request) == 1:
+                    value = int.from_bytes(data, byteorder="big", signed=True)
+                    await inverter._read_from_socket(inverter._write_command(request.start, value))
+                else:
+                    await inverter._read_from_socket(inverter._write_multi_command(request.start, data))
+            else:
+                await inverter.write_setting(*request)
+
+    async def _read_registers(self, required: set[int], optional: set[int]) -> dict[int, bytes]:
+        """
+        Read the current values of registers (by as few requests as possible).
+        Answer dictionary of raw register values, the optional registers may be missing.
+        """
+        inverter = self._inverter
+        result = {}
+        for register in required | optional:
+            value = inverter._shadow_registers(register, 1)
+            if value is not None:
+                result[register] = value
+        for block in _register_ranges((r for r in required | optional if r not in result), MAX_READ_GAP):
+            try:
+                response = await inverter._read_from_socket(inverter._read_command(block.start, len(block)))
+            except RequestRejectedException as ex:
+                logger.debug("Failed to read registers %d-%d: %s.", block.start, block.stop - 1, ex.message)
+                continue
+            data = response.response_data()
+            result.update((r, data[i * 2:i * 2 + 2]) for i, r in enumerate(block) if len(data) >= i * 2 + 2)
+        for register in sorted(required):
+            if register not in result:
+                # e.g. register range containing unsupported address
+                response = await inverter._read_from_socket(inverter._read_command(register, 1))
+                result[register] = response.response_data()[0:2]
+        return result
+
+
+class _ShadowCommand(ProtocolCommand):
+    """Pseudo command (never sent) providing register addressing of data read from register shadow"""
+
+    def __init__(self, offset: int):
+        super().__init__(b'', lambda x: True)
+        self.first_address: int = offset
+
+    def get_offset(self, address: int):
+        return (address - self.first_address) * 2
+
+
+class _InFlightRequest:
+    """Request sent to the inverter, awaited by (possibly several) callers"""
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task: asyncio.Task = task
+        self.waiters: int = 0
+
+
 class Inverter(ABC):
     """
     Common superclass for various inverter models implementations.
     Represents the inverter state and its basic behavior
     """
 
+    # Names of attributes (flags and sensor tuples) representing the inverter capabilities (in capability profile)
+    _PROFILE_FLAGS: tuple[str, ...] = ()
+    _PROFILE_SENSORS: tuple[str, ...] = ()
+
     def __init__(self, host: str, port: int, comm_addr: int = 0, timeout: int = 1, retries: int = 3):
         self._protocol: InverterProtocol = self._create_protocol(host, port, comm_addr, timeout, retries)
         self._consecutive_failures_count: int = 0
+        self._circuit_breaker: CircuitBreaker | None = None
+        self._decode_plans: dict[tuple[tuple[int, ...], int, int], DecodePlan] = {}
+        self._profile: dict[str, Any] | None = None
+        self._enabled_settings_groups: list[str] = []
+        self._snapshot_max_age: float = 0
+        self._sensors_snapshot: Snapshot = Snapshot()
+        self._settings_snapshot: Snapshot = Snapshot()
+        self._in_flight: dict[ProtocolCommand, _InFlightRequest] = {}
+        self._shadow: RegisterShadow | None = None
 
         self.model_name: str | None = None
         self.serial_number: str | None = None
@@ -119,21 +532,387 @@ class Inverter(ABC):
         return self._protocol.write_multi_command(offset, values)
 
     async def _read_from_socket(self, command: ProtocolCommand) -> ProtocolResponse:
+        if type(command) is ProtocolCommand or command.written_registers() is not None:
+            # raw (user's) commands may differ by validator, they are never shared
+            return await self._execute(command)
+        # concurrent identical (read) requests share single request sent to the inverter
+        request = self._in_flight.get(command)
+        if request is None:
+            request = self._in_flight[command] = _InFlightRequest(asyncio.ensure_future(self._execute(command)))
+            request.task.add_done_callback(lambda task: self._in_flight_done(command, task))
+        request.waiters += 1
+        try:
+            response = await asyncio.shield(request.task)
+        finally:
+            request.waiters -= 1
+            if not request.waiters and not request.task.done():
+                # all the callers were cancelled
+                request.task.cancel()
+        # each caller reads the response data from its own position
+        return ProtocolResponse(response.raw_data, command)
+
+    def _in_flight_done(self, command: ProtocolCommand, task: asyncio.Task) -> None:
+        self._in_flight.pop(command, None)
+        if not task.cancelled():
+            # retrieve the exception, the request may have no callers left to do so
+            task.exception()
+
+    async def _execute(self, command: ProtocolCommand) -> ProtocolResponse:
+        if self._circuit_breaker and self._circuit_breaker.state != CircuitState.CLOSED:
+            await self._probe_circuit(command)
         try:
             result = await command.execute(self._protocol)
-            self._consecutive_failures_count = 0
-            return result
+        except RequestRejectedException:
+            # the inverter is reachable, it just rejected the request
+            self._request_succeeded()
+            raise
         except MaxRetriesException:
-            self._consecutive_failures_count += 1
+            self._request_failed()
             raise RequestFailedException(f'No valid response received even after {self._protocol.retries} retries',
                                          self._consecutive_failures_count) from None
         except RequestFailedException as ex:
-            self._consecutive_failures_count += 1
+            self._request_failed()
             raise RequestFailedException(ex.message, self._consecutive_failures_count) from None
+        except Exception:
+            self._request_failed()
+            raise
+        except BaseException:
+            self._request_abandoned()
+            raise
+        else:
+            self._request_succeeded()
+            self._record_response(command, result)
+            return result
+
+    def _record_response(self, command: ProtocolCommand, response: ProtocolResponse) -> None:
+        """Update the snapshot and register shadow according to (successfully executed) command"""
+        registers = command.written_registers()
+        if registers is not None:
+            if self._snapshot_max_age:
+                self._invalidate_registers(registers)
+            if self._shadow is not None:
+                values = command.written_values()
+                if values is None:
+                    self._shadow.invalidate(registers)
+                else:
+                    self._shadow.update(registers.start, values, written=True)
+        elif self._shadow is not None:
+            registers = command.read_registers()
+            if registers is not None:
+                self._shadow.update(registers.start, response.response_data())
+
+    def _request_succeeded(self) -> None:
+        self._consecutive_failures_count = 0
+        if self._circuit_breaker:
+            self._circuit_breaker.record_success()
+
+    def _request_failed(self) -> None:
+        self._consecutive_failures_count += 1
+        if self._circuit_breaker:
+            self._circuit_breaker.record_failure(self._consecutive_failures_count)
+
+    def _request_abandoned(self) -> None:
+        if self._circuit_breaker:
+            self._circuit_breaker.record_abandoned()
+
+    async def _probe_circuit(self, command: ProtocolCommand) -> None:
+        """
+        Fail immediately when the circuit is open, or send the recovery probe when it is time to do so.
+        If the inverter family has no dedicated probe command, the command itself is the probe.
+        """
+        if not self._circuit_breaker.allow_probe():
+            raise RequestFailedException(f'Inverter is not reachable (circuit breaker open), request {command} '
+                                         'not sent', self._consecutive_failures_count)
+        probe = self._probe_command()
+        if probe is None:
+            return
+        try:
+            await probe.execute(self._protocol)
+        except RequestRejectedException:
+            # Inverter is alive, it just did not like the probe
+            self._request_succeeded()
+        except Exception:
+            self._request_failed()
+            raise RequestFailedException(f'Inverter is not reachable (circuit breaker probe failed), request '
+                                         f'{command} not sent', self._consecutive_failures_count) from None
+        except BaseException:
+            self._request_abandoned()
+            raise
+        else:
+            self._request_succeeded()
+
+    def _probe_command(self) -> ProtocolCommand | None:
+        """Answer the cheap (e.g. single register read) command to probe whether the inverter is reachable"""
+        return None
+
+    def _snapshot_runtime(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Store the runtime data to snapshot (if enabled), answer the data"""
+        if self._snapshot_max_age:
+            self._sensors_snapshot.update(data)
+        return data
+
+    def _snapshot_settings(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Store the settings data to snapshot (if enabled), answer the data"""
+        if self._snapshot_max_age:
+            self._settings_snapshot.update(data)
+        return data
+
+    def _invalidate_registers(self, registers: range) -> None:
+        """Discard the snapshot values of sensors and settings stored in (modified) registers"""
+        for snapshot, sensors in ((self._sensors_snapshot, self.sensors()), (self._settings_snapshot, self.settings())):
+            ids = [s.id_ for s in sensors
+                   if s.offset < registers.stop and registers.start < s.offset + max(1, (s.size_ + 1) // 2)]
+            ids.extend(i for i in snapshot if i.startswith('modbus') and int(i[7:]) in registers)
+            snapshot.invalidate(ids)
+
+    def _shadow_registers(self, offset: int, count: int) -> bytes | None:
+        """Answer the raw values of registers from register shadow (None if not enabled, not known or stale)"""
+        return self._shadow.read(offset, count) if self._shadow is not None else None
+
+    def _is_register_mapped(self, sensor: Sensor) -> bool:
+        """Answer True if the sensor offset is register address (i.e. its value can be kept in register shadow)"""
+        return sensor.size_ > 0
+
+    def _get_sensor(self, sensor_id: str) -> Sensor | None:
+        """Answer the sensor definition of sensor_id (None if not supported)"""
+        return next((s for s in self.sensors() if s.id_ == sensor_id), None)
+
+    async def _read_sensor(self, sensor: Sensor) -> Any:
+        """Read the value of single sensor/setting by dedicated request"""
+        raise NotImplementedError()
+
+    async def _read_coalesced(self, sensors: Iterable[Sensor], max_gap: int = 0,
+                              raise_errors: bool = False) -> dict[str, Any]:
+        """
+        Read the values of (modbus) sensors/settings grouped to as few contiguous register range requests as possible.
+        When the range contains unsupported register, its sensors are read one by one.
+        Answer dictionary of sensors values (None if the value could not be read),
+        or raise the read error (ValueError of unsupported sensor or RequestFailedException) if raise_errors is set.
+        """
+        result: dict[str, Any] = {}
+        for offset, count, group in self._plan_reads(sensors, max_gap):
+            if len(group) > 1:
+                values = await self._read_group(offset, count, group, raise_errors)
+                if values is not None:
+                    result.update(values)
+                    continue
+            for sensor in group:
+                try:
+                    result[sensor.id_] = await self._read_sensor(sensor)
+                except (ValueError, RequestFailedException):
+                    if raise_errors:
+                        raise
+                    logger.exception("Error reading sensor/setting %s.", sensor.id_)
+                    result[sensor.id_] = None
+        return result
+
+    def _settings_groups(self) -> dict[str, tuple[Sensor, ...]]:
+        """Answer the optional settings groups (enabled according to inverter model/firmware)"""
+        return {}
+
+    def _enable_settings_group(self, group: str) -> None:
+        """Add the optional settings group to supported settings"""
+        self._settings.update({s.id_: s for s in self._settings_groups()[group]})
+        if group not in self._enabled_settings_groups:
+            self._enabled_settings_groups.append(group)
+
+    def _family(self) -> str:
+        """Answer the name of inverter family (class) implementation"""
+        return next(c for c in type(self).__mro__ if Inverter in c.__bases__).__name__
+
+    def export_profile(self) -> dict[str, Any]:
+        """
+        Answer the capability profile of the inverter (supported sensors, settings and features).
+        It is (JSON) serializable dictionary, which can be used by import_profile() to avoid probing
+        of the inverter capabilities after restart.
+        The profile is complete after read_device_info() and (first) read_runtime_data() calls.
+        """
+        return {
+            'family': self._family(),
+            'serial_number': self.serial_number,
+            'firmware': self.firmware,
+            'arm_firmware': self.arm_firmware,
+            'flags': {name.lstrip('_'): getattr(self, name) for name in self._PROFILE_FLAGS},
+            'sensors': {name.lstrip('_'): [[s.id_, s.offset] for s in getattr(self, name)]
+                        for name in self._PROFILE_SENSORS},
+            'settings_groups': list(self._enabled_settings_groups),
+        }
+
+    def import_profile(self, profile: dict[str, Any]) -> None:
+        """
+        Load the capability profile (answered by export_profile() before).
+        The next read_device_info() call will use it instead of probing the inverter capabilities,
+        if the inverter serial number and firmware versions match the profile ones.
+        """
+        self._profile = profile
+
+    def _apply_profile(self) -> bool:
+        """
+        Set the inverter capabilities from imported profile.
+        Answer False if there is no profile or it does not match the inverter (device info has to be read before).
+        """
+        profile = self._profile
+        if not profile:
+            return False
+        if (profile.get('family'), profile.get('serial_number'), profile.get('firmware'),
+            profile.get('arm_firmware')) != (self._family(), self.serial_number, self.firmware,
+                                             self.arm_firmware):
+            logger.debug("Capability profile does not match inverter %s, ignoring it.", self.serial_number)
+            return False
+        for name in self._PROFILE_FLAGS:
+            setattr(self, name, bool(profile['flags'].get(name.lstrip('_'), getattr(self, name))))
+        for name in self._PROFILE_SENSORS:
+            sensors = profile['sensors'].get(name.lstrip('_'))
+            if sensors is not None:
+                # sensors are identified by id and offset (several tuple variants may have sensor of same id)
+                sensors = {(sensor_id, offset) for sensor_id, offset in sensors}
+                setattr(self, name, tuple(s for s in getattr(self, name) if (s.id_, s.offset) in sensors))
+        for group in profile['settings_groups']:
+            self._enable_settings_group(group)
+        logger.debug("Inverter %s capabilities loaded from profile.", self.serial_number)
+        return True
+
+    @property
+    def host(self) -> str:
+        """Host name (or IP address) of the inverter (communication dongle)"""
+        return self._protocol._host
+
+    async def close(self) -> None:
+        """Close the inverter communication socket/connection (it is re-opened by next request)"""
+        await self._protocol.close()
 
     def set_keep_alive(self, keep_alive: bool) -> None:
         self._protocol.keep_alive = keep_alive
 
+    def set_pipelining(self, pipelining: bool) -> None:
+        """
+        Allow several requests to be sent to inverter without waiting for responses of the previous ones.
+        Supported by Modbus/TCP protocol only (responses are matched by transaction id), ignored otherwise.
+        """
+        if isinstance(self._protocol, TcpInverterProtocol):
+            self._protocol.pipelining = pipelining
+        else:
+            logger.debug("Request pipelining is not supported by %s.", type(self._protocol).__name__)
+
+    def set_shared_socket(self, shared_socket: bool) -> None:
+        """
+        Communicate via single UDP socket shared by all inverters (with this option set) within the event loop,
+        instead of opening dedicated socket for each inverter.
+        The shared socket is kept open until closed by goodwe.protocol.UdpMultiplexer.shutdown().
+        Supported by UDP protocols only, ignored otherwise.
+        """
+        if isinstance(self._protocol, UdpInverterProtocol):
+            self._protocol.shared_socket = shared_socket
+        else:
+            logger.debug("Shared socket is not supported by %s.", type(self._protocol).__name__)
+
+    def set_adaptive_timeout(self, min_timeout: float = 0.2, max_timeout: float = 5.0) -> None:
+        """
+        Derive the request timeout from measured response round trip times (instead of fixed timeout),
+        keeping it in range of min_timeout and max_timeout seconds.
+        """
+        self._protocol.set_adaptive_timeout(min_timeout, max_timeout)
+
+    def set_retry_policy(self, retries: int | None = None, backoff: float = 0.5, max_backoff: float = 5.0,
+                         jitter: float = 0.5, deadline: float | None = None) -> None:
+        """
+        Configure re-tries of failed requests.
+        Each retry is delayed by exponentially growing backoff (starting at backoff, up to max_backoff seconds)
+        randomly shortened by up to jitter fraction. No retries are attempted after deadline seconds
+        since the request was sent first time.
+        """
+        self._protocol.retry_policy = RetryPolicy(self._protocol.retries if retries is None else retries,
+                                                  backoff, max_backoff, jitter, deadline)
+
+    def set_circuit_breaker(self, failure_threshold: int | None = 3, recovery_timeout: float = 60.0) -> None:
+        """
+        Fail the requests immediately (without waiting for timeouts and retries) after failure_threshold
+        consecutive requests have failed, e.g. when the inverter is offline during night.
+        The inverter is probed again after recovery_timeout seconds.
+        Set failure_threshold None to disable the circuit breaker.
+        """
+        if failure_threshold is None:
+            self._circuit_breaker = None
+        else:
+            self._circuit_breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+
+    def set_snapshot_max_age(self, max_age: float) -> None:
+        """
+        Serve read_sensor() and read_setting() calls from the values read (by any read method)
+        at most max_age seconds ago, instead of sending new request to the inverter.
+        The values of settings modified by write_setting() (or other write) are discarded.
+        Set max_age 0 to disable the snapshot.
+        """
+        self._snapshot_max_age = max_age
+        if not max_age:
+            self.invalidate_snapshot()
+
+    def invalidate_snapshot(self, ids: Iterable[str] | None = None) -> None:
+        """Discard the snapshot values of sensors/settings ids (all values if ids is None)"""
+        ids = None if ids is None else tuple(ids)
+        self._sensors_snapshot.invalidate(ids)
+        self._settings_snapshot.invalidate(ids)
+
+    def write_transaction(self, max_gap: int = 0) -> WriteTransaction:
+        """
+        Answer new transaction collecting several settings writes, which are then written to the inverter
+        by as few requests as possible, e.g.
+
+            async with inverter.write_transaction() as transaction:
+                transaction.write_setting('eco_mode_2_switch', 0)
+                transaction.write_setting('eco_mode_3_switch', 0)
+
+        BEWARE !!!
+        This method modifies inverter operational parameters (usually accessible to installers only).
+        Use with caution and at your own risk !
+        """
+        return WriteTransaction(self, max_gap)
+
+    def set_register_shadow(self, max_age: float | None) -> None:
+        """
+        Keep in-memory copy of the registers values read from (or written to) the inverter.
+        The values of registers read/written at most max_age seconds ago are used instead of reading them
+        before (partial register) writes and can be decoded by read_shadow() without any request.
+        Set max_age None to disable the register shadow.
+        """
+        self._shadow = RegisterShadow(max_age) if max_age is not None else None
+
+    def read_shadow(self, sensor_ids: Iterable[str] | None = None, max_age: float | None = None) -> dict[str, Any]:
+        """
+        Decode the values of sensors/settings from register shadow (without any request to the inverter).
+        Answer dictionary of sensors/settings values (None if the registers value is not known
+        or is older than max_age, by default the register shadow max age).
+        """
+        sensors = {s.id_: s for s in self.sensors() + self.settings()}
+        if sensor_ids is None:
+            sensor_ids = [s.id_ for s in sensors.values() if self._is_register_mapped(s)]
+        result = {}
+        for sensor_id in sensor_ids:
+            sensor = sensors.get(sensor_id)
+            if sensor is None:
+                raise ValueError(f'Unknown sensor/setting "{sensor_id}"')
+            data = None
+            if self._shadow is not None and self._is_register_mapped(sensor):
+                data = self._shadow.read(sensor.offset, (sensor.size_ + 1) // 2, max_age)
+            result[sensor_id] = sensor.read(ProtocolResponse(data, _ShadowCommand(sensor.offset))) if data else None
+        return result
+
+    def circuit_breaker_stats(self) -> dict[str, Any] | None:
+        """
+        Answer the circuit breaker state and statistics (None if circuit breaker is not enabled).
+        state - closed, open or half_open, opened_for - time since the circuit was opened [s],
+        rejected - number of requests failed immediately, probes - number of recovery probes
+        """
+        return self._circuit_breaker.stats() if self._circuit_breaker else None
+
+    def rtt_stats(self) -> dict[str, float | int | None]:
+        """
+        Answer the communication round trip time statistics.
+        srtt - smoothed round trip time [s], rttvar - round trip time variance [s], last_rtt - last round trip time [s],
+        rto - current (adaptive) timeout [s], samples - number of measured responses, timeouts - number of timeouts
+        """
+        return self._protocol.rtt.stats()
+
     @abstractmethod
     async def read_device_info(self):
         """
@@ -151,20 +930,74 @@ class Inverter(ABC):
         """
         raise NotImplementedError()
 
-    @abstractmethod
-    async def read_sensor(self, sensor_id: str) -> Any:
+    async def read_sensor(self, sensor_id: str, cached: bool = True) -> Any:
         """
         Read the value of specific inverter sensor.
         Sensor must be in list provided by sensors() method, otherwise ValueError is raised.
+        The value is answered from snapshot if it is enabled and fresh enough, unless cached is False.
         """
-        raise NotImplementedError()
+        if cached and self._snapshot_max_age:
+            try:
+                return self._sensors_snapshot.get(sensor_id, self._snapshot_max_age)
+            except KeyError:
+                pass
+        value = await self._read_sensor_by_id(sensor_id)
+        if self._snapshot_max_age:
+            self._sensors_snapshot.set(sensor_id, value)
+        return value
 
     @abstractmethod
-    async def read_setting(self, setting_id: str) -> Any:
+    async def _read_sensor_by_id(self, sensor_id: str) -> Any:
+        """Read the value of specific inverter sensor from the inverter"""
+        raise NotImplementedError()
+
+    async def read_sensors(self, sensor_ids: Iterable[str]) -> dict[str, Any]:
+        """
+        Read the values of several inverter sensors at once.
+        The sensors registers are merged to as few contiguous range requests as possible.
+        Answer dictionary of sensors values (None if the value could not be read).
+        Sensors must be in list provided by sensors() method, otherwise ValueError is raised.
+        """
+        sensor_ids = tuple(sensor_ids)
+        sensors = []
+        calculated = []
+        others = []
+        for sensor_id in sensor_ids:
+            sensor = self._get_sensor(sensor_id)
+            if sensor is None:
+                others.append(sensor_id)
+            elif sensor.size_ == 0:
+                # calculated sensors are derived from several (possibly distant) registers
+                calculated.append(sensor_id)
+            else:
+                sensors.append(sensor)
+        data = await self._read_coalesced(sensors, MAX_READ_GAP)
+        if calculated:
+            runtime_data = await self.read_runtime_data()
+            data.update({sensor_id: runtime_data.get(sensor_id) for sensor_id in calculated})
+        for sensor_id in others:
+            data[sensor_id] = await self.read_sensor(sensor_id)
+        return {sensor_id: data.get(sensor_id) for sensor_id in sensor_ids}
+
+    async def read_setting(self, setting_id: str, cached: bool = True) -> Any:
         """
         Read the value of specific inverter setting/configuration parameter.
         Setting must be in list provided by settings() method, otherwise ValueError is raised.
+        The value is answered from snapshot if it is enabled and fresh enough, unless cached is False.
         """
+        if cached and self._snapshot_max_age:
+            try:
+                return self._settings_snapshot.get(setting_id, self._snapshot_max_age)
+            except KeyError:
+                pass
+        value = await self._read_setting_by_id(setting_id)
+        if self._snapshot_max_age:
+            self._settings_snapshot.set(setting_id, value)
+        return value
+
+    @abstractmethod
+    async def _read_setting_by_id(self, setting_id: str) -> Any:
+        """Read the value of specific inverter setting/configuration parameter from the inverter"""
         raise NotImplementedError()
 
     @abstractmethod
@@ -286,8 +1119,70 @@ class Inverter(ABC):
         return UdpInverterProtocol(host, port, comm_addr, timeout, retries)
 
     @staticmethod
-    def _map_response(response: ProtocolResponse, sensors: tuple[Sensor, ...]) -> dict[str, Any]:
+    def _plan_reads(sensors: Iterable[Sensor], max_gap: int = 0,
+                    max_count: int = MAX_READ_REGISTERS) -> list[tuple[int, int, tuple[Sensor, ...]]]:
+        """
+        Group the sensors to contiguous register ranges of at most max_count registers.
+        Ranges are merged only when the hole between them is at most max_gap registers,
+        (the inverter may reject reading of register which is not in use).
+        Answer list of (offset, count, sensors) read requests.
+        """
+        plan = []
+        start = end = 0
+        group: list[Sensor] = []
+        for sensor in sorted(sensors, key=lambda s: s.offset):
+            sensor_end = sensor.offset + max(1, (sensor.size_ + 1) // 2)
+            if group and sensor.offset <= end + max_gap and max(end, sensor_end) - start <= max_count:
+                end = max(end, sensor_end)
+                group.append(sensor)
+            else:
+                if group:
+                    plan.append((start, end - start, tuple(group)))
+                start, end, group = sensor.offset, sensor_end, [sensor]
+        if group:
+            plan.append((start, end - start, tuple(group)))
+        return plan
+
+    async def _read_group(self, offset: int, count: int, group: tuple[Sensor, ...],
+                          raise_errors: bool = False) -> dict[str, Any] | None:
+        """
+        Read the values of sensors/settings group (planned by _plan_reads()) by single register range request.
+        Answer None if the range contains unsupported register (and the sensors have to be read one by one).
+        """
+        try:
+            response = await self._read_from_socket(self._read_command(offset, count))
+            return self._map_response(response, group)
+        except RequestRejectedException as ex:
+            if ex.message == ILLEGAL_DATA_ADDRESS:
+                logger.debug("Registers %d-%d contain unsupported address, reading them one by one.",
+                             offset, offset + count - 1)
+                return None
+            logger.debug("Failed to read registers %d-%d: %s.", offset, offset + count - 1, ex.message)
+        except RequestFailedException:
+            if raise_errors:
+                raise
+            logger.exception("Error reading registers %d-%d.", offset, offset + count - 1)
+        return {s.id_: None for s in group}
+
+    def _decode_plan(self, response: ProtocolResponse, sensors: tuple[Sensor, ...]) -> DecodePlan:
+        """Answer (cached) decode plan of sensors tuple for response of (same) command"""
+        get_offset = response.command.get_offset if response.command is not None else lambda address: address
+        # the sensors tuples of register groups are re-created on each read, the plan is keyed by the sensors
+        # identities (kept alive by the cached plan itself, so they are not re-used) instead of tuple's one
+        key = (tuple(map(id, sensors)), get_offset(0), get_offset(1))
+        plan = self._decode_plans.get(key)
+        if plan is None:
+            plan = DecodePlan(sensors, get_offset)
+            if len(self._decode_plans) >= MAX_DECODE_PLANS:
+                self._decode_plans.pop(next(iter(self._decode_plans)))
+            self._decode_plans[key] = plan
+        return plan
+
+    def _map_response(self, response: ProtocolResponse, sensors: tuple[Sensor, ...]) -> dict[str, Any]:
         """Process the response data and return dictionary with runtime values"""
+        result = self._decode_plan(response, sensors).decode(response)
+        if result is not None:
+            return result
         result = {}
         for sensor in sensors:
             try:
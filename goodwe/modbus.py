@@ -1,6 +1,8 @@
 """Modbus protocol implementation."""
 import logging
-from typing import Union
+import sys
+from array import array
+from typing import Callable, Optional, Union
 
 from .exceptions import PartialResponseException, RequestRejectedException
 
@@ -44,10 +46,25 @@ def _create_crc16_table() -> tuple:
 
 _CRC_16_TABLE = _create_crc16_table()
 
+# CRC-16 table indexed by (little endian) byte pairs, constructed lazily on first use
+_CRC_16_PAIR_TABLE: Optional[array] = None
 
-def _modbus_checksum(data: Union[bytearray, bytes]) -> int:
+# Shorter data are checksummed byte by byte, it is faster than conversion to byte pairs
+_CRC_16_PAIR_MIN_LENGTH: int = 16
+
+
+def _create_crc16_pair_table() -> array:
     """
-    Calculate modbus crc-16 checksum
+    Construct (modbus) CRC-16 table of byte pairs.
+    For 16 bit value x = crc ^ (b1 | b2 << 8) the new crc after processing bytes b1, b2 is table[x].
+    """
+    table = _CRC_16_TABLE
+    return array('H', [(table[x & 0xFF] >> 8) ^ table[((x >> 8) ^ table[x & 0xFF]) & 0xFF] for x in range(65536)])
+
+
+def _modbus_checksum_bytewise(data: Union[bytearray, bytes]) -> int:
+    """
+    Calculate modbus crc-16 checksum, byte by byte
     """
     crc = 0xFFFF
     for ch in data:
@@ -55,6 +72,59 @@ def _modbus_checksum(data: Union[bytearray, bytes]) -> int:
     return crc
 
 
+def _modbus_checksum_pairs(data: Union[bytearray, bytes]) -> int:
+    """
+    Calculate modbus crc-16 checksum, two bytes at once
+    """
+    global _CRC_16_PAIR_TABLE
+    table = _CRC_16_PAIR_TABLE
+    if table is None:
+        table = _CRC_16_PAIR_TABLE = _create_crc16_pair_table()
+    length = len(data)
+    words = array('H')
+    words.frombytes(data[:length & ~1])
+    if sys.byteorder == 'big':
+        words.byteswap()
+    crc = 0xFFFF
+    for word in words:
+        crc = table[crc ^ word]
+    if length & 1:
+        crc = (crc >> 8) ^ _CRC_16_TABLE[(crc ^ data[-1]) & 0xFF]
+    return crc
+
+
+def _load_accelerated_checksum() -> Optional[Callable[[bytes], int]]:
+    """
+    Answer the modbus crc-16 function of C extension of crcmod (if installed),
+    provided it yields the same results as the pure python implementation.
+    """
+    try:
+        from crcmod import _crcfunext  # noqa: F401 (only the C extension is faster)
+        from crcmod.predefined import mkPredefinedCrcFun
+        checksum = mkPredefinedCrcFun('modbus')
+    except (ImportError, KeyError):
+        return None
+    for sample in (b'', b'123456789', bytes(range(256)), bytes.fromhex('f70388b80021')):
+        if checksum(sample) != _modbus_checksum_pairs(sample):
+            logger.warning("Accelerated CRC-16 implementation yields wrong results, not using it.")
+            return None
+    return checksum
+
+
+_CRC_16_ACCELERATED: Optional[Callable[[bytes], int]] = _load_accelerated_checksum()
+
+
+def _modbus_checksum(data: Union[bytearray, bytes]) -> int:
+    """
+    Calculate modbus crc-16 checksum
+    """
+    if _CRC_16_ACCELERATED:
+        return _CRC_16_ACCELERATED(data)
+    if len(data) < _CRC_16_PAIR_MIN_LENGTH:
+        return _modbus_checksum_bytewise(data)
+    return _modbus_checksum_pairs(data)
+
+
 def create_modbus_rtu_request(comm_addr: int, cmd: int, offset: int, value: int) -> bytes:
     """
     Create modbus RTU request.
@@ -161,6 +231,21 @@ def create_modbus_tcp_multi_request(comm_addr: int, cmd: int, offset: int, value
     return bytes(data)
 
 
+def get_modbus_tcp_response_length(data: bytes) -> Optional[int]:
+    """
+    Answer the expected length of modbus TCP response starting at data[0].
+    (The Modbus/TCP message length header is not used due to Goodwe bugs.)
+    Answer None when not even the response header was received yet.
+    """
+    if len(data) <= 8:
+        return None
+    if data[7] == MODBUS_READ_CMD:
+        return data[8] + 9
+    if data[7] in (MODBUS_WRITE_CMD, MODBUS_WRITE_MULTI_CMD):
+        return 12
+    return 9
+
+
 def validate_modbus_rtu_response(data: bytes, cmd: int, offset: int, value: int) -> bool:
     """
     Validate the modbus RTU response.
@@ -1,4 +1,8 @@
 """Constants identifying inverter type/model."""
+from __future__ import annotations
+
+import re
+
 from .inverter import Inverter
 
 PLATFORM_105_MODELS = ("ESU", "EMU", "ESA", "BPS", "BPU", "EMJ", "IJL")
@@ -15,6 +19,12 @@ DT_MODEL_TAGS = ("DTU", "DTS",
                  "MSU", "MST", "MSC", "DSN", "DTN", "DST", "NSU", "SSN", "SST", "SSX", "SSY",
                  "PSB", "PSC")
 
+# Precompiled lookup of model tags in serial number, in order of precedence
+_FAMILY_MODEL_TAGS: tuple[tuple[str, re.Pattern], ...] = tuple(
+    (family, re.compile("|".join(map(re.escape, tags))))
+    for family, tags in (("ET", ET_MODEL_TAGS), ("ES", ES_MODEL_TAGS), ("DT", DT_MODEL_TAGS))
+)
+
 SINGLE_PHASE_MODELS = ("DSN", "DST", "NSU", "SSN", "SST", "SSX", "SSY",  # DT
                        "MSU", "MST", "PSB", "PSC",
                        "MSC",  # Found on third gen MS
@@ -29,6 +39,14 @@ MPPT4_MODELS = ("HSB",)
 BAT_2_MODELS = ("25KET", "29K9ET")
 
 
+def get_model_family(serial_number: str) -> str | None:
+    """Answer the inverter family (ET, ES or DT) the serial number's model tag belongs to (None if not known)"""
+    for family, tags in _FAMILY_MODEL_TAGS:
+        if tags.search(serial_number):
+            return family
+    return None
+
+
 def is_single_phase(inverter: Inverter) -> bool:
     return any(model in inverter.serial_number for model in SINGLE_PHASE_MODELS)
 
@@ -2,20 +2,28 @@
 from __future__ import annotations
 
 import asyncio
-import io
 import logging
 import platform
+import random
 import socket
+import struct
+import weakref
 from asyncio.futures import Future
+from collections import OrderedDict
 from typing import Optional, Callable
 
 from .exceptions import MaxRetriesException, PartialResponseException, RequestFailedException, RequestRejectedException
 from .modbus import create_modbus_rtu_request, create_modbus_rtu_multi_request, create_modbus_tcp_request, \
-    create_modbus_tcp_multi_request, validate_modbus_rtu_response, validate_modbus_tcp_response, MODBUS_READ_CMD, \
-    MODBUS_WRITE_CMD, MODBUS_WRITE_MULTI_CMD
+    create_modbus_tcp_multi_request, get_modbus_tcp_response_length, validate_modbus_rtu_response, \
+    validate_modbus_tcp_response, MODBUS_READ_CMD, MODBUS_WRITE_CMD, MODBUS_WRITE_MULTI_CMD
 
 logger = logging.getLogger(__name__)
 
+# Maximal number of (read) commands cached by single protocol instance
+MAX_CACHED_COMMANDS: int = 128
+# Range of all (16 bit addressed) registers
+ALL_REGISTERS: range = range(0x10000)
+
 _modbus_tcp_tx = 0
 
 
@@ -27,6 +35,121 @@ def _next_tx() -> bytes:
     return int.to_bytes(_modbus_tcp_tx, length=2, byteorder="big", signed=False)
 
 
+class LazyHex:
+    """
+    Hex representation of (request/response) bytes for logging purposes.
+    The bytes are formatted only when the log record is actually emitted, not on every packet.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data: bytes = data
+
+    def __str__(self):
+        return self.data.hex()
+
+    __repr__ = __str__
+
+
+class RttEstimator:
+    """
+    Round trip time statistics of inverter requests and (TCP RTO-like, RFC 6298) retransmission timeout estimation.
+    Only responses of first (not retried) requests are sampled (Karn's algorithm).
+    """
+
+    ALPHA: float = 1 / 8
+    BETA: float = 1 / 4
+    K: int = 4
+    # Clock granularity
+    G: float = 0.01
+
+    def __init__(self, initial_timeout: float, min_timeout: float, max_timeout: float):
+        self.min_timeout: float = min_timeout
+        self.max_timeout: float = max_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.last_rtt: float | None = None
+        self.samples: int = 0
+        self.timeouts: int = 0
+        self.rto: float = self._bounded(initial_timeout)
+
+    def __repr__(self):
+        return f"srtt={self.srtt}, rttvar={self.rttvar}, rto={self.rto}"
+
+    def _bounded(self, timeout: float) -> float:
+        return min(max(timeout, self.min_timeout), self.max_timeout)
+
+    def update(self, rtt: float) -> None:
+        """Add new round trip time sample"""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+        self.last_rtt = rtt
+        self.samples += 1
+        self.rto = self._bounded(self.srtt + max(self.G, self.K * self.rttvar))
+
+    def backoff(self) -> None:
+        """Double the retransmission timeout after the request timed out"""
+        self.timeouts += 1
+        self.rto = self._bounded(self.rto * 2)
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Answer the round trip time statistics"""
+        return {
+            'srtt': self.srtt,
+            'rttvar': self.rttvar,
+            'last_rtt': self.last_rtt,
+            'rto': self.rto,
+            'samples': self.samples,
+            'timeouts': self.timeouts,
+        }
+
+
+class RetryPolicy:
+    """
+    Policy of re-trying failed (timed out) requests.
+    The request is re-tried up to retries times, each retry is delayed by exponentially growing backoff
+    (backoff, 2*backoff, 4*backoff ... up to max_backoff seconds) randomly shortened by up to jitter fraction,
+    so many clients do not retry at the same moment.
+    No more retries are attempted once the deadline (seconds since the first attempt) would be exceeded.
+    """
+
+    def __init__(self, retries: int, backoff: float = 0, max_backoff: float = 5.0, jitter: float = 0.5,
+                 deadline: float | None = None):
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+        self.jitter: float = jitter
+        self.deadline: float | None = deadline
+
+    def __repr__(self):
+        return f"retries={self.retries}, backoff={self.backoff}, max_backoff={self.max_backoff}, " \
+               f"jitter={self.jitter}, deadline={self.deadline}"
+
+    def delay(self, retry: int) -> float:
+        """Answer the delay [s] before the retry # retry"""
+        if self.backoff <= 0:
+            return 0
+        delay = min(self.backoff * (2 ** (retry - 1)), self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    def next_delay(self, retry: int, elapsed: float) -> float | None:
+        """
+        Answer the delay [s] before the retry # retry of request started elapsed seconds ago,
+        or None when the request should not be re-tried anymore.
+        """
+        if retry > self.retries:
+            return None
+        delay = self.delay(retry)
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        return delay
+
+
 class InverterProtocol:
 
     def __init__(self, host: str, port: int, comm_addr: int, timeout: int, retries: int):
@@ -37,13 +160,19 @@ class InverterProtocol:
         self._lock: asyncio.Lock | None = None
         self._timer: asyncio.TimerHandle | None = None
         self.timeout: int = timeout
-        self.retries: int = retries
+        self.retry_policy: RetryPolicy = RetryPolicy(retries)
+        self.rtt: RttEstimator = RttEstimator(timeout, timeout, timeout)
+        self.adaptive_timeout: bool = False
+        self._sent_at: float | None = None
         self.keep_alive: bool = False
+        self.pipelining: bool = False
         self.protocol: asyncio.Protocol | None = None
         self.response_future: Future | None = None
         self.command: ProtocolCommand | None = None
-        self._partial_data: bytes | None = None
-        self._partial_missing: int = 0
+        # Reassembly buffer of fragmented response (and of excess data received after response on TCP)
+        self._buffer: bytearray = bytearray()
+        self._expected: int = 0
+        self._commands: OrderedDict[tuple[int, int, int, int], ProtocolCommand] = OrderedDict()
 
     def _ensure_lock(self) -> asyncio.Lock:
         """Validate (or create) asyncio Lock.
@@ -62,6 +191,73 @@ class InverterProtocol:
         self._close_transport()
         return self._lock
 
+    @property
+    def retries(self) -> int:
+        return self.retry_policy.retries
+
+    @retries.setter
+    def retries(self, retries: int) -> None:
+        self.retry_policy.retries = retries
+
+    async def _wait_for_response(self, response_future: Future) -> bool:
+        """
+        Wait for the response future to be done.
+        Answer False if it was cancelled by timeout or connection loss (i.e. the request should be re-tried),
+        the cancellation of the waiting task itself is propagated.
+        """
+        try:
+            await asyncio.wait((response_future,))
+        except asyncio.CancelledError:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            response_future.cancel()
+            raise
+        return not response_future.cancelled()
+
+    async def _retry_delay(self, retry: int, started: float) -> bool:
+        """
+        Wait before the retry # retry (of request started at started) as prescribed by retry policy.
+        Answer False if the request should not be re-tried anymore.
+        """
+        delay = self.retry_policy.next_delay(retry, asyncio.get_running_loop().time() - started)
+        if delay is None:
+            return False
+        if delay > 0:
+            logger.debug("Waiting %.2fs before retry #%d.", delay, retry)
+            await asyncio.sleep(delay)
+        return True
+
+    def set_adaptive_timeout(self, min_timeout: float, max_timeout: float) -> None:
+        """
+        Derive the response timeout from measured round trip times (instead of fixed timeout),
+        bounded by min_timeout and max_timeout.
+        """
+        self.rtt.min_timeout = min_timeout
+        self.rtt.max_timeout = max_timeout
+        self.rtt.rto = self.rtt._bounded(self.rtt.rto if self.rtt.samples else self.timeout)
+        self.adaptive_timeout = True
+
+    def _current_timeout(self) -> float:
+        """Answer the response timeout of request"""
+        return self.rtt.rto if self.adaptive_timeout else self.timeout
+
+    def _request_sent(self, retry: int) -> float | None:
+        """Answer the time the request was sent (None for retries, their responses are ambiguous)"""
+        return asyncio.get_running_loop().time() if retry == 0 else None
+
+    def _response_received(self, sent_at: float | None) -> None:
+        """Update round trip time statistics with response to request sent at sent_at"""
+        if sent_at is not None:
+            self.rtt.update(asyncio.get_running_loop().time() - sent_at)
+
+    def _request_timed_out(self, backoff: bool = True) -> None:
+        """Update round trip time statistics with request timeout (backing off the timeout if backoff is set)"""
+        if backoff:
+            self.rtt.backoff()
+        else:
+            self.rtt.timeouts += 1
+
     def _max_retries_reached(self) -> Future:
         logger.debug("Max number of retries (%d) reached, request %s failed.", self.retries, self.command)
         self._close_transport()
@@ -69,7 +265,29 @@ class InverterProtocol:
         self.response_future.set_exception(MaxRetriesException)
         return self.response_future
 
+    def _reassemble(self, data: bytes) -> bytes | bytearray:
+        """
+        Append the received fragment to (already received part of) incomplete response.
+        Answer the data to be validated as response.
+        """
+        if not self._buffer:
+            return data
+        if len(self._buffer) + len(data) > self._expected:
+            logger.debug("Discarding incomplete response: %s", LazyHex(self._buffer))
+            self._buffer.clear()
+            return data
+        self._buffer += data
+        return self._buffer
+
+    def _fragment_received(self, data: bytes | bytearray, ex: PartialResponseException) -> None:
+        """Keep the incomplete response in reassembly buffer until the rest of it is received"""
+        logger.debug("Received response fragment (%d of %d): %s", ex.length, ex.expected, LazyHex(data))
+        if data is not self._buffer:
+            self._buffer[:] = data
+        self._expected = ex.expected
+
     def _close_transport(self) -> None:
+        self._buffer.clear()
         if self._transport:
             try:
                 self._transport.close()
@@ -89,6 +307,22 @@ class InverterProtocol:
         raise NotImplementedError()
 
     def read_command(self, offset: int, count: int) -> ProtocolCommand:
+        """
+        Answer read protocol command.
+        The commands are immutable, recently used ones are cached and re-used.
+        """
+        key = (self._comm_addr, MODBUS_READ_CMD, offset, count)
+        command = self._commands.get(key)
+        if command is None:
+            command = self._create_read_command(offset, count)
+            self._commands[key] = command
+            if len(self._commands) > MAX_CACHED_COMMANDS:
+                self._commands.popitem(last=False)
+        else:
+            self._commands.move_to_end(key)
+        return command
+
+    def _create_read_command(self, offset: int, count: int) -> ProtocolCommand:
         """Create read protocol command."""
         raise NotImplementedError()
 
@@ -101,13 +335,142 @@ class InverterProtocol:
         raise NotImplementedError()
 
 
+class UdpMultiplexer(asyncio.DatagramProtocol):
+    """
+    Single unconnected UDP endpoint shared by many inverter protocols running in one event loop.
+
+    Requests are sent to each inverter's (host, port) from the same local socket, the received datagrams
+    are dispatched to the protocol awaiting the response by their source address,
+    (modbus) communication address and expected function code.
+    The endpoint is kept open (even when no protocol is registered) until shutdown() is called.
+    """
+
+    _instances: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self._transport: asyncio.transports.DatagramTransport | None = None
+        self._ready: asyncio.Task | None = None
+        self._protocols: dict[tuple[str, int], list[UdpInverterProtocol]] = {}
+
+    @classmethod
+    async def get_instance(cls) -> UdpMultiplexer:
+        """Answer the multiplexer (endpoint) of the running event loop, create it if necessary"""
+        loop = asyncio.get_running_loop()
+        mux = cls._instances.get(loop)
+        if mux is None or not mux._usable():
+            mux = cls()
+            mux._ready = loop.create_task(loop.create_datagram_endpoint(lambda: mux, local_addr=('0.0.0.0', 0)))
+            cls._instances[loop] = mux
+        await mux._ready
+        return mux
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close the multiplexer (endpoint) of the running event loop (if any)"""
+        mux = cls._instances.pop(asyncio.get_running_loop(), None)
+        if mux is not None and mux._transport:
+            logger.debug("Closing shared UDP endpoint.")
+            mux._transport.close()
+
+    def _usable(self) -> bool:
+        if not self._ready.done():
+            return True
+        return self._transport is not None and not self._transport.is_closing()
+
+    async def register(self, protocol: UdpInverterProtocol, host: str, port: int) -> _MultiplexedTransport:
+        """Register the protocol communicating with host:port, answer its transport"""
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, family=socket.AF_INET,
+                                                             type=socket.SOCK_DGRAM)
+        addr = infos[0][4][:2]
+        self._protocols.setdefault(addr, []).append(protocol)
+        return _MultiplexedTransport(self, protocol, addr)
+
+    def unregister(self, protocol: UdpInverterProtocol, addr: tuple[str, int]) -> None:
+        """Unregister the protocol"""
+        protocols = self._protocols.get(addr)
+        if protocols and protocol in protocols:
+            protocols.remove(protocol)
+            if not protocols:
+                del self._protocols[addr]
+
+    def sendto(self, data: bytes, addr: tuple[str, int]) -> None:
+        if self._transport is None or self._transport.is_closing():
+            raise RequestFailedException("Shared UDP endpoint is closed.")
+        self._transport.sendto(data, addr)
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        """On connection made"""
+        logger.debug("Shared UDP endpoint opened at %s.", transport.get_extra_info('sockname'))
+        self._transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        """On connection lost"""
+        logger.debug("Shared UDP endpoint closed: %s.", exc)
+        self._transport = None
+        for protocols in list(self._protocols.values()):
+            for protocol in list(protocols):
+                protocol.connection_lost(exc)
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """On datagram received, dispatch it to the protocol awaiting it"""
+        waiting = [p for p in self._protocols.get(addr[:2], ()) if p.response_future and not p.response_future.done()]
+        protocol = self._select(waiting, data)
+        if protocol:
+            protocol.datagram_received(data, addr)
+        else:
+            logger.debug("Dropped unexpected datagram from %s: %s", addr, LazyHex(data))
+
+    def error_received(self, exc: Exception) -> None:
+        """On error received"""
+        logger.debug("Shared UDP endpoint received error: %s", exc)
+
+    @staticmethod
+    def _select(waiting: list[UdpInverterProtocol], data: bytes) -> UdpInverterProtocol | None:
+        """Select the protocol the response belongs to, prefer exact comm_addr and function code match"""
+        if len(waiting) == 1:
+            return waiting[0]
+        for protocol in waiting:
+            if protocol._buffer and len(protocol._buffer) + len(data) <= protocol._expected:
+                return protocol
+        function_match = None
+        for protocol in waiting:
+            if isinstance(protocol.command, ModbusRtuProtocolCommand) and len(data) > 4 \
+                    and data[0:2] == b'\xaa\x55' and data[3] & 0x7f == protocol.command.request[1]:
+                if data[2] == protocol.command.request[0]:
+                    return protocol
+                function_match = function_match or protocol
+        return function_match
+
+
+class _MultiplexedTransport:
+    """Transport of single protocol (inverter) communicating via shared UdpMultiplexer endpoint"""
+
+    def __init__(self, mux: UdpMultiplexer, protocol: UdpInverterProtocol, addr: tuple[str, int]):
+        self._mux: UdpMultiplexer = mux
+        self._protocol: UdpInverterProtocol = protocol
+        self._addr: tuple[str, int] = addr
+        self._closed: bool = False
+
+    def sendto(self, data: bytes) -> None:
+        self._mux.sendto(data, self._addr)
+
+    def is_closing(self) -> bool:
+        return self._closed or not self._mux._usable()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._mux.unregister(self._protocol, self._addr)
+
+
 class UdpInverterProtocol(InverterProtocol, asyncio.DatagramProtocol):
     def __init__(self, host: str, port: int, comm_addr: int, timeout: int = 1, retries: int = 3):
         super().__init__(host, port, comm_addr, timeout, retries)
-        self._transport: asyncio.transports.DatagramTransport | None = None
+        self._transport: asyncio.transports.DatagramTransport | _MultiplexedTransport | None = None
         self._retry: int = 0
+        self.shared_socket: bool = False
 
-    def read_command(self, offset: int, count: int) -> ProtocolCommand:
+    def _create_read_command(self, offset: int, count: int) -> ProtocolCommand:
         """Create read protocol command."""
         return ModbusRtuReadCommand(self._comm_addr, offset, count)
 
@@ -121,6 +484,11 @@ class UdpInverterProtocol(InverterProtocol, asyncio.DatagramProtocol):
 
     async def _connect(self) -> None:
         if not self._transport or self._transport.is_closing():
+            if self.shared_socket:
+                mux = await UdpMultiplexer.get_instance()
+                self._transport = await mux.register(self, self._host, self._port)
+                self.protocol = self
+                return
             self._transport, self.protocol = await asyncio.get_running_loop().create_datagram_endpoint(
                 lambda: self,
                 remote_addr=(self._host, self._port),
@@ -144,27 +512,25 @@ class UdpInverterProtocol(InverterProtocol, asyncio.DatagramProtocol):
             self._timer.cancel()
             self._timer = None
         try:
-            if self._partial_data and self._partial_missing == len(data):
-                logger.debug("Composed fragmented response: %s + %s", self._partial_data.hex(), data.hex())
-                data = self._partial_data + data
-                self._partial_data = None
-                self._partial_missing = 0
+            data = self._reassemble(data)
             if self.command.validator(data):
-                logger.debug("Received: %s", data.hex())
+                data = bytes(data)
+                self._buffer.clear()
+                logger.debug("Received: %s", LazyHex(data))
+                self._response_received(self._sent_at)
                 self._retry = 0
                 self.response_future.set_result(data)
             else:
-                logger.debug("Received invalid response: %s", data.hex())
+                logger.debug("Received invalid response: %s", LazyHex(data))
+                self._buffer.clear()
                 asyncio.get_running_loop().call_soon(self._timeout_mechanism)
         except PartialResponseException as ex:
-            logger.debug("Received response fragment (%d of %d): %s", ex.length, ex.expected, data.hex())
-            self._partial_data = data
-            self._partial_missing = ex.expected - ex.length
-            self._timer = asyncio.get_running_loop().call_later(self.timeout, self._timeout_mechanism)
+            self._fragment_received(data, ex)
+            self._timer = asyncio.get_running_loop().call_later(self._current_timeout(), self._timeout_mechanism)
         except asyncio.InvalidStateError:
-            logger.debug("Response already handled: %s", data.hex())
+            logger.debug("Response already handled: %s", LazyHex(data))
         except RequestRejectedException as ex:
-            logger.debug("Received exception response: %s", data.hex())
+            logger.debug("Received exception response: %s", LazyHex(data))
             if self.response_future and not self.response_future.done():
                 self.response_future.set_exception(ex)
             self._close_transport()
@@ -177,41 +543,36 @@ class UdpInverterProtocol(InverterProtocol, asyncio.DatagramProtocol):
 
     async def send_request(self, command: ProtocolCommand) -> Future:
         """Send message via transport"""
-        await self._ensure_lock().acquire()
-        try:
-            await self._connect()
-            response_future = asyncio.get_running_loop().create_future()
-            self._send_request(command, response_future)
-            await response_future
-            return response_future
-        except asyncio.CancelledError:
-            if self._retry < self.retries:
-                self._retry += 1
-                if self._lock and self._lock.locked():
-                    self._lock.release()
-                if not self.keep_alive:
-                    self._close_transport()
-                return await self.send_request(command)
-            return self._max_retries_reached()
-        finally:
-            if self._lock and self._lock.locked():
-                self._lock.release()
-            if not self.keep_alive:
-                self._close_transport()
+        started = asyncio.get_running_loop().time()
+        self._retry = 0
+        while True:
+            async with self._ensure_lock():
+                try:
+                    await self._connect()
+                    response_future = asyncio.get_running_loop().create_future()
+                    self._send_request(command, response_future)
+                    if await self._wait_for_response(response_future):
+                        return response_future
+                finally:
+                    if not self.keep_alive:
+                        self._close_transport()
+            if not await self._retry_delay(self._retry + 1, started):
+                return self._max_retries_reached()
+            self._retry += 1
 
     def _send_request(self, command: ProtocolCommand, response_future: Future) -> None:
         """Send message via transport"""
         self.command = command
         self.response_future = response_future
-        self._partial_data = None
-        self._partial_missing = 0
+        self._buffer.clear()
         payload = command.request_bytes()
         if self._retry > 0:
             logger.debug("Sending: %s - retry #%s/%s", self.command, self._retry, self.retries)
         else:
             logger.debug("Sending: %s", self.command)
         self._transport.sendto(payload)
-        self._timer = asyncio.get_running_loop().call_later(self.timeout, self._timeout_mechanism)
+        self._sent_at = self._request_sent(self._retry)
+        self._timer = asyncio.get_running_loop().call_later(self._current_timeout(), self._timeout_mechanism)
 
     def _timeout_mechanism(self) -> None:
         """Timeout mechanism to prevent hanging transport"""
@@ -220,7 +581,9 @@ class UdpInverterProtocol(InverterProtocol, asyncio.DatagramProtocol):
             self._retry = 0
         else:
             if self._timer:
-                logger.debug("Failed to receive response to %s in time (%ds).", self.command, self.timeout)
+                logger.debug("Failed to receive response to %s in time (%.2fs).", self.command,
+                             self._current_timeout())
+                self._request_timed_out()
                 self._timer = None
             if self.response_future and not self.response_future.done():
                 self.response_future.cancel()
@@ -234,8 +597,12 @@ class TcpInverterProtocol(InverterProtocol, asyncio.Protocol):
         super().__init__(host, port, comm_addr, timeout, retries)
         self._transport: asyncio.transports.Transport | None = None
         self._retry: int = 0
+        # Pipelined requests waiting for response, keyed by Modbus/TCP transaction identifier
+        self._pending: dict[bytes, tuple[ProtocolCommand, Future, asyncio.TimerHandle, float | None, int]] = {}
+        # Number of timeout backoffs of pipelined requests
+        self._backoffs: int = 0
 
-    def read_command(self, offset: int, count: int) -> ProtocolCommand:
+    def _create_read_command(self, offset: int, count: int) -> ProtocolCommand:
         """Create read protocol command."""
         return ModbusTcpReadCommand(self._comm_addr, offset, count)
 
@@ -285,33 +652,40 @@ class TcpInverterProtocol(InverterProtocol, asyncio.Protocol):
 
     def data_received(self, data: bytes) -> None:
         """On data received"""
+        if self.pipelining:
+            self._pipelined_data_received(data)
+            return
         if self._timer:
             self._timer.cancel()
+        self._buffer += data
+        while self._buffer:
+            length = get_modbus_tcp_response_length(self._buffer)
+            if length is None or len(self._buffer) < length:
+                logger.debug("Received response fragment (%d of %s): %s", len(self._buffer), length,
+                             LazyHex(self._buffer))
+                self._timer = asyncio.get_running_loop().call_later(self._current_timeout(), self._timeout_mechanism)
+                return
+            response = bytes(self._buffer[:length])
+            del self._buffer[:length]
+            self._tcp_response_received(response)
+
+    def _tcp_response_received(self, data: bytes) -> None:
+        """On complete (non-pipelined) response received"""
         try:
-            if self._partial_data and self._partial_missing == len(data):
-                logger.debug("Composed fragmented response: %s + %s", self._partial_data.hex(), data.hex())
-                data = self._partial_data + data
-                self._partial_data = None
-                self._partial_missing = 0
-            if self.command.validator(data):
-                logger.debug("Received: %s", data.hex())
+            if not self.response_future or self.response_future.done():
+                logger.debug("Response already handled: %s", LazyHex(data))
+            elif self.command.validator(data):
+                logger.debug("Received: %s", LazyHex(data))
+                self._response_received(self._sent_at)
                 self._retry = 0
                 self.response_future.set_result(data)
             else:
-                logger.debug("Received invalid response: %s", data.hex())
+                logger.debug("Received invalid response: %s", LazyHex(data))
                 self.response_future.set_exception(RequestRejectedException())
                 self._close_transport()
-        except PartialResponseException as ex:
-            logger.debug("Received response fragment (%d of %d): %s", ex.length, ex.expected, data.hex())
-            self._partial_data = data
-            self._partial_missing = ex.expected - ex.length
-            self._timer = asyncio.get_running_loop().call_later(self.timeout, self._timeout_mechanism)
-        except asyncio.InvalidStateError:
-            logger.debug("Response already handled: %s", data.hex())
-        except RequestRejectedException as ex:
-            logger.debug("Received exception response: %s", data.hex())
-            if self.response_future and not self.response_future.done():
-                self.response_future.set_exception(ex)
+        except (RequestRejectedException, PartialResponseException) as ex:
+            logger.debug("Received exception response: %s", LazyHex(data))
+            self.response_future.set_exception(ex)
             # self._close_transport()
 
     def error_received(self, exc: Exception) -> None:
@@ -320,50 +694,146 @@ class TcpInverterProtocol(InverterProtocol, asyncio.Protocol):
         self.response_future.set_exception(exc)
         self._close_transport()
 
+    def _pipelined_data_received(self, data: bytes) -> None:
+        """Split received data to individual responses and route them to requests by transaction id"""
+        self._buffer += data
+        while self._buffer:
+            length = get_modbus_tcp_response_length(self._buffer)
+            if length is None or len(self._buffer) < length:
+                logger.debug("Received response fragment: %s", LazyHex(self._buffer))
+                return
+            response = bytes(self._buffer[:length])
+            del self._buffer[:length]
+            self._dispatch_pipelined_response(response)
+
+    def _dispatch_pipelined_response(self, data: bytes) -> None:
+        """Complete the pipelined request the response belongs to"""
+        pending = self._pending.pop(data[0:2], None)
+        if pending is None:
+            logger.debug("Received response to unknown transaction: %s", LazyHex(data))
+            return
+        command, response_future, timer, sent_at, _ = pending
+        timer.cancel()
+        if response_future.done():
+            logger.debug("Response already handled: %s", LazyHex(data))
+            return
+        try:
+            if command.validator(data):
+                logger.debug("Received: %s", LazyHex(data))
+                self._response_received(sent_at)
+                response_future.set_result(data)
+            else:
+                logger.debug("Received invalid response: %s", LazyHex(data))
+                response_future.set_exception(RequestRejectedException())
+        except (RequestRejectedException, PartialResponseException) as ex:
+            logger.debug("Received exception response: %s", LazyHex(data))
+            response_future.set_exception(ex)
+
+    def _close_transport(self) -> None:
+        super()._close_transport()
+        # Cancel all pipelined requests, they will be re-sent on new connection
+        pending, self._pending = self._pending, {}
+        for _, response_future, timer, _, _ in pending.values():
+            timer.cancel()
+            if not response_future.done():
+                response_future.cancel()
+
     async def send_request(self, command: ProtocolCommand) -> Future:
         """Send message via transport"""
-        await self._ensure_lock().acquire()
-        try:
-            await asyncio.wait_for(self._connect(), timeout=5)
-            response_future = asyncio.get_running_loop().create_future()
-            self._send_request(command, response_future)
-            await response_future
-            return response_future
-        except asyncio.CancelledError:
-            if self._retry < self.retries:
-                if self._timer:
-                    logger.debug("Connection broken error.")
-                self._retry += 1
-                if self._lock and self._lock.locked():
-                    self._lock.release()
-                self._close_transport()
-                return await self.send_request(command)
-            return self._max_retries_reached()
-        except (ConnectionRefusedError, TimeoutError, OSError, asyncio.TimeoutError):
-            if self._retry < self.retries:
-                logger.debug("Connection refused error.")
-                self._retry += 1
-                if self._lock and self._lock.locked():
-                    self._lock.release()
-                return await self.send_request(command)
-            return self._max_retries_reached()
-        finally:
-            if self._lock and self._lock.locked():
-                self._lock.release()
+        if self.pipelining:
+            return await self._send_pipelined_request(command)
+        started = asyncio.get_running_loop().time()
+        self._retry = 0
+        while True:
+            async with self._ensure_lock():
+                try:
+                    await asyncio.wait_for(self._connect(), timeout=5)
+                    response_future = asyncio.get_running_loop().create_future()
+                    self._send_request(command, response_future)
+                    if await self._wait_for_response(response_future):
+                        response_future.result()
+                        return response_future
+                    if self._timer:
+                        logger.debug("Connection broken error.")
+                    self._close_transport()
+                except (ConnectionRefusedError, TimeoutError, OSError, asyncio.TimeoutError):
+                    logger.debug("Connection refused error.")
+            if not await self._retry_delay(self._retry + 1, started):
+                return self._max_retries_reached()
+            self._retry += 1
 
     def _send_request(self, command: ProtocolCommand, response_future: Future) -> None:
         """Send message via transport"""
         self.command = command
         self.response_future = response_future
-        self._partial_data = None
-        self._partial_missing = 0
         payload = command.request_bytes()
         if self._retry > 0:
             logger.debug("Sending: %s - retry #%s/%s", self.command, self._retry, self.retries)
         else:
             logger.debug("Sending: %s", self.command)
         self._transport.write(payload)
-        self._timer = asyncio.get_running_loop().call_later(self.timeout, self._timeout_mechanism)
+        self._sent_at = self._request_sent(self._retry)
+        self._timer = asyncio.get_running_loop().call_later(self._current_timeout(), self._timeout_mechanism)
+
+    async def _send_pipelined_request(self, command: ProtocolCommand) -> Future:
+        """
+        Send message via transport without waiting for responses to other in-flight requests.
+        The lock is held only while (re)connecting and writing the request, the response
+        is matched to its request by the Modbus/TCP transaction identifier.
+        """
+        started = asyncio.get_running_loop().time()
+        retry = 0
+        while True:
+            response_future = asyncio.get_running_loop().create_future()
+            try:
+                async with self._ensure_lock():
+                    await asyncio.wait_for(self._connect(), timeout=5)
+                    tx_id = self._send_pipelined(command, response_future, retry)
+            except (ConnectionRefusedError, TimeoutError, OSError, asyncio.TimeoutError):
+                logger.debug("Connection refused error.")
+            else:
+                try:
+                    await response_future
+                    return response_future
+                except asyncio.CancelledError:
+                    if self._pending.pop(tx_id, None) is not None:
+                        # Cancelled by caller, not by timeout or connection loss
+                        raise
+            if not await self._retry_delay(retry + 1, started):
+                break
+            retry += 1
+        logger.debug("Max number of retries (%d) reached, request %s failed.", self.retries, command)
+        response_future = asyncio.get_running_loop().create_future()
+        response_future.set_exception(MaxRetriesException)
+        return response_future
+
+    def _send_pipelined(self, command: ProtocolCommand, response_future: Future, retry: int) -> bytes:
+        """Send message via transport and register it as in-flight request"""
+        payload = command.request_bytes()
+        tx_id = payload[0:2]
+        timer = asyncio.get_running_loop().call_later(self._current_timeout(), self._pipelined_timeout, tx_id)
+        self._pending[tx_id] = (command, response_future, timer, self._request_sent(retry), self._backoffs)
+        if retry > 0:
+            logger.debug("Sending: %s - retry #%s/%s", command, retry, self.retries)
+        else:
+            logger.debug("Sending: %s", command)
+        self._transport.write(payload)
+        return tx_id
+
+    def _pipelined_timeout(self, tx_id: bytes) -> None:
+        """Timeout mechanism of single pipelined request"""
+        pending = self._pending.pop(tx_id, None)
+        if pending:
+            command, response_future, _, _, backoffs = pending
+            logger.debug("Failed to receive response to %s in time (%.2fs).", command, self._current_timeout())
+            # the requests sent before the last backoff timed out with the same (not backed off yet) timeout,
+            # the timeout is backed off only once per such batch (RFC 6298, 5.5)
+            backoff = backoffs == self._backoffs
+            if backoff:
+                self._backoffs += 1
+            self._request_timed_out(backoff)
+            if not response_future.done():
+                response_future.cancel()
 
     def _timeout_mechanism(self) -> None:
         """Retry mechanism to prevent hanging transport"""
@@ -371,43 +841,72 @@ class TcpInverterProtocol(InverterProtocol, asyncio.Protocol):
             self._retry = 0
         else:
             if self._timer:
-                logger.debug("Failed to receive response to %s in time (%ds).", self.command, self.timeout)
+                logger.debug("Failed to receive response to %s in time (%.2fs).", self.command,
+                             self._current_timeout())
+                self._request_timed_out()
                 self._timer = None
             self._close_transport()
 
     async def close(self):
         await self._ensure_lock().acquire()
         try:
-            self._close_transport()
+            if self._pending:
+                logger.debug("Connection still in use by pipelined requests, not closing it.")
+            else:
+                self._close_transport()
         finally:
             if self._lock and self._lock.locked():
                 self._lock.release()
 
 
 class ProtocolResponse:
-    """Definition of response to protocol command"""
+    """
+    Definition of response to protocol command.
+    The response payload is accessed via memoryview of raw data, values are decoded in place (without copies).
+    """
 
     def __init__(self, raw_data: bytes, command: Optional[ProtocolCommand]):
         self.raw_data: bytes = raw_data
         self.command: ProtocolCommand = command
-        self._bytes: io.BytesIO = io.BytesIO(self.response_data())
+        self._view: memoryview = self._payload_view()
+        self._position: int = 0
 
     def __repr__(self):
         return self.raw_data.hex()
 
+    def _payload_view(self) -> memoryview:
+        """Answer the (zero-copy) view of the response data"""
+        if self.command is not None:
+            return self.command.trim_response(memoryview(self.raw_data))
+        return memoryview(self.raw_data)
+
     def response_data(self) -> bytes:
         if self.command is not None:
             return self.command.trim_response(self.raw_data)
         return self.raw_data
 
     def seek(self, address: int) -> None:
-        if self.command is not None:
-            self._bytes.seek(self.command.get_offset(address))
-        else:
-            self._bytes.seek(address)
+        position = self.command.get_offset(address) if self.command is not None else address
+        if position < 0:
+            raise ValueError(f"negative seek value {position}")
+        self._position = position
 
     def read(self, size: int) -> bytes:
-        return self._bytes.read(size)
+        start = self._position
+        self._position += size
+        return self._view[start:self._position].tobytes()
+
+    def read_int(self, size: int, signed: bool = False) -> int:
+        """Read (big endian) integer of size bytes at current position"""
+        start = self._position
+        self._position += size
+        return int.from_bytes(self._view[start:self._position], byteorder="big", signed=signed)
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        """Unpack the struct at current position"""
+        values = fmt.unpack_from(self._view, self._position)
+        self._position += fmt.size
+        return values
 
 
 class ProtocolCommand:
@@ -441,6 +940,18 @@ class ProtocolCommand:
         """Calculate relative offset to start of the response bytes"""
         return address
 
+    def read_registers(self) -> range | None:
+        """Answer the range of registers read by the command (None if it does not read registers)"""
+        return None
+
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return None
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return None
+
     async def execute(self, protocol: InverterProtocol) -> ProtocolResponse:
         """
         Execute the protocol command on the specified connection.
@@ -448,17 +959,24 @@ class ProtocolCommand:
         Return ProtocolResponse with raw response data
         """
         try:
-            response_future = await protocol.send_request(self)
-            result = response_future.result()
+            try:
+                response_future = await protocol.send_request(self)
+            except ConnectionRefusedError:
+                raise RequestFailedException(
+                    "No valid response received to '" + self.request.hex() + "' request."
+                ) from None
+            # (the cancellation of the executing task itself is propagated)
+            try:
+                result = response_future.result()
+            except asyncio.CancelledError:
+                raise RequestFailedException(
+                    "No valid response received to '" + self.request.hex() + "' request."
+                ) from None
             if result is not None:
                 return ProtocolResponse(result, self)
             raise RequestFailedException(
                 "No response received to '" + self.request.hex() + "' request."
             )
-        except (asyncio.CancelledError, ConnectionRefusedError):
-            raise RequestFailedException(
-                "No valid response received to '" + self.request.hex() + "' request."
-            ) from None
         finally:
             if not protocol.keep_alive:
                 await protocol.close()
@@ -533,6 +1051,11 @@ class Aa55ProtocolCommand(ProtocolCommand):
         """Trim raw response from header and checksum data"""
         return raw_response[7:-2]
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        # other than read (0x01) commands may modify any (even not register mapped) inverter setting
+        return None if self.request[4] == 0x01 else ALL_REGISTERS
+
     def __repr__(self):
         if self.request[4] == 1:
             if self.request[5] == 2:
@@ -552,6 +1075,10 @@ class Aa55ReadCommand(Aa55ProtocolCommand):
     def __init__(self, offset: int, count: int):
         super().__init__(f"011A03{offset:04x}{count:02x}", "019A", offset, count)
 
+    def read_registers(self) -> range | None:
+        """Answer the range of registers read by the command (None if it does not read registers)"""
+        return range(self.first_address, self.first_address + self.value)
+
     def __repr__(self):
         if self.value > 1:
             return f'READ {self.value} registers from {self.first_address} ({self.request.hex()})'
@@ -566,6 +1093,14 @@ class Aa55WriteCommand(Aa55ProtocolCommand):
     def __init__(self, register: int, value: int):
         super().__init__(f"023905{register:04x}01{value:04x}", "02B9", register, value)
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + 1)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return (self.value & 0xFFFF).to_bytes(2, byteorder='big')
+
     def __repr__(self):
         return f'WRITE {self.value} to register {self.first_address} ({self.request.hex()})'
 
@@ -579,6 +1114,14 @@ class Aa55WriteMultiCommand(Aa55ProtocolCommand):
         super().__init__(f"02390B{offset:04x}{len(values):02x}{values.hex()}",
                          "02B9", offset, len(values) // 2)
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + self.value)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return self.request[10:-2]
+
 
 class ModbusRtuProtocolCommand(ProtocolCommand):
     """
@@ -629,6 +1172,10 @@ class ModbusRtuReadCommand(ModbusRtuProtocolCommand):
             create_modbus_rtu_request(comm_addr, MODBUS_READ_CMD, offset, count),
             MODBUS_READ_CMD, offset, count)
 
+    def read_registers(self) -> range | None:
+        """Answer the range of registers read by the command (None if it does not read registers)"""
+        return range(self.first_address, self.first_address + self.value)
+
     def __repr__(self):
         if self.value > 1:
             return f'READ {self.value} registers from {self.first_address} ({self.request.hex()})'
@@ -645,6 +1192,14 @@ class ModbusRtuWriteCommand(ModbusRtuProtocolCommand):
             create_modbus_rtu_request(comm_addr, MODBUS_WRITE_CMD, register, value),
             MODBUS_WRITE_CMD, register, value)
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + 1)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return (self.value & 0xFFFF).to_bytes(2, byteorder='big')
+
     def __repr__(self):
         return f'WRITE {self.value} to register {self.first_address} ({self.request.hex()})'
 
@@ -659,6 +1214,14 @@ class ModbusRtuWriteMultiCommand(ModbusRtuProtocolCommand):
             create_modbus_rtu_multi_request(comm_addr, MODBUS_WRITE_MULTI_CMD, offset, values),
             MODBUS_WRITE_MULTI_CMD, offset, len(values) // 2)
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + self.value)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return self.request[7:-2]
+
 
 class ModbusTcpProtocolCommand(ProtocolCommand):
     """
@@ -675,9 +1238,8 @@ class ModbusTcpProtocolCommand(ProtocolCommand):
 
     def request_bytes(self) -> bytes:
         """Return raw bytes payload, optionally pre-processed"""
-        # Apply sequential Modbus/TCP transaction identifier
-        self.request = _next_tx() + self.request[2:]
-        return self.request
+        # Apply sequential Modbus/TCP transaction identifier (the command itself is not modified)
+        return _next_tx() + self.request[2:]
 
     def trim_response(self, raw_response: bytes):
         """Trim raw response from header and checksum data"""
@@ -698,6 +1260,10 @@ class ModbusTcpReadCommand(ModbusTcpProtocolCommand):
             create_modbus_tcp_request(comm_addr, MODBUS_READ_CMD, offset, count),
             MODBUS_READ_CMD, offset, count)
 
+    def read_registers(self) -> range | None:
+        """Answer the range of registers read by the command (None if it does not read registers)"""
+        return range(self.first_address, self.first_address + self.value)
+
     def __repr__(self):
         if self.value > 1:
             return f'READ {self.value} registers from {self.first_address} ({self.request.hex()})'
@@ -714,6 +1280,14 @@ class ModbusTcpWriteCommand(ModbusTcpProtocolCommand):
             create_modbus_tcp_request(comm_addr, MODBUS_WRITE_CMD, register, value),
             MODBUS_WRITE_CMD, register, value)
 
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + 1)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return (self.value & 0xFFFF).to_bytes(2, byteorder='big')
+
     def __repr__(self):
         return f'WRITE {self.value} to register {self.first_address} ({self.request.hex()})'
 
@@ -727,3 +1301,11 @@ class ModbusTcpWriteMultiCommand(ModbusTcpProtocolCommand):
         super().__init__(
             create_modbus_tcp_multi_request(comm_addr, MODBUS_WRITE_MULTI_CMD, offset, values),
             MODBUS_WRITE_MULTI_CMD, offset, len(values) // 2)
+
+    def written_registers(self) -> range | None:
+        """Answer the range of registers modified by the command (None if it does not modify any)"""
+        return range(self.first_address, self.first_address + self.value)
+
+    def written_values(self) -> bytes | None:
+        """Answer the raw values of written_registers() (None if not known)"""
+        return self.request[13:]
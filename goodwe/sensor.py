@@ -2,13 +2,19 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from copy import copy
 from datetime import datetime
 from enum import IntEnum
 from struct import unpack
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional, Sequence
 
 from .inverter import Sensor, SensorKind
-from .protocol import ProtocolResponse
+from .protocol import ProtocolCommand, ProtocolResponse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 DAY_NAMES = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
 MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
@@ -84,12 +90,17 @@ class ScheduleType(IntEnum):
 class Voltage(Sensor):
     """Sensor representing voltage [V] value encoded in 2 (unsigned) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "V", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_voltage(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: float(v) / 10 if v != 0xffff else 0
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return encode_voltage(value)
 
@@ -97,12 +108,17 @@ class Voltage(Sensor):
 class Current(Sensor):
     """Sensor representing current [A] value encoded in 2 (unsigned) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "A", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_current(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: float(v) / 10 if v != 0xffff else 0
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return encode_current(value)
 
@@ -110,12 +126,17 @@ class Current(Sensor):
 class CurrentS(Sensor):
     """Sensor representing current [A] value encoded in 2 (signed) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "A", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_current_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", lambda v: float(v) / 10
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return encode_current_signed(value)
 
@@ -123,56 +144,83 @@ class CurrentS(Sensor):
 class Frequency(Sensor):
     """Sensor representing frequency [Hz] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "Hz", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_freq(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", lambda v: float(v) / 100
+
 
 class Power(Sensor):
     """Sensor representing power [W] value encoded in 2 (unsigned) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "W", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: v if v != 0xffff else None
+
 
 class PowerS(Sensor):
     """Sensor representing power [W] value encoded in 2 (signed) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "W", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", None
+
 
 class Power4(Sensor):
     """Sensor representing power [W] value encoded in 4 (unsigned) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 4, "W", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "I", lambda v: v if v != 0xffffffff else None
+
 
 class Power4S(Sensor):
     """Sensor representing power [W] value encoded in 4 (signed) bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 4, "W", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "i", None
+
 
 class Energy(Sensor):
     """Sensor representing energy [kWh] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "kWh", kind)
 
@@ -180,10 +228,15 @@ class Energy(Sensor):
         value = read_bytes2(data)
         return float(value) / 10 if value is not None else None
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: float(v) / 10 if v != 0xffff else None
+
 
 class Energy4(Sensor):
     """Sensor representing energy [kWh] value encoded in 4 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 4, "kWh", kind)
 
@@ -191,10 +244,15 @@ class Energy4(Sensor):
         value = read_bytes4(data)
         return float(value) / 10 if value is not None else None
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "I", lambda v: float(v) / 10 if v != 0xffffffff else None
+
 
 class Energy8(Sensor):
     """Sensor representing energy [kWh] value encoded in 8 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 8, "kWh", kind)
 
@@ -202,76 +260,114 @@ class Energy8(Sensor):
         value = read_bytes8(data)
         return float(value) / 100 if value is not None else None
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "Q", lambda v: float(v) / 100 if v != 0xffffffffffffffff else None
+
 
 class Apparent(Sensor):
     """Sensor representing apparent power [VA] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "VA", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", None
+
 
 class Apparent4(Sensor):
     """Sensor representing apparent power [VA] value encoded in 4 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "VA", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "i", None
+
 
 class Reactive(Sensor):
     """Sensor representing reactive power [var] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "var", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", None
+
 
 class Reactive4(Sensor):
     """Sensor representing reactive power [var] value encoded in 4 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "var", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "i", None
+
 
 class Temp(Sensor):
     """Sensor representing temperature [C] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 2, "C", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_temp(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", lambda v: float(v) / 10 if v not in (-1, 32767) else None
+
 
 class CellVoltage(Sensor):
     """Sensor representing battery cell voltage [V] value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind]):
         super().__init__(id_, offset, name, 2, "V", kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_voltage(data) / 100
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: (float(v) / 10 if v != 0xffff else 0) / 100
+
 
 class Byte(Sensor):
     """Sensor representing signed int value encoded in 1 byte"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 1, unit, kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_byte(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "b", None
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         raise NotImplementedError()
 
@@ -279,6 +375,8 @@ class Byte(Sensor):
 class ByteH(Byte):
     """Sensor representing signed int value encoded in 1 byte (high 8 bits of 16bit register)"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, unit, kind)
 
@@ -294,6 +392,8 @@ class ByteH(Byte):
 class ByteL(Byte):
     """Sensor representing signed int value encoded in 1 byte (low 8 bits of 16bit register)"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, unit, kind)
 
@@ -301,6 +401,9 @@ class ByteL(Byte):
         read_byte(data)
         return read_byte(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "xb", None
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         word = bytearray(register_value)
         word[1] = int.to_bytes(int(value), length=1, byteorder="big", signed=True)[0]
@@ -310,12 +413,17 @@ class ByteL(Byte):
 class Integer(Sensor):
     """Sensor representing unsigned int value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 2, unit, kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2(data, None, 0)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: v if v != 0xffff else 0
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return int.to_bytes(int(value), length=2, byteorder="big", signed=False)
 
@@ -323,12 +431,17 @@ class Integer(Sensor):
 class IntegerS(Sensor):
     """Sensor representing signed int value encoded in 2 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 2, unit, kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes2_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", None
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return int.to_bytes(int(value), length=2, byteorder="big", signed=True)
 
@@ -336,12 +449,17 @@ class IntegerS(Sensor):
 class Long(Sensor):
     """Sensor representing unsigned int value encoded in 4 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 4, unit, kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4(data, None, 0)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "I", lambda v: v if v != 0xffffffff else 0
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return int.to_bytes(int(value), length=4, byteorder="big", signed=False)
 
@@ -349,12 +467,17 @@ class Long(Sensor):
 class LongS(Sensor):
     """Sensor representing signed int value encoded in 4 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 4, unit, kind)
 
     def read_value(self, data: ProtocolResponse):
         return read_bytes4_signed(data)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "i", None
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return int.to_bytes(int(value), length=4, byteorder="big", signed=True)
 
@@ -362,6 +485,8 @@ class LongS(Sensor):
 class Decimal(Sensor):
     """Sensor representing signed decimal value encoded in 2 bytes"""
 
+    __slots__ = ('scale',)
+
     def __init__(self, id_: str, offset: int, scale: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 2, unit, kind)
         self.scale = scale
@@ -369,6 +494,9 @@ class Decimal(Sensor):
     def read_value(self, data: ProtocolResponse):
         return read_decimal2(data, self.scale)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "h", lambda v: float(v) / self.scale
+
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         return int.to_bytes(int(float(value) * self.scale), length=2, byteorder="big", signed=True)
 
@@ -376,6 +504,8 @@ class Decimal(Sensor):
 class Float(Sensor):
     """Sensor representing signed int value encoded in 4 bytes"""
 
+    __slots__ = ('scale',)
+
     def __init__(self, id_: str, offset: int, scale: int, name: str, unit: str = "", kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 4, unit, kind)
         self.scale = scale
@@ -383,10 +513,15 @@ class Float(Sensor):
     def read_value(self, data: ProtocolResponse):
         return round(read_float4(data) / self.scale, 3)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "f", lambda v: round(v / self.scale, 3)
+
 
 class Timestamp(Sensor):
     """Sensor representing datetime value encoded in 6 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 6, "", kind)
 
@@ -400,6 +535,8 @@ class Timestamp(Sensor):
 class Enum(Sensor):
     """Sensor representing label from enumeration encoded in 1 bytes"""
 
+    __slots__ = ('_labels',)
+
     def __init__(self, id_: str, offset: int, labels: dict[int, str], name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 1, "", kind)
         self._labels: dict[int, str] = labels
@@ -407,10 +544,15 @@ class Enum(Sensor):
     def read_value(self, data: ProtocolResponse):
         return self._labels.get(read_byte(data))
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "b", self._labels.get
+
 
 class EnumH(Sensor):
     """Sensor representing label from enumeration encoded in 1 (high 8 bits of 16bit register)"""
 
+    __slots__ = ('_labels',)
+
     def __init__(self, id_: str, offset: int, labels: dict[int, str], name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 1, "", kind)
         self._labels: dict[int, str] = labels
@@ -418,10 +560,15 @@ class EnumH(Sensor):
     def read_value(self, data: ProtocolResponse):
         return self._labels.get(read_byte(data))
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "b", self._labels.get
+
 
 class EnumL(Sensor):
     """Sensor representing label from enumeration encoded in 1 byte (low 8 bits of 16bit register)"""
 
+    __slots__ = ('_labels',)
+
     def __init__(self, id_: str, offset: int, labels: dict[int, str], name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 1, "", kind)
         self._labels: dict[int, str] = labels
@@ -430,10 +577,15 @@ class EnumL(Sensor):
         read_byte(data)
         return self._labels.get(read_byte(data))
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "xb", self._labels.get
+
 
 class Enum2(Sensor):
     """Sensor representing label from enumeration encoded in 2 bytes"""
 
+    __slots__ = ('_labels',)
+
     def __init__(self, id_: str, offset: int, labels: dict[int, str], name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 2, "", kind)
         self._labels: dict[int, str] = labels
@@ -441,10 +593,15 @@ class Enum2(Sensor):
     def read_value(self, data: ProtocolResponse):
         return self._labels.get(read_bytes2(data, None, 0))
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "H", lambda v: self._labels.get(v if v != 0xffff else 0)
+
 
 class EnumBitmap4(Sensor):
     """Sensor representing label from bitmap encoded in 4 bytes"""
 
+    __slots__ = ('_labels',)
+
     def __init__(self, id_: str, offset: int, labels: dict[int, str], name: str, kind: Optional[SensorKind] = None):
         super().__init__(id_, offset, name, 4, "", kind)
         self._labels: dict[int, str] = labels
@@ -456,10 +613,15 @@ class EnumBitmap4(Sensor):
         bits = read_bytes4_signed(data, self.offset)
         return decode_bitmap(bits if bits != -1 else 0, self._labels)
 
+    def unpacker(self) -> tuple[str, Optional[Callable[[Any], Any]]]:
+        return "i", lambda v: decode_bitmap(v if v != -1 else 0, self._labels)
+
 
 class EnumBitmap22(Sensor):
     """Sensor representing label from bitmap encoded in 2+2 bytes"""
 
+    __slots__ = ('_labels', '_offsetL')
+
     def __init__(self, id_: str, offsetH: int, offsetL: int, labels: dict[int, str], name: str,
                  kind: Optional[SensorKind] = None):
         super().__init__(id_, offsetH, name, 2, "", kind)
@@ -477,6 +639,8 @@ class EnumBitmap22(Sensor):
 class EnumCalculated(Sensor):
     """Sensor representing label from enumeration of calculated value"""
 
+    __slots__ = ('_getter', '_labels')
+
     def __init__(self, id_: str, getter: Callable[[ProtocolResponse], Any], labels: dict[int, str], name: str,
                  kind: Optional[SensorKind] = None):
         super().__init__(id_, 0, name, 0, "", kind)
@@ -493,6 +657,8 @@ class EnumCalculated(Sensor):
 class EcoMode(ABC):
     """Sensor representing Eco Mode Battery Power Group API"""
 
+    __slots__ = ()
+
     @abstractmethod
     def encode_charge(self, eco_mode_power: int, eco_mode_soc: int = 100) -> bytes:
         """Answer bytes representing all the time enabled charging eco-mode group"""
@@ -533,6 +699,8 @@ class EcoMode(ABC):
 class EcoModeV1(Sensor, EcoMode):
     """Sensor representing Eco Mode Battery Power Group encoded in 8 bytes"""
 
+    __slots__ = ('start_h', 'start_m', 'end_h', 'end_m', 'power', 'on_off', 'day_bits', 'days', 'soc')
+
     def __init__(self, id_: str, offset: int, name: str):
         super().__init__(id_, offset, name, 8, "", SensorKind.BAT)
         self.start_h: int | None = None
@@ -551,27 +719,28 @@ class EcoModeV1(Sensor, EcoMode):
                f"{'On' if self.on_off != 0 else 'Off'}"
 
     def read_value(self, data: ProtocolResponse):
-        self.start_h = read_byte(data)
-        if (self.start_h < 0 or self.start_h > 23) and self.start_h != 48:
-            raise ValueError(f"{self.id_}: start_h value {self.start_h} out of range.")
-        self.start_m = read_byte(data)
-        if self.start_m < 0 or self.start_m > 59:
-            raise ValueError(f"{self.id_}: start_m value {self.start_m} out of range.")
-        self.end_h = read_byte(data)
-        if (self.end_h < 0 or self.end_h > 23) and self.end_h != 48:
-            raise ValueError(f"{self.id_}: end_h value {self.end_h} out of range.")
-        self.end_m = read_byte(data)
-        if self.end_m < 0 or self.end_m > 59:
-            raise ValueError(f"{self.id_}: end_m value {self.end_m} out of range.")
-        self.power = read_bytes2_signed(data)  # negative=charge, positive=discharge
-        if self.power < -100 or self.power > 100:
-            raise ValueError(f"{self.id_}: power value {self.power} out of range.")
-        self.on_off = read_byte(data)
-        if self.on_off not in (0, -1):
-            raise ValueError(f"{self.id_}: on_off value {self.on_off} out of range.")
-        self.day_bits = read_byte(data)
-        self.days = decode_day_of_week(self.day_bits)
-        return self
+        result = copy(self)
+        result.start_h = read_byte(data)
+        if (result.start_h < 0 or result.start_h > 23) and result.start_h != 48:
+            raise ValueError(f"{self.id_}: start_h value {result.start_h} out of range.")
+        result.start_m = read_byte(data)
+        if result.start_m < 0 or result.start_m > 59:
+            raise ValueError(f"{self.id_}: start_m value {result.start_m} out of range.")
+        result.end_h = read_byte(data)
+        if (result.end_h < 0 or result.end_h > 23) and result.end_h != 48:
+            raise ValueError(f"{self.id_}: end_h value {result.end_h} out of range.")
+        result.end_m = read_byte(data)
+        if result.end_m < 0 or result.end_m > 59:
+            raise ValueError(f"{self.id_}: end_m value {result.end_m} out of range.")
+        result.power = read_bytes2_signed(data)  # negative=charge, positive=discharge
+        if result.power < -100 or result.power > 100:
+            raise ValueError(f"{self.id_}: power value {result.power} out of range.")
+        result.on_off = read_byte(data)
+        if result.on_off not in (0, -1):
+            raise ValueError(f"{self.id_}: on_off value {result.on_off} out of range.")
+        result.day_bits = read_byte(data)
+        result.days = decode_day_of_week(result.day_bits)
+        return result
 
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         if isinstance(value, bytes) and len(value) == 8:
@@ -646,6 +815,9 @@ class EcoModeV1(Sensor, EcoMode):
 class Schedule(Sensor, EcoMode):
     """Sensor representing Schedule Group encoded in 12 bytes"""
 
+    __slots__ = ('start_h', 'start_m', 'end_h', 'end_m', 'on_off', 'day_bits', 'days', 'power', 'soc', 'month_bits',
+                 'months', 'schedule_type')
+
     def __init__(self, id_: str, offset: int, name: str, schedule_type: ScheduleType = ScheduleType.ECO_MODE):
         super().__init__(id_, offset, name, 12, "", SensorKind.BAT)
         self.start_h: int | None = None
@@ -668,31 +840,32 @@ class Schedule(Sensor, EcoMode):
                f"{'On' if -10 < self.on_off < 0 else 'Off' if 10 > self.on_off >= 0 else 'Unset'}"
 
     def read_value(self, data: ProtocolResponse):
-        self.start_h = read_byte(data)
-        if (self.start_h < 0 or self.start_h > 23) and self.start_h != 48 and self.start_h != -1:
-            raise ValueError(f"{self.id_}: start_h value {self.start_h} out of range.")
-        self.start_m = read_byte(data)
-        if (self.start_m < 0 or self.start_m > 59) and self.start_m != -1:
-            raise ValueError(f"{self.id_}: start_m value {self.start_m} out of range.")
-        self.end_h = read_byte(data)
-        if (self.end_h < 0 or self.end_h > 23) and self.end_h != 48 and self.end_h != -1:
-            raise ValueError(f"{self.id_}: end_h value {self.end_h} out of range.")
-        self.end_m = read_byte(data)
-        if (self.end_m < 0 or self.end_m > 59) and self.end_m != -1:
-            raise ValueError(f"{self.id_}: end_m value {self.end_m} out of range.")
-        self.on_off = read_byte(data)
-        self.schedule_type = ScheduleType.detect_schedule_type(self.on_off)
-        self.day_bits = read_byte(data)
-        self.days = decode_day_of_week(self.day_bits)
-        self.power = read_bytes2_signed(data)  # negative=charge, positive=discharge
-        if not self.schedule_type.is_in_range(self.power):
-            raise ValueError(f"{self.id_}: power value {self.power} out of range.")
-        self.soc = read_bytes2_signed(data)
-        if self.soc < 0 or self.soc > 100:
-            raise ValueError(f"{self.id_}: SoC value {self.soc} out of range.")
-        self.month_bits = read_bytes2_signed(data)
-        self.months = decode_months(self.month_bits)
-        return self
+        result = copy(self)
+        result.start_h = read_byte(data)
+        if (result.start_h < 0 or result.start_h > 23) and result.start_h != 48 and result.start_h != -1:
+            raise ValueError(f"{self.id_}: start_h value {result.start_h} out of range.")
+        result.start_m = read_byte(data)
+        if (result.start_m < 0 or result.start_m > 59) and result.start_m != -1:
+            raise ValueError(f"{self.id_}: start_m value {result.start_m} out of range.")
+        result.end_h = read_byte(data)
+        if (result.end_h < 0 or result.end_h > 23) and result.end_h != 48 and result.end_h != -1:
+            raise ValueError(f"{self.id_}: end_h value {result.end_h} out of range.")
+        result.end_m = read_byte(data)
+        if (result.end_m < 0 or result.end_m > 59) and result.end_m != -1:
+            raise ValueError(f"{self.id_}: end_m value {result.end_m} out of range.")
+        result.on_off = read_byte(data)
+        result.schedule_type = ScheduleType.detect_schedule_type(result.on_off)
+        result.day_bits = read_byte(data)
+        result.days = decode_day_of_week(result.day_bits)
+        result.power = read_bytes2_signed(data)  # negative=charge, positive=discharge
+        if not result.schedule_type.is_in_range(result.power):
+            raise ValueError(f"{self.id_}: power value {result.power} out of range.")
+        result.soc = read_bytes2_signed(data)
+        if result.soc < 0 or result.soc > 100:
+            raise ValueError(f"{self.id_}: SoC value {result.soc} out of range.")
+        result.month_bits = read_bytes2_signed(data)
+        result.months = decode_months(result.month_bits)
+        return result
 
     def encode_value(self, value: Any, register_value: bytes = None) -> bytes:
         if isinstance(value, bytes) and len(value) == 12:
@@ -783,6 +956,8 @@ class Schedule(Sensor, EcoMode):
 class EcoModeV2(Schedule):
     """Sensor representing Eco Mode Group encoded in 12 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str):
         super().__init__(id_, offset, name, ScheduleType.ECO_MODE)
 
@@ -790,6 +965,8 @@ class EcoModeV2(Schedule):
 class PeakShavingMode(Schedule):
     """Sensor representing Peak Shaving Mode encoded in 12 bytes"""
 
+    __slots__ = ()
+
     def __init__(self, id_: str, offset: int, name: str):
         super().__init__(id_, offset, name, ScheduleType.PEAK_SHAVING)
 
@@ -797,6 +974,8 @@ class PeakShavingMode(Schedule):
 class Calculated(Sensor):
     """Sensor representing calculated value"""
 
+    __slots__ = ('_getter',)
+
     def __init__(self, id_: str, getter: Callable[[ProtocolResponse], Any], name: str, unit: str,
                  kind: Optional[SensorKind] = None):
         super().__init__(id_, 0, name, 0, unit, kind)
@@ -813,14 +992,14 @@ def read_byte(buffer: ProtocolResponse, offset: int = None) -> int:
     """Retrieve single byte (signed int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    return int.from_bytes(buffer.read(1), byteorder="big", signed=True)
+    return buffer.read_int(1, signed=True)
 
 
 def read_bytes2(buffer: ProtocolResponse, offset: int = None, undef: int = None) -> int:
     """Retrieve 2 byte (unsigned int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=False)
+    value = buffer.read_int(2)
     return undef if value == 0xffff else value
 
 
@@ -828,14 +1007,14 @@ def read_bytes2_signed(buffer: ProtocolResponse, offset: int = None) -> int:
     """Retrieve 2 byte (signed int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    return int.from_bytes(buffer.read(2), byteorder="big", signed=True)
+    return buffer.read_int(2, signed=True)
 
 
 def read_bytes4(buffer: ProtocolResponse, offset: int = None, undef: int = None) -> int:
     """Retrieve 4 byte (unsigned int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(4), byteorder="big", signed=False)
+    value = buffer.read_int(4)
     return undef if value == 0xffffffff else value
 
 
@@ -843,14 +1022,14 @@ def read_bytes4_signed(buffer: ProtocolResponse, offset: int = None) -> int:
     """Retrieve 4 byte (signed int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    return int.from_bytes(buffer.read(4), byteorder="big", signed=True)
+    return buffer.read_int(4, signed=True)
 
 
 def read_bytes8(buffer: ProtocolResponse, offset: int = None, undef: int = None) -> int:
     """Retrieve 8 byte (unsigned int) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(8), byteorder="big", signed=False)
+    value = buffer.read_int(8)
     return undef if value == 0xffffffffffffffff else value
 
 
@@ -858,7 +1037,7 @@ def read_decimal2(buffer: ProtocolResponse, scale: int, offset: int = None) -> f
     """Retrieve 2 byte (signed float) value from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    return float(int.from_bytes(buffer.read(2), byteorder="big", signed=True)) / scale
+    return float(buffer.read_int(2, signed=True)) / scale
 
 
 def read_float4(buffer: ProtocolResponse, offset: int = None) -> float:
@@ -875,7 +1054,7 @@ def read_voltage(buffer: ProtocolResponse, offset: int = None) -> float:
     """Retrieve voltage [V] value (2 unsigned bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=False)
+    value = buffer.read_int(2)
     return float(value) / 10 if value != 0xffff else 0
 
 
@@ -888,7 +1067,7 @@ def read_current(buffer: ProtocolResponse, offset: int = None) -> float:
     """Retrieve current [A] value (2 unsigned bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=False)
+    value = buffer.read_int(2)
     return float(value) / 10 if value != 0xffff else 0
 
 
@@ -896,7 +1075,7 @@ def read_current_signed(buffer: ProtocolResponse, offset: int = None) -> float:
     """Retrieve current [A] value (2 signed bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=True)
+    value = buffer.read_int(2, signed=True)
     return float(value) / 10
 
 
@@ -914,7 +1093,7 @@ def read_freq(buffer: ProtocolResponse, offset: int = None) -> float:
     """Retrieve frequency [Hz] value (2 bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=True)
+    value = buffer.read_int(2, signed=True)
     return float(value) / 100
 
 
@@ -922,7 +1101,7 @@ def read_temp(buffer: ProtocolResponse, offset: int = None) -> float | None:
     """Retrieve temperature [C] value (2 bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    value = int.from_bytes(buffer.read(2), byteorder="big", signed=True)
+    value = buffer.read_int(2, signed=True)
     if value == -1 or value == 32767:
         return None
     return float(value) / 10
@@ -932,12 +1111,12 @@ def read_datetime(buffer: ProtocolResponse, offset: int = None) -> datetime:
     """Retrieve datetime value (6 bytes) from buffer"""
     if offset is not None:
         buffer.seek(offset)
-    year = 2000 + int.from_bytes(buffer.read(1), byteorder='big')
-    month = int.from_bytes(buffer.read(1), byteorder='big')
-    day = int.from_bytes(buffer.read(1), byteorder='big')
-    hour = int.from_bytes(buffer.read(1), byteorder='big')
-    minute = int.from_bytes(buffer.read(1), byteorder='big')
-    second = int.from_bytes(buffer.read(1), byteorder='big')
+    year = 2000 + buffer.read_int(1)
+    month = buffer.read_int(1)
+    day = buffer.read_int(1)
+    hour = buffer.read_int(1)
+    minute = buffer.read_int(1)
+    second = buffer.read_int(1)
     return datetime(year=year, month=month, day=day, hour=hour, minute=minute, second=second)
 
 
@@ -1014,3 +1193,82 @@ def decode_months(data: int) -> str | None:
             months += monthnames[0]
         monthnames.pop(0)
     return months
+
+
+# Vectorized decoding of numeric sensors:
+# sensor class -> (scale, undefined raw values, value of undefined, decimal places of rounded value)
+# (scale 0 means the sensor's own scale, value of undefined None means NaN, decimal places None means no rounding)
+_BATCH_DECODING: dict[type, tuple[int, tuple[int, ...], Optional[int], Optional[int]]] = {
+    Voltage: (10, (0xffff,), 0, None),
+    Current: (10, (0xffff,), 0, None),
+    CurrentS: (10, (), None, None),
+    Frequency: (100, (), None, None),
+    Power: (1, (0xffff,), None, None),
+    PowerS: (1, (), None, None),
+    Power4: (1, (0xffffffff,), None, None),
+    Power4S: (1, (), None, None),
+    Energy: (10, (0xffff,), None, None),
+    Energy4: (10, (0xffffffff,), None, None),
+    Energy8: (100, (0xffffffffffffffff,), None, None),
+    Apparent: (1, (), None, None),
+    Apparent4: (1, (), None, None),
+    Reactive: (1, (), None, None),
+    Reactive4: (1, (), None, None),
+    Temp: (10, (-1, 32767), None, None),
+    CellVoltage: (1000, (0xffff,), 0, None),
+    Byte: (1, (), None, None),
+    ByteH: (1, (), None, None),
+    ByteL: (1, (), None, None),
+    Integer: (1, (0xffff,), 0, None),
+    IntegerS: (1, (), None, None),
+    Long: (1, (0xffffffff,), 0, None),
+    LongS: (1, (), None, None),
+    Decimal: (0, (), None, None),
+    Float: (0, (), None, 3),
+}
+
+
+def decode_batch(sensors: Iterable[Sensor], command: ProtocolCommand,
+                 raw_responses: Sequence[bytes]) -> dict[str, Any]:
+    """
+    Decode the numeric sensors values from many raw responses of the same command at once (requires numpy).
+    Answer dictionary of sensor id and numpy array of its values (in order of responses).
+    Values of sensors with undefined value (None by read()) are float arrays with NaN of undefined values.
+    Non-numeric sensors (enums, timestamps, calculated ...) are not decoded.
+    """
+    if np is None:
+        raise ImportError("Batch decoding requires numpy to be installed.")
+    payloads = [command.trim_response(raw) for raw in raw_responses]
+    if not payloads:
+        return {}
+    width = len(payloads[0])
+    if any(len(payload) != width for payload in payloads):
+        raise ValueError("All the responses have to be of the same length.")
+    data = np.frombuffer(b"".join(payloads), dtype=np.uint8).reshape(len(payloads), width)
+
+    result = {}
+    for sensor in sensors:
+        decoding = _BATCH_DECODING.get(type(sensor))
+        if decoding is None:
+            continue
+        code = sensor.unpacker()[0]
+        position = command.get_offset(sensor.offset) + code.count("x")
+        dtype = np.dtype(">" + code.lstrip("x"))
+        if position < 0 or position + dtype.itemsize > width:
+            continue
+        raw = np.ascontiguousarray(data[:, position:position + dtype.itemsize]).view(dtype)[:, 0]
+        result[sensor.id_] = _decode_batch_values(raw.astype(dtype.newbyteorder("=")), sensor, *decoding)
+    return result
+
+
+def _decode_batch_values(raw, sensor: Sensor, scale: int, undefined: tuple[int, ...],
+                         undefined_value: Optional[int], decimals: Optional[int]):
+    """Answer the (numpy array of) sensor values of raw register values decoded according to _BATCH_DECODING"""
+    scale = scale or sensor.scale
+    if scale != 1 or (undefined and undefined_value is None):
+        values = raw.astype(np.float64) / scale
+    else:
+        values = raw
+    if undefined:
+        values[np.isin(raw, undefined)] = np.nan if undefined_value is None else undefined_value
+    return values if decimals is None else np.round(values, decimals)
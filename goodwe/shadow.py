@@ -0,0 +1,82 @@
+"""In-memory copy of inverter registers."""
+from __future__ import annotations
+
+import time
+from array import array
+
+# Number of registers stored in single page of register shadow
+PAGE_REGISTERS: int = 64
+
+
+class RegisterShadow:
+    """
+    Last known values of inverter (modbus) registers.
+
+    The registers are stored in pages of PAGE_REGISTERS registers (allocated when first register of the page
+    is stored), each register has the (monotonic) time it was read or written at.
+    Registers written by client but not read back from inverter since are considered dirty.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age: float = max_age
+        self.dirty: set[int] = set()
+        self._pages: dict[int, tuple[bytearray, array]] = {}
+
+    def _chunks(self, offset: int, count: int):
+        """Answer the (page number, index within page, register count, position) chunks of register range"""
+        position = 0
+        while position < count:
+            page, index = divmod(offset + position, PAGE_REGISTERS)
+            length = min(PAGE_REGISTERS - index, count - position)
+            yield page, index, length, position
+            position += length
+
+    def update(self, offset: int, data: bytes, written: bool = False) -> None:
+        """Store the raw (2 bytes per register) values of registers starting at offset"""
+        count = len(data) // 2
+        now = time.monotonic()
+        for page, index, length, position in self._chunks(offset, count):
+            stored = self._pages.get(page)
+            if stored is None:
+                stored = self._pages[page] = (bytearray(PAGE_REGISTERS * 2), array('d', bytes(PAGE_REGISTERS * 8)))
+            values, timestamps = stored
+            values[index * 2:(index + length) * 2] = data[position * 2:(position + length) * 2]
+            timestamps[index:index + length] = array('d', (now,)) * length
+        if written:
+            self.dirty.update(range(offset, offset + count))
+        elif self.dirty:
+            self._clean(range(offset, offset + count))
+
+    def read(self, offset: int, count: int, max_age: float | None = None) -> bytes | None:
+        """
+        Answer the raw values of count registers starting at offset.
+        Answer None if any of the registers is not known or was not read/written within max_age seconds.
+        """
+        oldest = time.monotonic() - (self.max_age if max_age is None else max_age)
+        data = bytearray()
+        for page, index, length, _ in self._chunks(offset, count):
+            stored = self._pages.get(page)
+            if stored is None:
+                return None
+            values, timestamps = stored
+            read_at = min(timestamps[index:index + length])
+            if not read_at or read_at < oldest:
+                return None
+            data += values[index * 2:(index + length) * 2]
+        return bytes(data)
+
+    def invalidate(self, registers: range | None = None) -> None:
+        """Discard the values of registers (all registers if None)"""
+        if registers is None:
+            self._pages.clear()
+            self.dirty.clear()
+            return
+        for page, index, length, _ in self._chunks(registers.start, len(registers)):
+            stored = self._pages.get(page)
+            if stored is not None:
+                stored[1][index:index + length] = array('d', bytes(length * 8))
+        self._clean(registers)
+
+    def _clean(self, registers: range) -> None:
+        """Remove the registers from dirty ones"""
+        self.dirty = {r for r in self.dirty if r not in registers}
@@ -0,0 +1,180 @@
+"""Synchronous (blocking) API of inverters, communicating within event loop running in background thread."""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Coroutine
+
+from . import connect as _connect, discover as _discover
+from .const import GOODWE_UDP_PORT
+from .inverter import Inverter, WriteTransaction
+
+
+class EventLoopThread:
+    """
+    Long-lived asyncio event loop running in dedicated (daemon) thread.
+    Coroutines are submitted to it from other threads by run(), which blocks until the coroutine completes.
+    The loop is started on first use.
+    """
+
+    def __init__(self, name: str = 'goodwe'):
+        self.name: str = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the event loop thread (if not running yet), answer the event loop"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(loop, started), name=self.name,
+                                                daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+        """
+        Execute the coroutine in the event loop, block until it completes and answer its result
+        (or raise its exception). Raise TimeoutError (and cancel the coroutine) if it does not complete
+        within timeout seconds.
+        """
+        loop = self.start()
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError("Blocking call from within the event loop thread would deadlock")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f'Call not completed within {timeout} seconds') from None
+
+    def stop(self) -> None:
+        """Stop the event loop and wait for its thread to finish"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+
+# Event loop thread shared by all synchronous inverters (unless explicit one is used)
+_default_loop_thread: EventLoopThread = EventLoopThread()
+
+
+class SyncInverter:
+    """
+    Synchronous (blocking) facade of Inverter.
+
+    All the inverter coroutine methods (read_runtime_data(), read_setting(), write_setting(), ...)
+    are available as blocking methods, executed within the background event loop thread.
+    The inverter communication socket is kept open between the calls, close() closes it.
+    It can be used from several threads, the calls are executed one after another by the event loop.
+    The other inverter methods and attributes are delegated as they are, write_transaction() answers
+    SyncWriteTransaction.
+    """
+
+    def __init__(self, inverter: Inverter, loop_thread: EventLoopThread | None = None):
+        self.inverter: Inverter = inverter
+        self.loop_thread: EventLoopThread = loop_thread or _default_loop_thread
+        inverter.set_keep_alive(True)
+
+    def __enter__(self) -> SyncInverter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.inverter, name)
+        if asyncio.iscoroutinefunction(attr):
+            return self._blocking(attr)
+        return attr
+
+    def _blocking(self, method: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def call(*args, **kwargs):
+            return self.loop_thread.run(method(*args, **kwargs))
+
+        return call
+
+    def write_transaction(self, max_gap: int = 0) -> SyncWriteTransaction:
+        """Blocking variant of Inverter.write_transaction()"""
+        return SyncWriteTransaction(self.inverter.write_transaction(max_gap), self.loop_thread)
+
+    def close(self) -> None:
+        """Close the inverter communication socket"""
+        self.loop_thread.run(self.inverter.close())
+
+
+class SyncWriteTransaction:
+    """
+    Synchronous (blocking) facade of WriteTransaction, e.g.
+
+        with inverter.write_transaction() as transaction:
+            transaction.write_setting('eco_mode_2_switch', 0)
+            transaction.write_setting('eco_mode_3_switch', 0)
+    """
+
+    def __init__(self, transaction: WriteTransaction, loop_thread: EventLoopThread):
+        self.transaction: WriteTransaction = transaction
+        self.loop_thread: EventLoopThread = loop_thread
+
+    def __enter__(self) -> SyncWriteTransaction:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    def write_setting(self, setting_id: str, value: Any) -> None:
+        """Add the setting value to be written by commit()"""
+        self.transaction.write_setting(setting_id, value)
+
+    def commit(self) -> None:
+        """Write all the settings values to the inverter"""
+        self.loop_thread.run(self.transaction.commit())
+
+
+def connect(host: str, port: int = GOODWE_UDP_PORT, family: str = None, comm_addr: int = 0, timeout: int = 1,
+            retries: int = 3, do_discover: bool = True, profile: dict[str, Any] | None = None,
+            loop_thread: EventLoopThread | None = None) -> SyncInverter:
+    """
+    Blocking variant of goodwe.connect(), answer SyncInverter instance.
+    The inverter communicates within loop_thread (by default the shared background event loop thread).
+
+    Raise InverterError if unable to contact or recognise supported inverter.
+    """
+    loop_thread = loop_thread or _default_loop_thread
+    inverter = loop_thread.run(_connect(host, port, family, comm_addr, timeout, retries, do_discover, profile))
+    return SyncInverter(inverter, loop_thread)
+
+
+def discover(host: str, port: int = GOODWE_UDP_PORT, timeout: int = 1, retries: int = 3,
+             profile: dict[str, Any] | None = None, loop_thread: EventLoopThread | None = None) -> SyncInverter:
+    """
+    Blocking variant of goodwe.discover(), answer SyncInverter instance.
+    The inverter communicates within loop_thread (by default the shared background event loop thread).
+
+    Raise InverterError if unable to contact or recognise supported inverter.
+    """
+    loop_thread = loop_thread or _default_loop_thread
+    inverter = loop_thread.run(_discover(host, port, timeout, retries, profile))
+    return SyncInverter(inverter, loop_thread)
@@ -0,0 +1,177 @@
+import asyncio
+from contextlib import closing
+from unittest import TestCase, mock
+
+import goodwe
+from goodwe import DT, ES, ET, InverterAddress, InverterError
+from goodwe.model import get_model_family
+from goodwe.protocol import ProtocolCommand, UdpInverterProtocol
+
+
+class SearchTest(TestCase):
+
+    @staticmethod
+    def run_async(coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_search_all_inverters(self):
+        async def scenario():
+            class Dongle(asyncio.DatagramProtocol):
+                def connection_made(self, transport):
+                    self.transport = transport
+
+                def datagram_received(self, data, addr):
+                    if data == goodwe.SEARCH_REQUEST:
+                        self.transport.sendto(b'127.0.0.1,289C6E05D3F0,Solar-WiFi222W0782', addr)
+                        # duplicate response
+                        self.transport.sendto(b'127.0.0.1,289C6E05D3F0,Solar-WiFi222W0782', addr)
+
+            loop = asyncio.get_running_loop()
+            dongle, _ = await loop.create_datagram_endpoint(Dongle, local_addr=('127.0.0.1', 0))
+            port = dongle.get_extra_info('sockname')[1]
+            try:
+                found = await goodwe.search_all_inverters(['127.0.0.1/32'], broadcast=False, timeout=0.1, port=port)
+            finally:
+                dongle.close()
+            self.assertEqual([InverterAddress('127.0.0.1', '289C6E05D3F0', 'Solar-WiFi222W0782')], found)
+
+        self.run_async(scenario())
+
+    def test_discover_all(self):
+        addresses = [InverterAddress(f'192.168.1.{i}', '', '') for i in range(1, 6)]
+        running = []
+        max_running = []
+
+        async def discover(host, port, timeout, retries):
+            running.append(host)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(host)
+            if host == '192.168.1.3':
+                raise InverterError('not supported')
+            return host
+
+        with mock.patch('goodwe.search_all_inverters', return_value=addresses), \
+                mock.patch('goodwe.discover', side_effect=discover):
+            inverters = self.run_async(goodwe.discover_all(max_concurrency=2))
+
+        self.assertEqual(['192.168.1.1', '192.168.1.2', '192.168.1.4', '192.168.1.5'], inverters)
+        self.assertEqual(2, max(max_running))
+
+
+class DiscoverTest(TestCase):
+
+    def test_get_model_family(self):
+        self.assertEqual('ET', get_model_family('9010KETU000W0000'))
+        self.assertEqual('ES', get_model_family('95048ESU227W0000'))
+        self.assertEqual('DT', get_model_family('5010KDTU00EW0000'))
+        self.assertEqual('DT', get_model_family('53600SSN00SW0000'))
+        self.assertIsNone(get_model_family('0000000000000000'))
+
+    def test_discover_concurrently(self):
+        cancelled = []
+
+        async def et_device_info():
+            await asyncio.sleep(0.05)
+
+        async def dt_device_info():
+            raise InverterError('not DT')
+
+        async def es_device_info():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append('ES')
+                raise
+
+        async def runtime_data():
+            return {}
+
+        with mock.patch.object(ET, 'read_device_info', side_effect=et_device_info), \
+                mock.patch.object(ET, 'read_runtime_data', side_effect=runtime_data), \
+                mock.patch.object(DT, 'read_device_info', side_effect=dt_device_info), \
+                mock.patch.object(ES, 'read_device_info', side_effect=es_device_info):
+            loop = asyncio.new_event_loop()
+            try:
+                inverter = loop.run_until_complete(goodwe.discover('127.0.0.1', 502))
+            finally:
+                loop.close()
+
+        self.assertIsInstance(inverter, ET)
+        self.assertEqual(['ES'], cancelled)
+
+    def test_discover_precedence(self):
+        async def et_device_info():
+            await asyncio.sleep(0.05)
+
+        async def dt_device_info():
+            pass
+
+        async def runtime_data():
+            return {}
+
+        with mock.patch.object(ET, 'read_device_info', side_effect=et_device_info), \
+                mock.patch.object(ET, 'read_runtime_data', side_effect=runtime_data), \
+                mock.patch.object(DT, 'read_device_info', side_effect=dt_device_info), \
+                mock.patch.object(DT, 'read_runtime_data', side_effect=runtime_data), \
+                mock.patch.object(ES, 'read_device_info', side_effect=dt_device_info), \
+                mock.patch.object(ES, 'read_runtime_data', side_effect=runtime_data):
+            loop = asyncio.new_event_loop()
+            try:
+                inverter = loop.run_until_complete(goodwe.discover('127.0.0.1', 502))
+            finally:
+                loop.close()
+
+        # DT (and ES) answered first, but ET has precedence
+        self.assertIsInstance(inverter, ET)
+
+    def test_discover_cancels_losing_probes(self):
+        received = []
+
+        class Device(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                received.append(data)
+
+        async def et_device_info():
+            await asyncio.sleep(0.1)
+
+        async def runtime_data():
+            return {}
+
+        async def keep_probing(inverter):
+            # probe catching request failures and re-trying, like read_device_info of some families
+            protocol = UdpInverterProtocol('127.0.0.1', port, 0xf7, 0.02, 0)
+            while True:
+                try:
+                    await ProtocolCommand(b'probe', lambda x: True).execute(protocol)
+                except InverterError:
+                    pass
+
+        async def scenario():
+            nonlocal port
+            loop = asyncio.get_running_loop()
+            device, _ = await loop.create_datagram_endpoint(Device, local_addr=('127.0.0.1', 0))
+            port = device.get_extra_info('sockname')[1]
+            try:
+                inverter = await goodwe.discover('127.0.0.1', 502)
+                sent = len(received)
+                await asyncio.sleep(0.1)
+                self.assertEqual(sent, len(received))
+                return inverter
+            finally:
+                device.close()
+
+        port = 0
+        with mock.patch.object(ET, 'read_device_info', side_effect=et_device_info), \
+                mock.patch.object(ET, 'read_runtime_data', side_effect=runtime_data), \
+                mock.patch.object(DT, 'read_device_info', autospec=True, side_effect=keep_probing), \
+                mock.patch.object(ES, 'read_device_info', autospec=True, side_effect=keep_probing):
+            with closing(asyncio.new_event_loop()) as loop:
+                inverter = loop.run_until_complete(scenario())
+
+        self.assertIsInstance(inverter, ET)
+        self.assertTrue(received)
@@ -119,6 +119,13 @@ class GW6000_DT_Test(DtMock):
         self.loop.run_until_complete(self.read_setting('shadow_scan'))
         self.assertEqual('7f039d8600014051', self.request.hex())
 
+    def test_GW6000_DT_read_settings_data_error(self):
+        for offset, count, _ in self._plan_reads(self.settings()):
+            self.mock_response(self._read_command(offset, count), 'NO RESPONSE')
+            for register in range(offset, offset + count):
+                self.mock_response(self._read_command(register, 1), 'NO RESPONSE')
+        self.assertRaises(RequestFailedException, self.loop.run_until_complete, self.read_settings_data())
+
     def test_GW6000_DT_write_setting(self):
         self.loop.run_until_complete(self.write_setting('shadow_scan', 1))
         self.assertEqual('7f069d8600018c51', self.request.hex())
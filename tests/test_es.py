@@ -1,7 +1,7 @@
 import asyncio
 import os
 from datetime import datetime
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from goodwe import DISCOVERY_COMMAND
 from goodwe.es import ES
@@ -66,6 +66,24 @@ class GW5048D_ES_Test(EsMock):
         self.assertEqual(23, self.dsp2_version)
         self.assertEqual(16, self.arm_version)
 
+    def test_GW5048D_ES_read_sensors(self):
+        data = self.loop.run_until_complete(self.read_sensors(('ipv1', 'vpv1')))
+        self.assertEqual({'ipv1': 0.1, 'vpv1': 0.0}, data)
+
+        self.assertRaises(ValueError, self.loop.run_until_complete, self.read_sensors(('ipv1', 'unknown')))
+
+    def test_GW5048D_ES_read_sensor_snapshot(self):
+        self.set_snapshot_max_age(10)
+        with mock.patch.object(self, '_read_from_socket', wraps=self._read_from_socket) as read:
+            self.assertEqual(0.1, self.loop.run_until_complete(self.read_sensor('ipv1')))
+            self.assertEqual(0.0, self.loop.run_until_complete(self.read_sensor('vpv1')))
+            self.assertEqual(1, read.call_count)
+            self.loop.run_until_complete(self.read_sensor('vpv1', cached=False))
+            self.assertEqual(2, read.call_count)
+            self.invalidate_snapshot(['ipv1'])
+            self.loop.run_until_complete(self.read_sensor('ipv1'))
+            self.assertEqual(3, read.call_count)
+
     def test_GW5048D_ES_runtime_data(self):
         data = self.loop.run_until_complete(self.read_runtime_data())
         self.assertEqual(57, len(data))
@@ -1,13 +1,15 @@
 import asyncio
+import json
 import os
 from datetime import datetime
-from unittest import TestCase
+from unittest import TestCase, skipIf
 
 from goodwe.et import ET
 from goodwe.exceptions import RequestRejectedException, RequestFailedException
-from goodwe.inverter import OperationMode
+from goodwe.inverter import DecodePlan, OperationMode
 from goodwe.modbus import ILLEGAL_DATA_ADDRESS
 from goodwe.protocol import ModbusRtuReadCommand, ProtocolCommand, ProtocolResponse
+from goodwe.sensor import decode_batch, np
 
 
 class EtMock(TestCase, ET):
@@ -261,6 +263,58 @@ class GW10K_ET_Test(EtMock):
         self.loop.run_until_complete(self.read_setting('modbus_47000'))
         self.assertEqual('f703b798000136c7', self.request.hex())
 
+    def test_GW10K_ET_read_settings_data(self):
+        data = self.loop.run_until_complete(self.read_settings_data())
+        self.assertEqual(68, len(data))
+        self.assertEqual(17, len(self._list_of_requests))
+        self.assertEqual('f703b126000957ad', self._list_of_requests[8].hex())
+        self.assertEqual('f703bb1c0024b465', self._list_of_requests[-1].hex())
+
+    def test_GW10K_ET_read_sensors(self):
+        data = self.loop.run_until_complete(self.read_sensors(('vgrid', 'vpv1', 'ipv1', 'ppv')))
+        self.assertEqual(['vgrid', 'vpv1', 'ipv1', 'ppv'], list(data))
+        self.assertEqual(1, len(self._list_of_requests))
+        self.assertEqual('f703891f00130b0b', self._list_of_requests[0].hex())
+        self.assertEqual(3456, data['ppv'])
+
+        self.assertRaises(ValueError, self.loop.run_until_complete, self.read_sensors(('vgrid', 'unknown')))
+
+    def test_decode_plan(self):
+        self.loop.run_until_complete(self.read_device_info())
+        for command, sensors in ((self._READ_RUNNING_DATA, self._sensors),
+                                 (self._READ_METER_DATA, self._sensors_meter),
+                                 (self._READ_BATTERY_INFO, self._sensors_battery)):
+            response = self.loop.run_until_complete(self._read_from_socket(command))
+            plan = DecodePlan(sensors, command.get_offset)
+            self.assertIsNotNone(plan.struct)
+            self.assertEqual({s.id_: s.read(response) for s in sensors}, plan.decode(response))
+            self.assertIs(self._decode_plan(response, sensors), self._decode_plan(response, sensors))
+            # plan of ad-hoc group is re-used too
+            self.assertIs(self._decode_plan(response, sensors[:3]), self._decode_plan(response, sensors[:3]))
+        plan = DecodePlan(self._sensors, self._READ_RUNNING_DATA.get_offset)
+        self.assertEqual(14, len(plan.fallback))
+
+    @skipIf(np is None, "numpy is not installed")
+    def test_decode_batch(self):
+        response = self.loop.run_until_complete(self._read_from_socket(self._READ_RUNNING_DATA))
+        expected = self._map_response(response, self._sensors)
+        data = decode_batch(self._sensors, self._READ_RUNNING_DATA, [response.raw_data] * 3)
+        self.assertEqual(83, len(data))
+        for sensor_id, values in data.items():
+            self.assertEqual(3, len(values))
+            if expected[sensor_id] is None:
+                self.assertTrue(np.isnan(values[2]))
+            else:
+                self.assertAlmostEqual(expected[sensor_id], values[2])
+
+    def test_plan_reads(self):
+        plan = self._plan_reads(self.settings())
+        self.assertEqual((45350, 9), plan[8][0:2])
+        self.assertEqual(9, len(plan[8][2]))
+        self.assertEqual((47514, 17), plan[15][0:2])
+        plan = self._plan_reads(self.settings(), max_gap=4, max_count=20)
+        self.assertEqual([(47509, 18), (47527, 4), (47900, 20), (47920, 16)], [p[0:2] for p in plan[-4:]])
+
     def test_GW10K_ET_write_setting(self):
         self.loop.run_until_complete(self.write_setting('grid_export_limit', 100))
         self.assertEqual('f706b996006459c7', self.request.hex())
@@ -346,6 +400,31 @@ class GW10K_ET_fw819_Test(EtMock):
         self.assertEqual('EcoModeV2', type(settings.get("eco_mode_1")).__name__)
         self.assertEqual(None, settings.get("peak_shaving_mode"))
 
+    def test_capability_profile(self):
+        profile = json.loads(json.dumps(self.export_profile()))
+        self.assertEqual('9010KETU00000000', profile['serial_number'])
+        self.assertEqual(['arm_fw_19'], profile['settings_groups'])
+        self.assertFalse(profile['flags']['has_peak_shaving'])
+
+        # probes would fail, settings have to be restored from profile
+        inverter = EtMock()
+        inverter.mock_response(inverter._READ_DEVICE_VERSION_INFO, 'GW10K-ET_device_info_fw819.hex')
+        inverter.mock_response(ModbusRtuReadCommand(0xf7, 47547, 6), 'NO RESPONSE')
+        inverter.mock_response(ModbusRtuReadCommand(0xf7, 47589, 6), 'NO RESPONSE')
+        inverter.import_profile(profile)
+        self.loop.run_until_complete(inverter.read_device_info())
+        self.assertEqual('EcoModeV2', type(inverter._settings.get("eco_mode_1")).__name__)
+        self.assertEqual(profile, inverter.export_profile())
+
+        # profile of other inverter is ignored
+        inverter = EtMock()
+        inverter.mock_response(inverter._READ_DEVICE_VERSION_INFO, 'GW10K-ET_device_info_fw819.hex')
+        inverter.mock_response(ModbusRtuReadCommand(0xf7, 47547, 6), 'NO RESPONSE')
+        inverter.mock_response(ModbusRtuReadCommand(0xf7, 47589, 6), 'NO RESPONSE')
+        inverter.import_profile(dict(profile, serial_number='9010KETU00000001'))
+        self.loop.run_until_complete(inverter.read_device_info())
+        self.assertEqual('EcoModeV1', type(inverter._settings.get("eco_mode_1")).__name__)
+
     def test_set_operation_mode_ECO_CHARGE(self):
         self.loop.run_until_complete(
             self.set_operation_mode(OperationMode.ECO_CHARGE, eco_mode_power=40, eco_mode_soc=80))
@@ -1048,6 +1127,7 @@ class GW29K9_ET_Test(EtMock):
         self.mock_response(self._READ_BATTERY_INFO, 'GW29K9-ET_battery_info.hex')
         self.mock_response(self._READ_BATTERY2_INFO, 'GW29K9-ET_battery2_info.hex')
         self.mock_response(self._READ_MPPT_DATA, 'GW29K9-ET_mppt_data.hex')
+        self.sensors_meter_all = self._sensors_meter
 
     def test_GW29K9_ET_device_info(self):
         self.loop.run_until_complete(self.read_device_info())
@@ -1290,6 +1370,31 @@ class GW29K9_ET_Test(EtMock):
 
         self.assertFalse(self.sensor_map, f"Some sensors were not tested {self.sensor_map}")
 
+    def test_GW29K9_ET_runtime_data_concurrently(self):
+        self.loop.run_until_complete(self.read_device_info())
+        sequential = self.loop.run_until_complete(self.read_runtime_data())
+
+        self._protocol.pipelining = True
+        self._has_meter_extended2 = True
+        self._sensors_meter = self.sensors_meter_all
+        data = self.loop.run_until_complete(self.read_runtime_data())
+        self.assertEqual(sequential, data)
+        self.assertFalse(self._has_meter_extended2)
+        self.assertTrue(self._has_battery2)
+        self.assertTrue(self._has_mppt)
+
+    def test_GW29K9_ET_runtime_data_concurrently_unsupported_fallback(self):
+        self.loop.run_until_complete(self.read_device_info())
+        self._protocol.pipelining = True
+        self._has_meter_extended2 = True
+        self._sensors_meter = self.sensors_meter_all
+        # the fallback (extended) meter data are not supported either
+        self.mock_response(self._READ_METER_DATA_EXTENDED, ILLEGAL_DATA_ADDRESS)
+        self.loop.run_until_complete(self.read_runtime_data())
+        self.assertFalse(self._has_meter_extended2)
+        self.assertFalse(self._has_meter_extended)
+        self.assertEqual(self._READ_METER_DATA.request, self._list_of_requests[-1])
+
 
 class GW5K_BT_Test(EtMock):
 
@@ -0,0 +1,95 @@
+import asyncio
+from unittest import TestCase, mock
+
+from goodwe.exceptions import RequestFailedException
+from goodwe.fleet import FleetPoller
+
+
+class FleetPollerTest(TestCase):
+
+    @staticmethod
+    def create_inverter(host: str, serial_number: str, running: list, max_running: list):
+        async def read_runtime_data():
+            running.append(host)
+            max_running.append(running.count(host))
+            await asyncio.sleep(0.005)
+            running.remove(host)
+            if serial_number == 'offline':
+                raise RequestFailedException('No response')
+            return {'serial': serial_number}
+
+        inverter = mock.Mock()
+        inverter.serial_number = serial_number
+        inverter.host = host
+        inverter.read_runtime_data.side_effect = read_runtime_data
+        return inverter
+
+    def test_fleet_poller(self):
+        running, max_running = [], []
+        first = self.create_inverter('10.0.0.1', 'first', running, max_running)
+        second = self.create_inverter('10.0.0.1', 'second', running, max_running)
+        offline = self.create_inverter('10.0.0.2', 'offline', running, max_running)
+
+        async def scenario():
+            poller = FleetPoller(max_concurrency=4, max_per_host=1)
+            for inverter in (first, second, offline):
+                poller.add(inverter, runtime_interval=0.02)
+            results = []
+            async with poller:
+                async for result in poller.results():
+                    results.append(result)
+                    if len(results) == 9:
+                        break
+            return results
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+
+        self.assertEqual(1, max(max_running))
+        for result in results:
+            self.assertEqual('runtime', result.name)
+            if result.inverter is offline:
+                self.assertIsNone(result.data)
+                self.assertIsInstance(result.error, RequestFailedException)
+            else:
+                self.assertEqual({'serial': result.inverter.serial_number}, result.data)
+                self.assertIsNone(result.error)
+        self.assertEqual({'first', 'second', 'offline'}, {r.inverter.serial_number for r in results})
+        # runs are scheduled at the interval (not drifting by read duration)
+        starts = [r.started for r in results if r.inverter is offline]
+        self.assertTrue(all(abs(b - a - 0.02) < 0.01 for a, b in zip(starts, starts[1:])))
+
+    def test_fleet_poller_unexpected_error(self):
+        inverter = mock.Mock()
+        inverter.serial_number = 'broken'
+        inverter.host = '10.0.0.1'
+
+        async def read(inv):
+            raise ValueError('Unexpected data')
+
+        async def scenario():
+            poller = FleetPoller()
+            poller.schedule(inverter, 'custom', 0.01, read)
+            results = []
+            async with poller:
+                async for result in poller.results():
+                    results.append(result)
+                    if len(results) == 2:
+                        break
+            return results
+
+        loop = asyncio.new_event_loop()
+        try:
+            with self.assertLogs('goodwe.fleet', 'ERROR'):
+                results = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+
+        # the schedule keeps running after the failed read
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsNone(result.data)
+            self.assertIsInstance(result.error, ValueError)
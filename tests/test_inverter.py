@@ -0,0 +1,353 @@
+import asyncio
+import gc
+import os
+from unittest import TestCase
+
+from goodwe.et import ET
+from goodwe.exceptions import MaxRetriesException, RequestFailedException, RequestRejectedException
+from goodwe.modbus import ILLEGAL_DATA_ADDRESS, MODBUS_READ_CMD, _modbus_checksum
+from goodwe.protocol import ModbusRtuReadCommand, ModbusRtuWriteCommand, ModbusRtuWriteMultiCommand, ProtocolCommand
+
+
+class InverterMock(TestCase, ET):
+    """
+    ET inverter with mocked UDP protocol (not the inverter's own request handling).
+    Read requests are answered from sample files or from the mocked registers (0 if not set),
+    write requests update the mocked registers.
+    """
+
+    def __init__(self, methodName='runTest'):
+        TestCase.__init__(self, methodName)
+        ET.__init__(self, 'localhost', 8899)
+        self._protocol.send_request = self._send_request
+        self._mock_responses = {}
+        self._mock_registers = {}
+        self._list_of_requests = []
+        # when set, the requests are answered only after the event is set
+        self._answer = None
+
+    def mock_response(self, command: ProtocolCommand, filename: str):
+        self._mock_responses[command] = filename
+
+    def mock_registers(self, offset: int, values: str):
+        data = bytes.fromhex(values)
+        for i in range(0, len(data), 2):
+            self._mock_registers[offset + i // 2] = data[i:i + 2]
+
+    async def _send_request(self, command: ProtocolCommand) -> asyncio.Future:
+        """Mock UDP communication"""
+        self._list_of_requests.append(command)
+        if self._answer is not None:
+            await self._answer.wait()
+        else:
+            # let the concurrent requests to be sent
+            await asyncio.sleep(0)
+        filename = self._mock_responses.get(command)
+        if ILLEGAL_DATA_ADDRESS == filename:
+            raise RequestRejectedException(ILLEGAL_DATA_ADDRESS)
+        if 'NO RESPONSE' == filename:
+            raise MaxRetriesException
+        if filename is not None:
+            root_dir = os.path.dirname(os.path.abspath(__file__))
+            with open(root_dir + '/sample/et/' + filename, 'r') as f:
+                response = bytes.fromhex(f.read())
+        else:
+            response = self._register_response(command)
+        self.assertTrue(command.validator(response))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(response)
+        return future
+
+    def _register_response(self, command: ProtocolCommand) -> bytes:
+        """Answer the modbus response of read/write command from/to mocked registers"""
+        if command.request[1] == MODBUS_READ_CMD:
+            offset, count = int.from_bytes(command.request[2:4], 'big'), int.from_bytes(command.request[4:6], 'big')
+            values = b''.join(self._mock_registers.get(r, bytes(2)) for r in range(offset, offset + count))
+            data = bytes([command.request[0], MODBUS_READ_CMD, len(values)]) + values
+        else:
+            values = command.written_values()
+            for i, register in enumerate(command.written_registers()):
+                self._mock_registers[register] = values[i * 2:i * 2 + 2]
+            data = command.request[:6]
+        return b'\xaa\x55' + data + _modbus_checksum(data).to_bytes(2, byteorder='little')
+
+    def requests_count(self) -> int:
+        return len(self._list_of_requests)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.close()
+
+
+class CircuitBreakerTest(InverterMock):
+
+    def test_circuit_breaker(self):
+        self.set_circuit_breaker(2, 60)
+        self.mock_registers(47510, '03e8')
+        self.mock_response(self._read_command(47510, 1), 'NO RESPONSE')
+        self.mock_response(self._probe_command(), 'NO RESPONSE')
+
+        async def scenario():
+            for count in (1, 2):
+                with self.assertRaises(RequestFailedException) as ctx:
+                    await self.read_setting('grid_export_limit')
+                self.assertEqual(count, ctx.exception.consecutive_failures_count)
+            self.assertEqual('open', self.circuit_breaker_stats()['state'])
+
+            # fail fast while open
+            with self.assertRaises(RequestFailedException):
+                await self.read_setting('grid_export_limit')
+            self.assertEqual(2, self.requests_count())
+            self.assertEqual(1, self.circuit_breaker_stats()['rejected'])
+
+            # failed probe re-opens the circuit
+            self._circuit_breaker.recovery_timeout = 0
+            with self.assertRaises(RequestFailedException):
+                await self.read_setting('grid_export_limit')
+            self.assertEqual([self._probe_command()], self._list_of_requests[2:])
+            self.assertEqual('open', self.circuit_breaker_stats()['state'])
+
+            # successful probe closes the circuit
+            self._mock_responses.clear()
+            self.assertEqual(1000, await self.read_setting('grid_export_limit'))
+            self.assertEqual([self._probe_command(), self._read_command(47510, 1)], self._list_of_requests[3:])
+            self.assertEqual('closed', self.circuit_breaker_stats()['state'])
+            self.assertEqual(0, self._consecutive_failures_count)
+
+        self.loop.run_until_complete(scenario())
+
+    def test_circuit_breaker_half_open_outcomes(self):
+        self.set_circuit_breaker(1, 0)
+        # the request itself is the probe
+        self._probe_command = lambda: None
+        self.mock_registers(47510, '03e8')
+        command = self._read_command(47510, 1)
+        send_request = self._protocol.send_request
+
+        async def open_circuit():
+            self.mock_response(command, 'NO RESPONSE')
+            with self.assertRaises(RequestFailedException):
+                await self.read_setting('modbus-47510')
+            self.assertEqual('open', self.circuit_breaker_stats()['state'])
+
+        async def fail(c):
+            raise ValueError('Unexpected')
+
+        async def scenario():
+            # rejected trial request closes the circuit, the inverter did answer
+            await open_circuit()
+            self.mock_response(command, ILLEGAL_DATA_ADDRESS)
+            with self.assertRaises(RequestRejectedException):
+                await self.read_setting('modbus-47510')
+            self.assertEqual('closed', self.circuit_breaker_stats()['state'])
+
+            # unexpected error of trial request re-opens the circuit
+            await open_circuit()
+            self._protocol.send_request = fail
+            with self.assertRaises(ValueError):
+                await self.read_setting('modbus-47510')
+            self.assertEqual('open', self.circuit_breaker_stats()['state'])
+
+            # cancelled trial request does not leave the circuit half-open
+            self._protocol.send_request = send_request
+            self._answer = asyncio.Event()
+            request = asyncio.ensure_future(self.read_setting('modbus-47510'))
+            await asyncio.sleep(0.01)
+            self.assertEqual('half_open', self.circuit_breaker_stats()['state'])
+            request.cancel()
+            await asyncio.gather(request, return_exceptions=True)
+            self.assertEqual('open', self.circuit_breaker_stats()['state'])
+
+            self._answer = None
+            self._mock_responses.clear()
+            self.assertEqual(1000, await self.read_setting('modbus-47510'))
+            self.assertEqual('closed', self.circuit_breaker_stats()['state'])
+
+        self.loop.run_until_complete(scenario())
+
+
+class RegisterShadowTest(InverterMock):
+
+    def test_register_shadow(self):
+        self.set_register_shadow(10)
+        self.mock_response(self._read_command(47515, 4), 'eco_mode_v1.hex')
+
+        async def scenario():
+            eco_mode = await self.read_setting('eco_mode_1')
+            self.assertEqual({'eco_mode_1': eco_mode, 'eco_mode_1_switch': 0},
+                             self.read_shadow(['eco_mode_1', 'eco_mode_1_switch']))
+            self.assertEqual('0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 20% Off', str(eco_mode))
+
+            # the low byte of register is known, it is not read again
+            await self.write_setting('eco_mode_1_switch', -1)
+            self.assertEqual(2, self.requests_count())
+            self.assertEqual(bytes.fromhex('ff7f'), self._mock_registers[47518])
+            self.assertEqual(-1, self.read_shadow(['eco_mode_1_switch'])['eco_mode_1_switch'])
+            self.assertEqual({47518}, self._shadow.dirty)
+            # the written value is kept in the shadow, whole setting is decoded from it
+            self.assertEqual('0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 20% On',
+                             str(self.read_shadow(['eco_mode_1'])['eco_mode_1']))
+
+            self.set_register_shadow(None)
+            await self.write_setting('eco_mode_1_switch', 0)
+            self.assertEqual(4, self.requests_count())
+            self.assertEqual(bytes.fromhex('007f'), self._mock_registers[47518])
+
+        self.loop.run_until_complete(scenario())
+
+
+class SnapshotTest(InverterMock):
+
+    def test_snapshot(self):
+        self.set_snapshot_max_age(10)
+        self.mock_registers(47509, '0001')
+        self.mock_registers(47510, '03e8')
+
+        async def scenario():
+            self.assertEqual(1000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(1000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(1, self.requests_count())
+            self.mock_registers(47510, '05dc')
+            self.assertEqual(1000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(1500, await self.read_setting('grid_export_limit', cached=False))
+            self.assertEqual(2, self.requests_count())
+
+            # write of the register discards the snapshot value
+            await self.write_setting('grid_export_limit', 2000)
+            self.assertEqual(2000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(4, self.requests_count())
+            # the snapshot of other register is kept
+            self.assertEqual(1, await self.read_setting('grid_export'))
+            await self.write_setting('grid_export', 0)
+            self.assertEqual(2000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(0, await self.read_setting('grid_export'))
+            self.assertEqual(7, self.requests_count())
+
+            self.set_snapshot_max_age(0)
+            self.assertEqual(2000, await self.read_setting('grid_export_limit'))
+            self.assertEqual(8, self.requests_count())
+
+        self.loop.run_until_complete(scenario())
+
+
+class SingleFlightTest(InverterMock):
+
+    def test_single_flight(self):
+        self.mock_registers(47510, '03e8')
+
+        async def scenario():
+            self._answer = asyncio.Event()
+            first = asyncio.ensure_future(self.read_setting('grid_export_limit'))
+            second = asyncio.ensure_future(self.read_setting('grid_export_limit'))
+            third = asyncio.ensure_future(self.read_setting('modbus-47510'))
+            cancelled = asyncio.ensure_future(self._read_from_socket(ModbusRtuReadCommand(0xf7, 47510, 1)))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            self._answer.set()
+            # every caller decodes the (single) response from its start
+            self.assertEqual([1000, 1000, 1000], list(await asyncio.gather(first, second, third)))
+            self.assertEqual(1, self.requests_count())
+            self.assertFalse(self._in_flight)
+
+        self.loop.run_until_complete(scenario())
+
+    def test_single_flight_not_shared(self):
+        async def scenario():
+            # writes are never merged
+            await asyncio.gather(self.write_setting('grid_export_limit', 1000),
+                                 self.write_setting('grid_export_limit', 1000))
+            self.assertEqual(2, self.requests_count())
+
+            # raw commands are never merged (their validators may differ)
+            responses = await asyncio.gather(self.send_command(bytes.fromhex('f703b9960001')),
+                                             self.send_command(bytes.fromhex('f703b9960001'), lambda x: len(x) > 4))
+            self.assertEqual(4, self.requests_count())
+            self.assertEqual([bytes.fromhex('03e8')] * 2, [r.raw_data[5:7] for r in responses])
+
+        self.loop.run_until_complete(scenario())
+
+    def test_single_flight_cancelled(self):
+        errors = []
+
+        async def scenario():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            self._answer = asyncio.Event()
+            # request is cancelled when all its callers are
+            request = asyncio.ensure_future(self.read_setting('grid_export_limit'))
+            await asyncio.sleep(0)
+            in_flight = next(iter(self._in_flight.values()))
+            request.cancel()
+            await asyncio.gather(request, return_exceptions=True)
+            await asyncio.sleep(0)
+            self.assertTrue(in_flight.task.cancelled())
+            self.assertFalse(self._in_flight)
+
+            # request failing (instead of being cancelled) after all its callers were cancelled
+            async def send_request(command):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    raise MaxRetriesException
+
+            self._protocol.send_request = send_request
+            request = asyncio.ensure_future(self.read_setting('grid_export_limit'))
+            await asyncio.sleep(0)
+            request.cancel()
+            await asyncio.gather(request, return_exceptions=True)
+            await asyncio.sleep(0)
+            self.assertFalse(self._in_flight)
+            del in_flight
+            gc.collect()
+
+        self.loop.run_until_complete(scenario())
+        self.assertEqual([], errors)
+
+
+class WriteTransactionTest(InverterMock):
+
+    def test_write_transaction(self):
+        self.mock_registers(47522, '0102010201020102010201020102')
+
+        async def scenario():
+            async with self.write_transaction(max_gap=8) as transaction:
+                transaction.write_setting('eco_mode_2_switch', 0)
+                transaction.write_setting('eco_mode_3_switch', 0)
+                transaction.write_setting('work_mode', 3)
+            self.assertEqual([ModbusRtuReadCommand(0xf7, 47522, 5),
+                              ModbusRtuWriteMultiCommand(0xf7, 47522, bytes.fromhex('00020102010201020002')),
+                              ModbusRtuWriteCommand(0xf7, 47000, 3)],
+                             self._list_of_requests)
+            self.assertEqual(0, await self.read_setting('eco_mode_2_switch'))
+            self.assertEqual(0, await self.read_setting('eco_mode_3_switch'))
+            self.assertEqual(3, await self.read_setting('work_mode'))
+            self.assertEqual(bytes.fromhex('0102'), self._mock_registers[47524])
+
+            # without gap the switches are written separately, as plain setting writes
+            self.mock_registers(47522, '0102010201020102')
+            self._list_of_requests.clear()
+            async with self.write_transaction() as transaction:
+                transaction.write_setting('eco_mode_2_switch', -1)
+                transaction.write_setting('eco_mode_3_switch', -1)
+            self.assertEqual([ModbusRtuReadCommand(0xf7, 47522, 1),
+                              ModbusRtuWriteCommand(0xf7, 47522, 0xff02 - 0x10000),
+                              ModbusRtuReadCommand(0xf7, 47526, 1),
+                              ModbusRtuWriteCommand(0xf7, 47526, 0xff02 - 0x10000)],
+                             self._list_of_requests)
+            self.assertEqual(-1, await self.read_setting('eco_mode_2_switch'))
+            self.assertEqual(-1, await self.read_setting('eco_mode_3_switch'))
+
+            # contiguous registers are still merged
+            self._list_of_requests.clear()
+            async with self.write_transaction() as transaction:
+                transaction.write_setting('modbus-47000', 3)
+                transaction.write_setting('modbus-47001', 4)
+            self.assertEqual([ModbusRtuWriteMultiCommand(0xf7, 47000, bytes.fromhex('00030004'))],
+                             self._list_of_requests)
+            self.assertEqual(3, await self.read_setting('modbus-47000'))
+            self.assertEqual(4, await self.read_setting('modbus-47001'))
+
+        self.loop.run_until_complete(scenario())
@@ -1,6 +1,8 @@
-from unittest import TestCase
+import os
+from unittest import TestCase, skipIf
 
 from goodwe.modbus import *
+from goodwe.modbus import _CRC_16_ACCELERATED, _modbus_checksum, _modbus_checksum_bytewise, _modbus_checksum_pairs
 
 
 class TestModbus(TestCase):
@@ -19,6 +21,23 @@ class TestModbus(TestCase):
         self.assertRaises(RequestRejectedException,
                           lambda: validate_modbus_rtu_response(bytes.fromhex(response), cmd, offset, value))
 
+    def test_modbus_checksum(self):
+        self.assertEqual(0x4B37, _modbus_checksum(b'123456789'))
+        for length in (0, 1, 2, 15, 16, 17, 253, 256):
+            data = os.urandom(length)
+            expected = _modbus_checksum_bytewise(data)
+            self.assertEqual(expected, _modbus_checksum_pairs(data))
+            self.assertEqual(expected, _modbus_checksum_pairs(bytearray(data)))
+            self.assertEqual(expected, _modbus_checksum_pairs(memoryview(data)))
+            self.assertEqual(expected, _modbus_checksum(data))
+
+    @skipIf(_CRC_16_ACCELERATED is None, "crcmod C extension not installed")
+    def test_modbus_checksum_accelerated(self):
+        for length in (1, 6, 253):
+            data = os.urandom(length)
+            self.assertEqual(_modbus_checksum_bytewise(data), _CRC_16_ACCELERATED(data))
+            self.assertEqual(_modbus_checksum_bytewise(data), _CRC_16_ACCELERATED(bytearray(data)))
+
     def test_create_modbus_rtu_request(self):
         request = create_modbus_rtu_request(0x11, 0x3, 0x006b, 0x0003)
         self.assertEqual('1103006b00037687', request.hex())
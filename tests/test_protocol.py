@@ -1,5 +1,9 @@
+import asyncio
+import logging
+import struct
 from unittest import TestCase, mock
 
+from goodwe.exceptions import InverterError
 from goodwe.protocol import *
 
 
@@ -25,6 +29,23 @@ class TestUDPClientProtocol(TestCase):
     #        self.future.set_result.assert_not_called()
     #        self.future.set_exception.assert_called_once_with(ProcessingException)
 
+    def test_datagram_fragments(self):
+        async def scenario():
+            command = ModbusRtuReadCommand(0xf7, 0x88b8, 0x0003)
+            self.protocol.command = command
+            self.protocol.response_future = asyncio.get_running_loop().create_future()
+            # fragment which does not fit to incomplete response starts new one
+            self.protocol.datagram_received(bytes.fromhex('aa55f70306ff9c0001'), ('127.0.0.1', 1337))
+            self.protocol.datagram_received(bytes.fromhex('aa55f70306'), ('127.0.0.1', 1337))
+            self.assertEqual(bytes.fromhex('aa55f70306'), self.protocol._buffer)
+            for fragment in ('ff9c00', '01fffe', '5b72'):
+                self.protocol.datagram_received(bytes.fromhex(fragment), ('127.0.0.1', 1337))
+            response = ProtocolResponse(self.protocol.response_future.result(), command)
+            self.assertEqual(bytes.fromhex('ff9c0001fffe'), response.response_data())
+            self.assertFalse(self.protocol._buffer)
+
+        asyncio.run(scenario())
+
     def test_error_received(self):
         exc = Exception('something went wrong')
         self.protocol.error_received(exc)
@@ -119,6 +140,46 @@ class TestUDPClientProtocol(TestCase):
         command = ModbusTcpWriteMultiCommand(0xf7, 0xb798, bytes.fromhex('08070605'))
         self.assertEqual(bytes.fromhex('00010000000bf710b79800020408070605'), command.request)
 
+    def test_read_command_cache(self):
+        protocol = UdpInverterProtocol('127.0.0.1', 1337, 0xf7, 1, 3)
+        command = protocol.read_command(0x88b8, 0x0021)
+        self.assertIs(command, protocol.read_command(0x88b8, 0x0021))
+        self.assertIsNot(command, protocol.read_command(0x88b8, 0x0001))
+        for offset in range(MAX_CACHED_COMMANDS):
+            protocol.read_command(offset, 1)
+        self.assertEqual(MAX_CACHED_COMMANDS, len(protocol._commands))
+        self.assertIsNot(command, protocol.read_command(0x88b8, 0x0021))
+
+        command = TcpInverterProtocol('127.0.0.1', 502, 0xf7, 1, 3).read_command(310, 2)
+        first = command.request_bytes()
+        second = command.request_bytes()
+        self.assertNotEqual(first[0:2], second[0:2])
+        self.assertEqual(first[2:], second[2:])
+        self.assertEqual(bytes.fromhex('000100000006f70301360002'), command.request)
+
+    def test_protocol_response(self):
+        command = ModbusRtuReadCommand(0xf7, 0x88b8, 0x0003)
+        response = ProtocolResponse(bytes.fromhex('aa55f70306ff9c0001fffe0000'), command)
+        self.assertEqual(bytes.fromhex('ff9c0001fffe'), response.response_data())
+        response.seek(0x88b9)
+        self.assertEqual(1, response.read_int(2))
+        self.assertEqual(-2, response.read_int(2, signed=True))
+        response.seek(0x88b8)
+        self.assertEqual(bytes.fromhex('ff9c'), response.read(2))
+        response.seek(0x88b8)
+        self.assertEqual((-100, 1), response.unpack(struct.Struct('>hH')))
+        self.assertEqual(b'\xff\xfe', response.read(4))
+        self.assertRaises(ValueError, response.seek, 0x88b7)
+
+    def test_lazy_hex(self):
+        data = mock.Mock()
+        data.hex.return_value = 'aa55'
+        logger = logging.getLogger('goodwe.protocol')
+        with mock.patch.object(logger, 'level', logging.INFO):
+            logger.debug("Received: %s", LazyHex(data))
+        data.hex.assert_not_called()
+        self.assertEqual('aa55f7', str(LazyHex(bytes.fromhex('aa55f7'))))
+
     def test_aa55_read_command(self):
         command = Aa55ReadCommand(0x0701, 16)
         self.assertEqual(bytes.fromhex('AA55C07F011A030701100274'), command.request)
@@ -130,3 +191,231 @@ class TestUDPClientProtocol(TestCase):
     def test_aa55_write_multi_command(self):
         command = Aa55WriteMultiCommand(0x0701, bytes.fromhex('08070605'))
         self.assertEqual(bytes.fromhex('AA55C07F02390B0701040807060502AA'), command.request)
+
+
+class TestTCPClientProtocol(TestCase):
+
+    def test_pipelined_requests(self):
+        async def scenario():
+            protocol = TcpInverterProtocol('127.0.0.1', 502, 0xf7, 1, 0)
+            protocol.pipelining = True
+            protocol.keep_alive = True
+            protocol._ensure_lock()
+            transport = mock.Mock()
+            transport.is_closing.return_value = False
+            protocol._transport = transport
+
+            first = asyncio.ensure_future(ModbusTcpReadCommand(0xf7, 35100, 1).execute(protocol))
+            second = asyncio.ensure_future(ModbusTcpReadCommand(0xf7, 36000, 1).execute(protocol))
+            while transport.write.call_count < 2:
+                await asyncio.sleep(0)
+            self.assertEqual(2, len(protocol._pending))
+
+            tx_first = transport.write.call_args_list[0][0][0][0:2]
+            tx_second = transport.write.call_args_list[1][0][0][0:2]
+            # Both responses in reverse order within single segment
+            protocol.data_received(tx_second + bytes.fromhex('00000005f7030200c8') +
+                                   tx_first + bytes.fromhex('00000005f70302000a'))
+
+            self.assertEqual(bytes.fromhex('000a'), (await first).response_data())
+            self.assertEqual(bytes.fromhex('00c8'), (await second).response_data())
+            self.assertFalse(protocol._pending)
+
+        asyncio.run(scenario())
+
+    def test_pipelined_timeouts_backoff(self):
+        async def scenario():
+            protocol = TcpInverterProtocol('127.0.0.1', 502, 0xf7, 1, 0)
+            protocol.pipelining = True
+            protocol.keep_alive = True
+            protocol.set_adaptive_timeout(0.02, 1)
+            protocol.rtt.rto = 0.02
+            protocol._ensure_lock()
+            transport = mock.Mock()
+            transport.is_closing.return_value = False
+            protocol._transport = transport
+
+            # simultaneous timeouts of several pipelined requests back off the timeout once
+            results = await asyncio.gather(*(ModbusTcpReadCommand(0xf7, 35100 + i, 1).execute(protocol)
+                                             for i in range(4)), return_exceptions=True)
+            self.assertTrue(all(isinstance(r, InverterError) for r in results))
+            self.assertEqual(4, protocol.rtt.stats()['timeouts'])
+            self.assertAlmostEqual(0.04, protocol.rtt.rto)
+
+        asyncio.run(scenario())
+
+    def test_pipelined_response_fragments(self):
+        async def scenario():
+            protocol = TcpInverterProtocol('127.0.0.1', 502, 0xf7, 1, 0)
+            protocol.pipelining = True
+            protocol.keep_alive = True
+            protocol._ensure_lock()
+            transport = mock.Mock()
+            transport.is_closing.return_value = False
+            protocol._transport = transport
+
+            request = asyncio.ensure_future(ModbusTcpReadCommand(0xf7, 35100, 2).execute(protocol))
+            while transport.write.call_count < 1:
+                await asyncio.sleep(0)
+            tx_id = transport.write.call_args_list[0][0][0][0:2]
+            protocol.data_received(tx_id + bytes.fromhex('00000007f70304'))
+            protocol.data_received(bytes.fromhex('00010002'))
+
+            self.assertEqual(bytes.fromhex('00010002'), (await request).response_data())
+
+        asyncio.run(scenario())
+
+    def test_response_fragments(self):
+        async def scenario():
+            protocol = TcpInverterProtocol('127.0.0.1', 502, 0xf7, 1, 0)
+            protocol.command = ModbusTcpReadCommand(0xf7, 35100, 2)
+            protocol.response_future = asyncio.get_running_loop().create_future()
+            protocol.data_received(bytes.fromhex('00010000'))
+            protocol.data_received(bytes.fromhex('0007f70304'))
+            self.assertFalse(protocol.response_future.done())
+            # rest of response followed by (part of) next one
+            protocol.data_received(bytes.fromhex('000100020002000000'))
+
+            self.assertEqual(bytes.fromhex('000100000007f7030400010002'), protocol.response_future.result())
+            self.assertEqual(bytes.fromhex('0002000000'), protocol._buffer)
+
+        asyncio.run(scenario())
+
+
+class TestRttEstimator(TestCase):
+
+    def test_rtt_estimator(self):
+        rtt = RttEstimator(1, 0.2, 3)
+        self.assertEqual(1, rtt.rto)
+        rtt.update(0.1)
+        self.assertAlmostEqual(0.1, rtt.srtt)
+        self.assertAlmostEqual(0.05, rtt.rttvar)
+        self.assertAlmostEqual(0.3, rtt.rto)
+        rtt.update(0.02)
+        self.assertAlmostEqual(0.09, rtt.srtt)
+        self.assertAlmostEqual(0.0575, rtt.rttvar)
+        self.assertAlmostEqual(0.32, rtt.rto)
+        for _ in range(20):
+            rtt.update(0.01)
+        self.assertEqual(0.2, rtt.rto)
+        rtt.backoff()
+        rtt.backoff()
+        self.assertEqual(0.8, rtt.rto)
+        rtt.backoff()
+        rtt.backoff()
+        self.assertEqual(3, rtt.rto)
+        self.assertEqual(22, rtt.stats()['samples'])
+        self.assertEqual(4, rtt.stats()['timeouts'])
+
+    @mock.patch('goodwe.protocol.asyncio.get_running_loop')
+    def test_adaptive_timeout(self, mock_get_event_loop):
+        mock_loop = mock.Mock()
+        mock_loop.time.side_effect = [10.0, 10.05]
+        mock_get_event_loop.return_value = mock_loop
+        protocol = UdpInverterProtocol('127.0.0.1', 1337, 0xf7, 1, 3)
+        protocol.set_adaptive_timeout(0.1, 2)
+        protocol._transport = mock.Mock()
+        command = ProtocolCommand(bytes.fromhex('636f666665650d0a'), lambda x: True)
+
+        protocol._send_request(command, mock.Mock())
+        mock_loop.call_later.assert_called_with(1, protocol._timeout_mechanism)
+        protocol.datagram_received(b'response', ('127.0.0.1', 1337))
+        self.assertAlmostEqual(0.05, protocol.rtt.srtt)
+        self.assertAlmostEqual(0.15, protocol.rtt.rto)
+
+        mock_loop.time.side_effect = [11.0]
+        protocol._send_request(command, mock.Mock())
+        mock_loop.call_later.assert_called_with(protocol.rtt.rto, protocol._timeout_mechanism)
+
+
+class TestUdpMultiplexer(TestCase):
+
+    @staticmethod
+    def _rtu_response(comm_addr: int, value: bytes) -> bytes:
+        from goodwe.modbus import _modbus_checksum
+        data = bytes([comm_addr, 3, len(value)]) + value
+        return b'\xaa\x55' + data + _modbus_checksum(data).to_bytes(2, byteorder='little')
+
+    def test_shared_socket(self):
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            received = []
+
+            class Server(asyncio.DatagramProtocol):
+                def connection_made(self, transport):
+                    self.transport = transport
+
+                def datagram_received(self, data, addr):
+                    received.append((data, addr))
+                    if len(received) == 2:
+                        # answer both requests (of different comm addresses) in reverse order
+                        for request, source in reversed(received):
+                            self.transport.sendto(TestUdpMultiplexer._rtu_response(request[0], request[2:4]), source)
+                    elif len(received) > 2:
+                        self.transport.sendto(TestUdpMultiplexer._rtu_response(data[0], data[2:4]), addr)
+
+            server, _ = await loop.create_datagram_endpoint(Server, local_addr=('127.0.0.1', 0))
+            port = server.get_extra_info('sockname')[1]
+            first = UdpInverterProtocol('127.0.0.1', port, 0xf7, 1, 0)
+            second = UdpInverterProtocol('127.0.0.1', port, 0x7f, 1, 0)
+            for protocol in (first, second):
+                protocol.shared_socket = True
+                protocol.keep_alive = True
+
+            responses = await asyncio.gather(first.read_command(0x0102, 1).execute(first),
+                                             second.read_command(0x0304, 1).execute(second))
+            self.assertEqual(bytes.fromhex('0102'), responses[0].response_data())
+            self.assertEqual(bytes.fromhex('0304'), responses[1].response_data())
+            # both requests were sent from the same socket
+            self.assertEqual(received[0][1], received[1][1])
+
+            # the endpoint is kept open when the protocols are closed
+            mux = await UdpMultiplexer.get_instance()
+            await first.close()
+            await second.close()
+            self.assertTrue(mux._usable())
+            response = await first.read_command(0x0506, 1).execute(first)
+            self.assertEqual(bytes.fromhex('0506'), response.response_data())
+            self.assertIs(mux, await UdpMultiplexer.get_instance())
+
+            UdpMultiplexer.shutdown()
+            self.assertFalse(mux._usable())
+            with self.assertRaises(RequestFailedException):
+                mux.sendto(b'request', ('127.0.0.1', port))
+            server.close()
+
+        asyncio.run(scenario())
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_retry_policy(self):
+        policy = RetryPolicy(3, backoff=0.5, max_backoff=1.5, jitter=0)
+        self.assertEqual(0.5, policy.next_delay(1, 0))
+        self.assertEqual(1, policy.next_delay(2, 0))
+        self.assertEqual(1.5, policy.next_delay(3, 0))
+        self.assertIsNone(policy.next_delay(4, 0))
+        policy.deadline = 2
+        self.assertEqual(1, policy.next_delay(2, 0.5))
+        self.assertIsNone(policy.next_delay(2, 1))
+        policy.jitter = 0.5
+        for _ in range(10):
+            self.assertTrue(0.75 <= policy.delay(3) <= 1.5)
+
+    def test_retry_loop(self):
+        async def scenario():
+            protocol = UdpInverterProtocol('127.0.0.1', 1337, 0xf7, 0.01, 2)
+            protocol.retry_policy.backoff = 0.01
+            protocol.keep_alive = True
+            protocol._ensure_lock()
+            transport = mock.Mock()
+            transport.is_closing.return_value = False
+            protocol._transport = transport
+            command = ProtocolCommand(bytes.fromhex('636f666665650d0a'), lambda x: True)
+
+            with self.assertRaises(MaxRetriesException):
+                await command.execute(protocol)
+            self.assertEqual(3, transport.sendto.call_count)
+            self.assertEqual(3, protocol.rtt.stats()['timeouts'])
+
+        asyncio.run(scenario())
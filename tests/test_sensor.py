@@ -211,13 +211,13 @@ class TestUtils(TestCase):
         self.assertTrue(testee.read(data).is_eco_charge_mode())
         self.assertFalse(testee.read(data).is_eco_discharge_mode())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% (SoC 100%) On",
-                         testee.as_eco_mode_v2().__str__())
+                         testee.read(data).as_eco_mode_v2().__str__())
         data = MockResponse(testee.encode_discharge(60).hex())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% On", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
         self.assertTrue(testee.read(data).is_eco_discharge_mode())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% (SoC 100%) On",
-                         testee.as_eco_mode_v2().__str__())
+                         testee.read(data).as_eco_mode_v2().__str__())
         data = MockResponse(testee.encode_off().hex())
         self.assertEqual("48:0-48:0  100% Off", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
@@ -228,7 +228,7 @@ class TestUtils(TestCase):
 
         data = MockResponse("0d1e0e28ff1affc4005a0000")
         self.assertEqual("13:30-14:40 Mon,Wed,Thu -60% (SoC 90%) On", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.ECO_MODE, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE, testee.read(data).schedule_type)
         self.assertEqual(bytes.fromhex("0d1e0e28ff1affc4005a0000"),
                          testee.encode_value(bytes.fromhex("0d1e0e28ff1affc4005a0000")))
         self.assertRaises(ValueError, lambda: testee.encode_value("some string"))
@@ -239,12 +239,12 @@ class TestUtils(TestCase):
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% (SoC 80%) On", testee.read(data).__str__())
         self.assertTrue(testee.read(data).is_eco_charge_mode())
         self.assertFalse(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% On", testee.as_eco_mode_v1().__str__())
+        self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% On", testee.read(data).as_eco_mode_v1().__str__())
         data = MockResponse(testee.encode_discharge(60).hex())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% (SoC 100%) On", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
         self.assertTrue(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% On", testee.as_eco_mode_v1().__str__())
+        self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% On", testee.read(data).as_eco_mode_v1().__str__())
         data = MockResponse(testee.encode_off().hex())
         self.assertEqual("48:0-48:0  100% (SoC 100%) Off", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
@@ -268,39 +268,40 @@ class TestUtils(TestCase):
                          testee.encode_value(bytes.fromhex("0d1e0e28f91affc4005a0000")))
         self.assertFalse(testee.read(data).is_eco_charge_mode())
         self.assertFalse(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
 
         data = MockResponse(testee.encode_charge(-40, 80).hex())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% (SoC 80%) On", testee.read(data).__str__())
         self.assertTrue(testee.read(data).is_eco_charge_mode())
         self.assertFalse(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse(testee.encode_discharge(60).hex())
         self.assertEqual("0:0-23:59 Sun,Mon,Tue,Wed,Thu,Fri,Sat 60% (SoC 100%) On", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
         self.assertTrue(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse(testee.encode_off().hex())
         self.assertEqual("48:0-48:0  100% (SoC 100%) Off", testee.read(data).__str__())
         self.assertFalse(testee.read(data).is_eco_charge_mode())
         self.assertFalse(testee.read(data).is_eco_discharge_mode())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
-        self.assertEqual(1000, testee.power)
-        self.assertEqual(100, testee.get_power())
-        self.assertEqual("%", testee.get_power_unit())
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
+        self.assertEqual(1000, testee.read(data).power)
+        self.assertEqual(100, testee.read(data).get_power())
+        self.assertEqual("%", testee.read(data).get_power_unit())
+        self.assertIsNone(testee.power)
 
         data = MockResponse("10001600f97f00c800000fff")
         self.assertEqual("16:0-22:0 Sun,Mon,Tue,Wed,Thu,Fri,Sat 20% (SoC 0%) On", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse("10001600067f00c800000fff")
         self.assertEqual("16:0-22:0 Sun,Mon,Tue,Wed,Thu,Fri,Sat 20% (SoC 0%) Off", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse("10001600f97ffe70004b0fff")
         self.assertEqual("16:0-22:0 Sun,Mon,Tue,Wed,Thu,Fri,Sat -40% (SoC 75%) On", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse("10001600f97fff3800320fff")
         self.assertEqual("16:0-22:0 Sun,Mon,Tue,Wed,Thu,Fri,Sat -20% (SoC 50%) On", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.ECO_MODE_745, testee.schedule_type)
+        self.assertEqual(ScheduleType.ECO_MODE_745, testee.read(data).schedule_type)
         data = MockResponse("10001600f902ff38004b0002")
         self.assertEqual("16:0-22:0 Mon Feb -20% (SoC 75%) On", testee.read(data).__str__())
         data = MockResponse("10001600f902ff38004b0004")
@@ -316,10 +317,15 @@ class TestUtils(TestCase):
 
         data = MockResponse("00000d08fc7f006400140000")
         self.assertEqual("0:0-13:8 Sun,Mon,Tue,Wed,Thu,Fri,Sat 1000W (SoC 20%) On", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.PEAK_SHAVING, testee.schedule_type)
+        self.assertEqual(ScheduleType.PEAK_SHAVING, testee.read(data).schedule_type)
         data = MockResponse("00000d08037f000000000000")
         self.assertEqual("0:0-13:8 Sun,Mon,Tue,Wed,Thu,Fri,Sat 0W (SoC 0%) Off", testee.read(data).__str__())
-        self.assertEqual(ScheduleType.PEAK_SHAVING, testee.schedule_type)
+        self.assertEqual(ScheduleType.PEAK_SHAVING, testee.read(data).schedule_type)
+
+    def test_slots(self):
+        for testee in (Voltage("", 0, "", None), ByteL("", 0, ""), Enum2("", 0, {}, ""), EcoModeV1("", 0, ""),
+                       EcoModeV2("", 0, ""), Calculated("", lambda x: 0, "", "")):
+            self.assertFalse(hasattr(testee, "__dict__"), type(testee).__name__)
 
     def test_decode_bitmap(self):
         self.assertEqual('', decode_bitmap(0, ERROR_CODES))
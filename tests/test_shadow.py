@@ -0,0 +1,33 @@
+from unittest import TestCase, mock
+
+from goodwe.shadow import PAGE_REGISTERS, RegisterShadow
+
+
+class TestRegisterShadow(TestCase):
+
+    def test_register_shadow(self):
+        shadow = RegisterShadow(10)
+        self.assertIsNone(shadow.read(100, 1))
+        # range spanning two pages
+        offset = PAGE_REGISTERS - 2
+        shadow.update(offset, bytes.fromhex('0001000200030004'))
+        self.assertEqual(bytes.fromhex('00020003'), shadow.read(offset + 1, 2))
+        self.assertIsNone(shadow.read(offset + 3, 2))
+        self.assertEqual(2, len(shadow._pages))
+
+        shadow.update(offset + 1, bytes.fromhex('ff00'), written=True)
+        self.assertEqual(bytes.fromhex('0001ff00'), shadow.read(offset, 2))
+        self.assertEqual({offset + 1}, shadow.dirty)
+        shadow.update(offset, bytes.fromhex('00010002'))
+        self.assertFalse(shadow.dirty)
+
+        shadow.invalidate(range(offset + 1, offset + 2))
+        self.assertIsNone(shadow.read(offset, 2))
+        self.assertEqual(bytes.fromhex('0003'), shadow.read(offset + 2, 1))
+
+        with mock.patch('goodwe.shadow.time.monotonic', return_value=shadow._pages[1][1][0] + 11):
+            self.assertIsNone(shadow.read(offset + 2, 1))
+            self.assertEqual(bytes.fromhex('0003'), shadow.read(offset + 2, 1, max_age=20))
+
+        shadow.invalidate()
+        self.assertIsNone(shadow.read(offset + 2, 1))
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from unittest import TestCase, mock
+
+from goodwe.et import ET
+from goodwe.protocol import ProtocolResponse
+from goodwe.sync import EventLoopThread, SyncInverter
+
+
+class TestEventLoopThread(TestCase):
+
+    def setUp(self) -> None:
+        self.loop_thread = EventLoopThread('test')
+
+    def tearDown(self) -> None:
+        self.loop_thread.stop()
+
+    def test_run(self):
+        async def current_thread():
+            await asyncio.sleep(0)
+            return threading.current_thread()
+
+        thread = self.loop_thread.run(current_thread())
+        self.assertIsNot(threading.current_thread(), thread)
+        self.assertIs(thread, self.loop_thread.run(current_thread()))
+
+        async def fail():
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            self.loop_thread.run(fail())
+        with self.assertRaises(TimeoutError):
+            self.loop_thread.run(asyncio.sleep(1), timeout=0.01)
+
+        self.loop_thread.stop()
+        self.assertFalse(thread.is_alive())
+
+
+class TestSyncInverter(TestCase):
+
+    def test_sync_inverter(self):
+        loop_thread = EventLoopThread('test')
+        inverter = SyncInverter(ET("localhost", 8899), loop_thread)
+
+        def execute(command, protocol):
+            return ProtocolResponse(bytes.fromhex('aa55f7030203e80000'), command)
+
+        with mock.patch('goodwe.protocol.ProtocolCommand.execute', autospec=True) as mock_execute:
+            mock_execute.side_effect = execute
+            with inverter:
+                self.assertEqual(1000, inverter.read_setting('grid_export_limit'))
+                self.assertEqual(1000, inverter.get_grid_export_limit())
+                self.assertTrue(inverter.settings())
+                self.assertTrue(inverter.inverter._protocol.keep_alive)
+        self.assertEqual(2, mock_execute.call_count)
+
+        with mock.patch('goodwe.protocol.ProtocolCommand.execute', autospec=True) as mock_execute:
+            mock_execute.side_effect = execute
+            with inverter.write_transaction() as transaction:
+                transaction.write_setting('modbus-47000', 3)
+                transaction.write_setting('modbus-47001', 4)
+                self.assertEqual(0, mock_execute.call_count)
+        self.assertEqual(1, mock_execute.call_count)
+        loop_thread.stop()